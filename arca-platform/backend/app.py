@@ -3,16 +3,23 @@ ARCA Platform - Main Application Entry Point
 Automated Root Cause Analysis Platform for Deployment Errors
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, Response, stream_with_context
 from flask_cors import CORS
 from pymongo import MongoClient
-from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
 import sys
 import jwt
 import requests as http_requests
 from functools import wraps
+from dataclasses import asdict
+import hashlib
+import json
+import threading
+import atexit
 
 # Add modules directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'modules'))
@@ -23,7 +30,23 @@ from log_collector import LogCollector
 from metric_collector import MetricCollector
 from event_correlator import EventCorrelator
 from recommendation_engine import RecommendationEngine
-from alert_system import AlertSystem
+from fix_store import FixStore
+from action_ranker import ActionRanker
+from alert_system import AlertSystem, slack_message
+from alert_dedup import AlertDeduplicator
+from alert_persister import AlertPersister
+from escalation import EscalationScheduler, DEFAULT_POLICIES, parse_policies
+from notification_digest import DigestBatcher
+from bulk_writer import WriteBehindBuffer, insert_unordered, write_concern_from_settings
+from statistics_counters import StatisticsCounters
+from notification_dispatcher import NotificationDispatcher, WebhookSender
+from lag_analyzer import LagAnalyzer
+from rule_store import RuleStore, YamlRuleSource, MongoRuleSource, RuleVersionConflictError
+from job_queue import JobQueue, QueueFullError
+from incident_index import IncidentVectorizer, SimilarIncidentIndex
+from evidence import LazyEvidence, evidence_entry
+from change_events import ChangeEventIndex, ChangeEvent
+from event_stream import EventHub, TooManySubscribersError
 
 # Load environment variables
 load_dotenv()
@@ -43,6 +66,38 @@ except Exception as e:
     print(f"[ERROR] MongoDB connection failed: {e}")
     db = None
 
+# Counts for /api/statistics are kept in one counters document, incremented
+# on insert and periodically recounted
+platform_statistics = None
+if db is not None:
+    platform_statistics = StatisticsCounters(
+        db.counters,
+        db,
+        reconcile_interval_seconds=float(os.getenv('STATISTICS_RECONCILE_SECONDS', 300))
+    )
+    atexit.register(platform_statistics.stop)
+
+# Anomalies are inserted in bulk, with their own write concern, and
+# optionally buffered across requests by a write-behind buffer
+anomaly_collection = None
+anomaly_writer = None
+if db is not None:
+    anomaly_write_concern = write_concern_from_settings(
+        os.getenv('ANOMALY_WRITE_CONCERN_W'),
+        os.getenv('ANOMALY_WRITE_CONCERN_J'),
+        os.getenv('ANOMALY_WRITE_CONCERN_TIMEOUT_MS')
+    )
+    anomaly_collection = (db.anomalies.with_options(write_concern=anomaly_write_concern)
+                          if anomaly_write_concern else db.anomalies)
+    if os.getenv('ANOMALY_WRITE_BEHIND', 'false').lower() == 'true':
+        anomaly_writer = WriteBehindBuffer(
+            anomaly_collection,
+            max_batch=int(os.getenv('ANOMALY_WRITE_BATCH', 1000)),
+            max_delay_seconds=float(os.getenv('ANOMALY_WRITE_DELAY_MS', 50)) / 1000,
+            max_pending=int(os.getenv('ANOMALY_WRITE_MAX_PENDING', 50000))
+        )
+        atexit.register(anomaly_writer.stop)
+
 # Initialize ARCA components
 thresholds = {
     'cpu_usage': Threshold(min_value=0, max_value=float(os.getenv('CPU_THRESHOLD', 80))),
@@ -52,10 +107,310 @@ thresholds = {
 }
 
 anomaly_detector = AnomalyDetector(thresholds)
-rca_engine = RCAEngine([])
-event_correlator = EventCorrelator(window_size_minutes=5)
-recommendation_engine = RecommendationEngine({})
-alert_system = AlertSystem()
+event_correlator = EventCorrelator(
+    window_size_minutes=5,
+    cooccurrence_path=os.getenv('COOCCURRENCE_MATRIX_PATH') or None
+)
+atexit.register(event_correlator.save_cooccurrence_matrix)
+change_index = ChangeEventIndex(
+    max_events_per_service=int(os.getenv('CHANGE_EVENTS_PER_SERVICE', 10000))
+)
+rca_engine = RCAEngine(
+    [],
+    cache_size=int(os.getenv('RCA_CACHE_SIZE', 256)),
+    cache_ttl_seconds=float(os.getenv('RCA_CACHE_TTL_SECONDS', 300)),
+    max_open_incidents=int(os.getenv('RCA_MAX_OPEN_INCIDENTS', 1000)),
+    profile_rules=os.getenv('RCA_PROFILE_RULES', 'true').lower() == 'true',
+    component_resolver=event_correlator.extract_component,
+    change_index=change_index,
+    change_lookback_minutes=float(os.getenv('RCA_CHANGE_LOOKBACK_MINUTES', 30)),
+    onset_resolution_seconds=float(os.getenv('RCA_ONSET_RESOLUTION_SECONDS', 10))
+)
+# Historical fixes are shared by all workers through MongoDB when available
+fix_store = FixStore(
+    db.historical_fixes if db is not None else None,
+    db.counters if db is not None else None,
+    max_fixes_per_cause=int(os.getenv('FIX_STORE_MAX_PER_CAUSE', 50)),
+    check_interval_seconds=float(os.getenv('FIX_STORE_CHECK_SECONDS', 5))
+)
+recommendation_engine = RecommendationEngine(
+    {},
+    fix_store=fix_store,
+    ranker=ActionRanker(exploration=float(os.getenv('RECOMMENDATION_EXPLORATION', 0)))
+)
+# Notifications are delivered by background workers, never inside a request
+notification_dispatcher = NotificationDispatcher(
+    max_queue_size=int(os.getenv('NOTIFY_QUEUE_SIZE', 1000)),
+    max_retries=int(os.getenv('NOTIFY_MAX_RETRIES', 3)),
+    backoff_base_seconds=float(os.getenv('NOTIFY_BACKOFF_SECONDS', 0.5)),
+    dead_letter_collection=db.notification_dead_letters if db is not None else None
+)
+# Registered before the digest and persister handlers: atexit runs in reverse
+# order, so the dispatcher drains after the final digests are flushed into it
+atexit.register(notification_dispatcher.stop)
+NOTIFY_WORKERS = int(os.getenv('NOTIFY_WORKERS_PER_CHANNEL', 2))
+if os.getenv('SLACK_WEBHOOK_URL'):
+    notification_dispatcher.register_channel(
+        'slack', WebhookSender(os.getenv('SLACK_WEBHOOK_URL'), formatter=slack_message,
+                               pool_size=NOTIFY_WORKERS),
+        workers=NOTIFY_WORKERS
+    )
+if os.getenv('ALERT_WEBHOOK_URL'):
+    notification_dispatcher.register_channel(
+        'webhook', WebhookSender(os.getenv('ALERT_WEBHOOK_URL'), pool_size=NOTIFY_WORKERS),
+        workers=NOTIFY_WORKERS
+    )
+# Alerts are written to MongoDB in batches; the spool keeps them across outages
+alert_persister = None
+if db is not None:
+    alert_persister = AlertPersister(
+        db.alerts,
+        spool_dir=os.getenv('ALERT_SPOOL_DIR') or None,
+        flush_interval_seconds=float(os.getenv('ALERT_FLUSH_SECONDS', 1)),
+        batch_size=int(os.getenv('ALERT_BATCH_SIZE', 500)),
+        statistics=platform_statistics,
+        max_attempts=int(os.getenv('ALERT_MAX_WRITE_ATTEMPTS', 5)),
+        dead_letter_dir=os.getenv('ALERT_DEAD_LETTER_DIR') or None
+    )
+    atexit.register(alert_persister.stop)
+# Unacknowledged alerts are re-notified and escalated per severity
+alert_escalation = None
+if os.getenv('ALERT_ESCALATION', 'true').lower() == 'true':
+    alert_escalation = EscalationScheduler(
+        policies=parse_policies(json.loads(os.getenv('ALERT_ESCALATION_POLICIES')))
+        if os.getenv('ALERT_ESCALATION_POLICIES') else DEFAULT_POLICIES,
+        tick_seconds=float(os.getenv('ALERT_ESCALATION_TICK_SECONDS', 1))
+    )
+# Notifications of low-severity alerts are sent as periodic digests
+alert_digest = None
+if os.getenv('ALERT_DIGEST_SEVERITIES', 'LOW,MEDIUM'):
+    alert_digest = DigestBatcher(
+        None,  # set by AlertSystem
+        severities=os.getenv('ALERT_DIGEST_SEVERITIES', 'LOW,MEDIUM').split(','),
+        max_alerts=int(os.getenv('ALERT_DIGEST_MAX_ALERTS', 50)),
+        max_wait_seconds=float(os.getenv('ALERT_DIGEST_MAX_WAIT_SECONDS', 300))
+    )
+    atexit.register(alert_digest.stop)
+alert_system = AlertSystem(
+    dispatcher=notification_dispatcher,
+    persister=alert_persister,
+    escalation=alert_escalation,
+    digest=alert_digest,
+    deduplicator=AlertDeduplicator(
+        window_seconds=float(os.getenv('ALERT_DEDUP_WINDOW_SECONDS', 300)),
+        rate_limit=int(os.getenv('ALERT_RATE_LIMIT', 5)),
+        rate_period_seconds=float(os.getenv('ALERT_RATE_PERIOD_SECONDS', 3600))
+    )
+)
+# New alerts, anomalies and RCA results are pushed to /api/stream subscribers
+event_hub = EventHub(
+    buffer_size=int(os.getenv('STREAM_BUFFER_SIZE', 256)),
+    history_size=int(os.getenv('STREAM_HISTORY_SIZE', 1000)),
+    # Each stream holds a request thread; leave half of them for the API
+    max_subscribers=int(os.getenv('STREAM_MAX_SUBSCRIBERS', max(int(os.getenv('GUNICORN_THREADS', 32)) // 2, 1)))
+)
+STREAM_HEARTBEAT_SECONDS = float(os.getenv('STREAM_HEARTBEAT_SECONDS', 15))
+alert_system.subscribe(lambda alert: event_hub.publish('alert', alert))
+lag_analyzer = LagAnalyzer(
+    resample_seconds=int(os.getenv('LAG_RESAMPLE_SECONDS', 60)),
+    max_lag_seconds=int(os.getenv('LAG_MAX_SECONDS', 1800))
+)
+
+# Jobs are shared through MongoDB, so any worker can answer a status poll
+rca_job_queue = JobQueue(
+    max_workers=int(os.getenv('RCA_JOB_WORKERS', 4)),
+    max_pending=int(os.getenv('RCA_JOB_MAX_PENDING', 100)),
+    collection=db.rca_jobs if db is not None else None,
+    finished_ttl_seconds=float(os.getenv('RCA_JOB_TTL_SECONDS', 3600)),
+    max_runtime_seconds=float(os.getenv('RCA_JOB_MAX_RUNTIME_SECONDS', 600))
+)
+
+# Evidence items stored with each RCA report (most severe first); the full
+# evidence is rebuilt from the anomalies on demand
+EVIDENCE_TOP_K = int(os.getenv('RCA_EVIDENCE_TOP_K', 20))
+
+# Anomalies are fetched by ID with one $in query per chunk of IDs, backed by
+# the unique index on anomalies.id
+ANOMALY_FETCH_BATCH = int(os.getenv('ANOMALY_FETCH_BATCH', 1000))
+# Fields that correlation, RCA, lead/lag analysis and incident features read
+ANOMALY_RCA_PROJECTION = {
+    '_id': 0, 'id': 1, 'type': 1, 'severity': 1, 'metric': 1, 'timestamp': 1, 'description': 1
+}
+# Fields of an evidence entry
+ANOMALY_EVIDENCE_PROJECTION = {
+    '_id': 0, 'id': 1, 'type': 1, 'severity': 1, 'description': 1, 'timestamp': 1
+}
+
+incident_vectorizer = IncidentVectorizer(
+    dimensions=int(os.getenv('INCIDENT_INDEX_DIMENSIONS', 256))
+)
+incident_index = SimilarIncidentIndex(
+    dimensions=incident_vectorizer.dimensions,
+    max_incidents=int(os.getenv('INCIDENT_INDEX_MAX_INCIDENTS', 200000))
+)
+# Recorded fixes returned per similar incident
+SIMILAR_INCIDENT_FIXES = 3
+
+
+def _create_rule_store():
+    """Build the RCA rule store from RCA_RULES_SOURCE ('mongo' or a YAML path)."""
+    source = os.getenv('RCA_RULES_SOURCE', '').strip()
+    if not source:
+        return None
+    if source == 'mongo':
+        if db is None:
+            print("[ERROR] RCA_RULES_SOURCE=mongo but MongoDB is not available")
+            return None
+        return RuleStore(MongoRuleSource(db.rca_rule_sets),
+                         poll_interval_seconds=float(os.getenv('RCA_RULES_POLL_SECONDS', 30)))
+    return RuleStore(YamlRuleSource(source),
+                     poll_interval_seconds=float(os.getenv('RCA_RULES_POLL_SECONDS', 30)))
+
+
+# Rules hot-swap into the engine whenever the store sees a new version
+rule_store = _create_rule_store()
+if rule_store is not None:
+    rule_store.subscribe(rca_engine.set_rule_set)
+    rule_store.start()
+
+
+def _parse_timestamp(value):
+    """Convert a stored timestamp (datetime or ISO string) to datetime, or None."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _compute_lead_lag(anomalies):
+    """Run lag analysis over the metric history surrounding the anomalies."""
+    if db is None:
+        return []
+
+    timestamps = [_parse_timestamp(a.get('timestamp')) for a in anomalies]
+    timestamps = [t for t in timestamps if t is not None]
+    if not timestamps:
+        return []
+
+    lookback = timedelta(minutes=int(os.getenv('LAG_LOOKBACK_MINUTES', 60)))
+    # Newest samples first, so a capped fetch keeps the end of the window
+    metric_docs = list(db.metrics.find(
+        {'timestamp': {'$gte': min(timestamps) - lookback, '$lte': max(timestamps) + lookback}},
+        {'_id': 0}
+    ).sort('timestamp', -1).limit(5000))
+
+    return [r.to_dict() for r in lag_analyzer.analyze(metric_docs)]
+
+
+def _index_incident(report_id, report, features):
+    """Add a stored RCA result to the similar-incident index."""
+    incident_index.add(report_id, incident_vectorizer.vectorize(features), {
+        'report_id': report_id,
+        'root_cause': report.get('root_cause'),
+        'timestamp': report.get('timestamp')
+    })
+
+
+def _recorded_fixes(report_fixes, cause_fixes):
+    """
+    Fix outcomes recorded for a past incident, or else the successful fixes of its root cause
+    (among the most recent fixes the fix store keeps per cause).
+
+    Returns (fixes, 'incident' | 'root_cause' | None).
+    """
+    if report_fixes:
+        return report_fixes, 'incident'
+    successful = [fix for fix in cause_fixes if fix.success][:SIMILAR_INCIDENT_FIXES]
+    return successful, 'root_cause' if successful else None
+
+
+def _find_similar_incidents(features, k=5, exclude=()):
+    """Top-k most similar past RCA results for an incident's features, with what fixed them."""
+    matches = incident_index.query(incident_vectorizer.vectorize(features), k=k, exclude=exclude)
+    # Looked up by report ID, however old the fixes are
+    fixes_by_report = fix_store.for_reports(
+        [entry['report_id'] for _, entry in matches], limit=SIMILAR_INCIDENT_FIXES
+    )
+    fixes_by_cause = {}
+    similar = []
+    for similarity, entry in matches:
+        root_cause = entry['root_cause']
+        if root_cause not in fixes_by_cause:
+            fixes_by_cause[root_cause] = fix_store.recent(root_cause) if root_cause else []
+        fixes, fixes_source = _recorded_fixes(fixes_by_report.get(entry['report_id']),
+                                              fixes_by_cause[root_cause])
+        similar.append({
+            'report_id': entry['report_id'],
+            'root_cause': root_cause,
+            'similarity': round(similarity, 4),
+            'fixes': [fix.to_dict() for fix in fixes],
+            'fixes_source': fixes_source,
+            'timestamp': entry['timestamp']
+        })
+    return similar
+
+
+def _backfill_incident_index():
+    """Index the most recent RCA results already stored in MongoDB, oldest first."""
+    try:
+        skipped = max(db.rca_results.count_documents({}) - incident_index.max_incidents, 0)
+        cursor = db.rca_results.find({}, {
+            'incident_features': 1, 'evidence': 1, 'affected_components': 1,
+            'root_cause': 1, 'timestamp': 1
+        }).sort('timestamp', 1).skip(skipped)
+        for report in cursor:
+            _index_incident(str(report['_id']), report,
+                            incident_vectorizer.features_from_report(report))
+        print(f"[OK] Similar-incident index loaded ({len(incident_index)} incidents)")
+    except Exception as e:
+        print(f"[ERROR] Similar-incident index backfill failed: {e}")
+
+
+# Backfill in the background so startup is not blocked by a large history
+if db is not None:
+    threading.Thread(target=_backfill_incident_index, name='incident-index-backfill',
+                     daemon=True).start()
+
+
+def _backfill_change_index():
+    """Load recent change events stored in MongoDB into the change index."""
+    try:
+        since = datetime.now() - timedelta(days=int(os.getenv('CHANGE_EVENTS_BACKFILL_DAYS', 7)))
+        for doc in db.change_events.find({'start': {'$gte': since.isoformat()}}, {'_id': 0}):
+            change_index.add(ChangeEvent.from_dict(doc))
+        print(f"[OK] Change index loaded ({len(change_index)} changes)")
+    except Exception as e:
+        print(f"[ERROR] Change index backfill failed: {e}")
+
+
+if db is not None:
+    threading.Thread(target=_backfill_change_index, name='change-index-backfill',
+                     daemon=True).start()
+
+
+def _fetch_anomalies(anomaly_ids):
+    """Load stored anomalies by ID in request order, skipping unknown and repeated IDs."""
+    if db is None:
+        return []
+    if anomaly_writer is not None:
+        # Anomalies detected moments ago may still be buffered
+        anomaly_writer.flush()
+    return list(_iter_anomalies(list(dict.fromkeys(anomaly_ids)), ANOMALY_RCA_PROJECTION))
+
+
+def _iter_anomalies(anomaly_ids, projection):
+    """Yield anomalies from MongoDB in the given ID order, one $in query per chunk."""
+    for start in range(0, len(anomaly_ids), ANOMALY_FETCH_BATCH):
+        chunk = anomaly_ids[start:start + ANOMALY_FETCH_BATCH]
+        found = {doc['id']: doc for doc in db.anomalies.find({'id': {'$in': chunk}}, projection)}
+        for anomaly_id in chunk:
+            if anomaly_id in found:
+                yield found[anomaly_id]
+
 
 # ==========================
 # Clerk JWT Auth Middleware
@@ -156,8 +511,7 @@ def health_check():
 def get_system_health():
     """Get overall system health status"""
     try:
-        anomaly_count = db.anomalies.count_documents({}) if db is not None else 0
-        rca_count = db.rca_results.count_documents({}) if db is not None else 0
+        counts = platform_statistics.read() if platform_statistics is not None else None
         
         # Get recent anomalies
         recent_anomalies = []
@@ -174,11 +528,12 @@ def get_system_health():
         return jsonify({
             'status': 'ok',
             'statistics': {
-                'total_anomalies': anomaly_count,
-                'total_rca_reports': rca_count,
+                'total_anomalies': counts['anomalies']['total'] if counts else 0,
+                'total_rca_reports': counts['rca_results']['total'] if counts else 0,
             },
             'current_metrics': current_metrics,
-            'recent_anomalies': recent_anomalies
+            'recent_anomalies': recent_anomalies,
+            'anomaly_ingest': anomaly_writer.get_statistics() if anomaly_writer is not None else None
         }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -234,9 +589,15 @@ def detect_anomalies():
         
         # Store in database
         all_anomalies = log_anomalies + metric_anomalies
-        if db is not None and all_anomalies:
-            for anomaly in all_anomalies:
-                db.anomalies.insert_one(anomaly.to_dict())
+        if anomaly_collection is not None and all_anomalies:
+            documents = [anomaly.to_dict() for anomaly in all_anomalies]
+            if anomaly_writer is not None:
+                anomaly_writer.add_many(documents)
+            else:
+                insert_unordered(anomaly_collection, documents)
+            platform_statistics.record('anomalies', documents)
+        for anomaly in all_anomalies:
+            event_hub.publish('anomaly', anomaly.to_dict())
         
         # Trigger RCA if critical anomalies detected
         critical_anomalies = [a for a in all_anomalies if a.severity == 'CRITICAL']
@@ -246,24 +607,47 @@ def detect_anomalies():
             
             # Perform RCA
             if correlated:
-                rca_result = rca_engine.analyze_root_cause(correlated)
+                rca_result = rca_engine.analyze_root_cause(
+                    correlated,
+                    component_scores=event_correlator.component_anomaly_scores(all_anomalies),
+                    dependency_graph=event_correlator.dependency_graph
+                )
                 if db is not None:
-                    db.rca_results.insert_one({
+                    features = incident_vectorizer.extract_features(
+                        all_anomalies, rca_result.affected_components
+                    )
+                    report = {
                         'root_cause': rca_result.root_cause,
                         'confidence': rca_result.confidence,
                         'affected_components': rca_result.affected_components,
+                        'root_cause_candidates': rca_result.root_cause_candidates,
+                        'causal_order': rca_result.causal_order,
+                        'related_changes': rca_result.related_changes,
                         'recommendations': rca_result.recommendations,
-                        'timestamp': rca_result.timestamp.isoformat()
-                    })
+                        'evidence': rca_result.evidence.top(EVIDENCE_TOP_K),
+                        'evidence_count': len(rca_result.evidence),
+                        'anomaly_ids': [a.id for a in all_anomalies],
+                        'timestamp': rca_result.timestamp.isoformat(),
+                        'incident_features': features
+                    }
+                    inserted = db.rca_results.insert_one(report)
+                    platform_statistics.record('rca_results', [report])
+                    _index_incident(str(inserted.inserted_id), report, features)
+                    _publish_rca_result(str(inserted.inserted_id), report)
                 
                 # Send alerts
                 alert_system.send_alert({
                     'type': 'CRITICAL_ANOMALY',
+                    'severity': 'CRITICAL',
                     'root_cause': rca_result.root_cause,
                     'confidence': rca_result.confidence,
+                    'affected_components': rca_result.affected_components,
                     'anomaly_count': len(critical_anomalies)
                 })
         
+        # Learn co-occurrences once, at ingest, after the windows were scored
+        event_correlator.learn(all_anomalies)
+        
         return jsonify({
             'detected_anomalies': len(all_anomalies),
             'log_anomalies': [a.to_dict() for a in log_anomalies],
@@ -278,6 +662,78 @@ def detect_anomalies():
 # RCA (Root Cause Analysis) Endpoints
 # ==========================
 
+def _run_rca_analysis(anomaly_ids):
+    """
+    Fetch anomalies, correlate them, run RCA and store the result.
+    Raises LookupError if none of the anomaly IDs exist.
+    """
+    # Fetch anomalies from database
+    anomalies = _fetch_anomalies(anomaly_ids)
+    
+    if not anomalies:
+        raise LookupError('No valid anomalies found')
+    
+    # Correlate events
+    correlated = event_correlator.correlate_anomalies(anomalies)
+    
+    # Infer lead/lag between metric series around the incident
+    lead_lag = _compute_lead_lag(anomalies)
+    
+    # Perform RCA
+    rca_result = rca_engine.analyze_root_cause(
+        correlated,
+        lead_lag=lead_lag,
+        component_scores=event_correlator.component_anomaly_scores(anomalies),
+        dependency_graph=event_correlator.dependency_graph
+    )
+    
+    # Generate recommendations
+    recommendations = recommendation_engine.generate_recommendations(rca_result)
+    
+    # Store result
+    result_dict = {
+        'root_cause': rca_result.root_cause,
+        'confidence': rca_result.confidence,
+        'affected_components': rca_result.affected_components,
+        'root_cause_candidates': rca_result.root_cause_candidates,
+        'causal_chain': list(rca_result.causal_chain),
+        'causal_order': rca_result.causal_order,
+        'related_changes': rca_result.related_changes,
+        'lead_lag': lead_lag,
+        'recommendations': [r['action'] for r in recommendations],
+        'evidence': rca_result.evidence.top(EVIDENCE_TOP_K),
+        'evidence_count': len(rca_result.evidence),
+        'anomaly_ids': [a['id'] for a in anomalies],
+        'timestamp': rca_result.timestamp.isoformat()
+    }
+    
+    # Look up similar past incidents before this one joins the index
+    features = incident_vectorizer.extract_features(anomalies, rca_result.affected_components)
+    result_dict['similar_incidents'] = _find_similar_incidents(features)
+    
+    if db is not None:
+        # insert_one adds an ObjectId '_id' to the document it is given,
+        # so store a copy and keep result_dict JSON-serializable
+        inserted = db.rca_results.insert_one(dict(result_dict, incident_features=features))
+        platform_statistics.record('rca_results', [result_dict])
+        _index_incident(str(inserted.inserted_id), result_dict, features)
+        _publish_rca_result(str(inserted.inserted_id), result_dict)
+    
+    return result_dict
+
+
+def _publish_rca_result(report_id, report):
+    """Push a stored RCA report to stream subscribers, as /api/rca-reports lists it."""
+    event = {key: value for key, value in report.items() if key != 'incident_features'}
+    event['_id'] = report_id
+    event_hub.publish('rca_result', event)
+
+
+def _anomaly_set_key(anomaly_ids):
+    """Order-independent key of a set of anomaly IDs, used to coalesce jobs."""
+    return hashlib.sha256('\n'.join(sorted(set(anomaly_ids))).encode('utf-8')).hexdigest()
+
+
 @app.route('/api/rca/analyze', methods=['POST'])
 def analyze_root_cause():
     """Perform root cause analysis on provided anomalies"""
@@ -288,44 +744,427 @@ def analyze_root_cause():
         if not anomaly_ids:
             return jsonify({'error': 'No anomaly IDs provided'}), 400
         
-        # Fetch anomalies from database
-        anomalies = []
-        if db is not None:
-            for anomaly_id in anomaly_ids:
-                anomaly_data = db.anomalies.find_one({'id': anomaly_id})
-                if anomaly_data:
-                    anomalies.append(anomaly_data)
+        try:
+            result_dict = _run_rca_analysis(anomaly_ids)
+        except LookupError as e:
+            return jsonify({'error': str(e)}), 404
+        
+        return jsonify(result_dict), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/rca/similar', methods=['POST'])
+def get_similar_incidents():
+    """Find the past RCA results most similar to a set of anomalies"""
+    try:
+        data = request.json or {}
+        anomaly_ids = data.get('anomaly_ids', [])
+        k = min(int(data.get('k', 5)), 50)
         
+        if not anomaly_ids:
+            return jsonify({'error': 'No anomaly IDs provided'}), 400
+        
+        anomalies = _fetch_anomalies(anomaly_ids)
         if not anomalies:
             return jsonify({'error': 'No valid anomalies found'}), 404
         
-        # Correlate events
-        correlated = event_correlator.correlate_anomalies(anomalies)
+        # The components stored RCA results were indexed with
+        candidates = rca_engine.localize_root_cause(
+            event_correlator.component_anomaly_scores(anomalies),
+            event_correlator.dependency_graph
+        )
+        features = incident_vectorizer.extract_features(
+            anomalies, [candidate['component'] for candidate in candidates]
+        )
         
-        # Perform RCA
-        rca_result = rca_engine.analyze_root_cause(correlated)
+        return jsonify({
+            'similar_incidents': _find_similar_incidents(features, k=k),
+            'indexed_incidents': len(incident_index)
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def _update_open_incident(incident_id, anomaly_ids):
+    """Correlate newly added anomalies and fold them into an open incident."""
+    anomalies = _fetch_anomalies(anomaly_ids)
+    if not anomalies:
+        raise LookupError('No valid anomalies found')
+    
+    # Anomalies too sparse to form a correlated event still join the incident
+    correlated = event_correlator.correlate_anomalies(anomalies)
+    grouped = {id(a) for ce in correlated for a in ce.anomalies}
+    loose = [a for a in anomalies if id(a) not in grouped]
+    rca_result = rca_engine.update_incident(incident_id, correlated, anomalies=loose)
+    
+    return {
+        'incident_id': incident_id,
+        'root_cause': rca_result.root_cause,
+        'confidence': rca_result.confidence,
+        'affected_components': rca_result.affected_components,
+        'causal_chain': list(rca_result.causal_chain),
+        'causal_order': rca_result.causal_order,
+        'related_changes': rca_result.related_changes,
+        'recommendations': rca_result.recommendations,
+        'evidence': rca_result.evidence.top(EVIDENCE_TOP_K),
+        'evidence_count': len(rca_result.evidence),
+        'state': rca_engine.get_incident_state(incident_id),
+        'timestamp': rca_result.timestamp.isoformat()
+    }
+
+
+@app.route('/api/rca/incidents', methods=['POST'])
+def open_rca_incident():
+    """Open an incrementally analyzed incident with its first anomalies"""
+    try:
+        data = request.json or {}
+        anomaly_ids = data.get('anomaly_ids', [])
         
-        # Generate recommendations
-        recommendations = recommendation_engine.generate_recommendations(rca_result)
+        if not anomaly_ids:
+            return jsonify({'error': 'No anomaly IDs provided'}), 400
         
-        # Store result
-        result_dict = {
-            'root_cause': rca_result.root_cause,
-            'confidence': rca_result.confidence,
-            'affected_components': rca_result.affected_components,
-            'causal_chain': rca_result.causal_chain,
-            'recommendations': [r['action'] for r in recommendations],
-            'timestamp': rca_result.timestamp.isoformat()
-        }
+        incident_id = rca_engine.open_incident(dependency_graph=event_correlator.dependency_graph)
+        try:
+            result_dict = _update_open_incident(incident_id, anomaly_ids)
+        except LookupError as e:
+            rca_engine.close_incident(incident_id)
+            return jsonify({'error': str(e)}), 404
         
-        if db is not None:
-            db.rca_results.insert_one(result_dict)
+        return jsonify(result_dict), 201
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/rca/incidents/<incident_id>/anomalies', methods=['POST'])
+def add_rca_incident_anomalies(incident_id):
+    """Add new anomalies to an open incident and rescore it incrementally"""
+    try:
+        data = request.json or {}
+        anomaly_ids = data.get('anomaly_ids', [])
+        
+        if not anomaly_ids:
+            return jsonify({'error': 'No anomaly IDs provided'}), 400
+        
+        if rca_engine.get_incident_state(incident_id) is None:
+            return jsonify({'error': 'Incident not found'}), 404
+        
+        try:
+            result_dict = _update_open_incident(incident_id, anomaly_ids)
+        except KeyError:
+            return jsonify({'error': 'Incident not found'}), 404
+        except LookupError as e:
+            return jsonify({'error': str(e)}), 404
         
         return jsonify(result_dict), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/rca/incidents/<incident_id>', methods=['GET'])
+def get_rca_incident(incident_id):
+    """Get the feature state of an open incident"""
+    try:
+        state = rca_engine.get_incident_state(incident_id)
+        
+        if state is None:
+            return jsonify({'error': 'Incident not found'}), 404
+        
+        return jsonify(state), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/rca/incidents/<incident_id>', methods=['DELETE'])
+def close_rca_incident(incident_id):
+    """Close an open incident and drop its state"""
+    try:
+        if not rca_engine.close_incident(incident_id):
+            return jsonify({'error': 'Incident not found'}), 404
+        
+        return jsonify({'message': 'Incident closed'}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/rca/jobs', methods=['POST'])
+def submit_rca_job():
+    """Submit an asynchronous RCA job; returns a job ID to poll"""
+    try:
+        data = request.json
+        anomaly_ids = data.get('anomaly_ids', []) if data else []
+        
+        if not anomaly_ids:
+            return jsonify({'error': 'No anomaly IDs provided'}), 400
+        
+        try:
+            job, coalesced = rca_job_queue.submit(
+                _anomaly_set_key(anomaly_ids), _run_rca_analysis, list(anomaly_ids)
+            )
+        except QueueFullError as e:
+            return jsonify({'error': str(e)}), 429
+        
+        return jsonify({
+            'job_id': job.job_id,
+            'status': job.status,
+            'coalesced': coalesced
+        }), 202
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/rca/jobs/<job_id>', methods=['GET'])
+def get_rca_job(job_id):
+    """Get status (and result, once finished) of an RCA job"""
+    try:
+        job = rca_job_queue.get_job(job_id)
+        
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify(job.to_dict()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/rca/jobs', methods=['GET'])
+def get_rca_job_statistics():
+    """Get RCA job queue statistics"""
+    try:
+        return jsonify(rca_job_queue.get_statistics()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/dependencies', methods=['GET'])
+def get_dependencies():
+    """Get the service dependency graph used for correlation and localization"""
+    return jsonify({'dependencies': event_correlator.dependency_graph}), 200
+
+
+@app.route('/api/dependencies', methods=['POST'])
+def set_dependencies():
+    """Replace the service dependency graph (component -> list of dependencies)"""
+    try:
+        data = request.json
+        dependencies = data.get('dependencies') if data else None
+        
+        if not isinstance(dependencies, dict) or not all(
+            isinstance(deps, list) for deps in dependencies.values()
+        ):
+            return jsonify({'error': 'dependencies must map components to lists'}), 400
+        
+        event_correlator.set_dependencies(dependencies)
+        
+        return jsonify({
+            'message': 'Dependencies updated',
+            'components': len(dependencies)
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ==========================
+# Historical Fix Endpoints
+# ==========================
+
+@app.route('/api/recommendations/fixes', methods=['POST'])
+def record_fix():
+    """Record the outcome of a fix applied for a root cause"""
+    try:
+        data = request.json or {}
+        root_cause = data.get('root_cause')
+        action_taken = data.get('action_taken')
+        success = data.get('success')
+        resolve_seconds = data.get('resolve_seconds')
+        report_id = data.get('report_id')
+        
+        if not root_cause or not action_taken or not isinstance(success, bool):
+            return jsonify({'error': 'root_cause, action_taken and boolean success are required'}), 400
+        if report_id is not None and not isinstance(report_id, str):
+            return jsonify({'error': 'report_id must be a string'}), 400
+        if resolve_seconds is not None and (
+            isinstance(resolve_seconds, bool) or not isinstance(resolve_seconds, (int, float))
+            or resolve_seconds < 0
+        ):
+            return jsonify({'error': 'resolve_seconds must be a non-negative number'}), 400
+        
+        fix = recommendation_engine.record_fix(root_cause, action_taken, success, resolve_seconds,
+                                               report_id=report_id)
+        
+        return jsonify(fix.to_dict()), 201
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/recommendations/fixes', methods=['GET'])
+def get_fixes():
+    """Get the most recent fixes recorded for a root cause"""
+    try:
+        root_cause = request.args.get('root_cause')
+        if not root_cause:
+            return jsonify({'error': 'root_cause is required'}), 400
+        limit = int(request.args.get('limit', 10))
+        
+        fixes = recommendation_engine.get_historical_fixes(root_cause, limit=limit)
+        
+        return jsonify({
+            'root_cause': root_cause,
+            'fixes': [f.to_dict() for f in fixes],
+            'count': len(fixes)
+        }), 200
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/recommendations/stats', methods=['GET'])
+def get_action_statistics():
+    """Get the actions with the best smoothed success rate for a root cause"""
+    try:
+        root_cause = request.args.get('root_cause')
+        if not root_cause:
+            return jsonify({'error': 'root_cause is required'}), 400
+        limit = int(request.args.get('limit', 10))
+        
+        recommendation_engine.fix_store.refresh()
+        
+        return jsonify({
+            'root_cause': root_cause,
+            'actions': recommendation_engine.ranker.top_actions(root_cause, k=limit)
+        }), 200
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ==========================
+# Change Event Endpoints
+# ==========================
+
+@app.route('/api/changes', methods=['POST'])
+def record_change_event():
+    """Record a deploy start/end, config push or feature flag change"""
+    try:
+        data = request.json
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Change event body required'}), 400
+        
+        try:
+            event = change_index.record(data)
+        except (ValueError, TypeError) as e:
+            return jsonify({'error': str(e)}), 400
+        except KeyError:
+            return jsonify({'error': 'Unknown change_id'}), 404
+        
+        change = event.to_dict()
+        if db is not None:
+            db.change_events.replace_one({'change_id': event.change_id}, change, upsert=True)
+        
+        return jsonify(change), 201
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/changes', methods=['GET'])
+def get_change_events():
+    """Get changes of the given services that overlapped or preceded a time window"""
+    try:
+        services = request.args.getlist('service') or None
+        end = _parse_timestamp(request.args.get('end')) or datetime.now()
+        start = _parse_timestamp(request.args.get('start')) or end - timedelta(hours=1)
+        lookback = timedelta(minutes=float(request.args.get('lookback_minutes', 30)))
+        
+        changes = change_index.query(services, start, end, lookback)
+        
+        return jsonify({
+            'changes': [c.to_dict() for c in changes],
+            'count': len(changes),
+            'indexed_changes': len(change_index)
+        }), 200
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/rca/rules', methods=['GET'])
+def get_rca_rules():
+    """Get the active RCA rule set"""
+    try:
+        rule_set = rca_engine.rule_set
+        return jsonify({
+            'version': rule_set.version,
+            'source': rule_set.source,
+            'store': rule_store.get_status() if rule_store is not None else None,
+            'rules': [asdict(rule) for rule in rule_set.rules]
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/rca/rules', methods=['POST'])
+@require_admin
+def publish_rca_rules():
+    """Publish a new RCA rule-set version to MongoDB"""
+    try:
+        if rule_store is None or not isinstance(rule_store.source, MongoRuleSource):
+            return jsonify({'error': 'Rule publishing requires RCA_RULES_SOURCE=mongo'}), 400
+        
+        data = request.json or {}
+        rules = data.get('rules')
+        expected_version = data.get('expected_version')
+        if expected_version is not None and (
+            isinstance(expected_version, bool) or not isinstance(expected_version, int)
+        ):
+            return jsonify({'error': 'expected_version must be an integer'}), 400
+        
+        try:
+            version = rule_store.source.publish(rules, expected_version=expected_version)
+        except RuleVersionConflictError as e:
+            return jsonify({'error': str(e)}), 409
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Activate here right away; other workers pick it up on their next poll
+        rule_store.refresh()
+        
+        return jsonify({'message': 'Rules published', 'version': version}), 201
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/rca/rules/stats', methods=['GET'])
+def get_rca_rule_statistics():
+    """Get per-rule evaluation counts, hit rates, timing and confidence distribution"""
+    try:
+        return jsonify(rca_engine.get_rule_statistics()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/rca/rules/stats', methods=['DELETE'])
+@require_admin
+def reset_rca_rule_statistics():
+    """Reset per-rule evaluation telemetry"""
+    try:
+        rca_engine.profiler.reset()
+        return jsonify({'message': 'Rule statistics reset'}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/rca/cache', methods=['GET'])
+def get_rca_cache_statistics():
+    """Get RCA result cache hit/miss statistics"""
+    try:
+        return jsonify(rca_engine.get_cache_statistics()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/rca-reports', methods=['GET'])
 def get_rca_reports():
     """Get all RCA analysis reports"""
@@ -347,19 +1186,50 @@ def get_rca_reports():
         return jsonify({'error': str(e)}), 500
 
 
+def _iter_report_anomalies(anomaly_ids):
+    """Yield a report's anomalies from MongoDB in batches, in stored order."""
+    return _iter_anomalies(anomaly_ids, ANOMALY_EVIDENCE_PROJECTION)
+
+
 @app.route('/api/rca-reports/<report_id>', methods=['GET'])
 def get_rca_report_detail(report_id):
-    """Get detailed RCA report by ID"""
+    """
+    Get detailed RCA report by ID
+    
+    Query parameters:
+        evidence_offset, evidence_limit: page through the evidence ranked by
+            severity (rebuilt from the report's anomalies)
+        evidence=stream: stream the full evidence as newline-delimited JSON
+    """
     try:
-        if not db:
+        if db is None:
             return jsonify({'error': 'Database not available'}), 500
         
-        report = db.rca_results.find_one({'_id': report_id})
+        try:
+            report = db.rca_results.find_one({'_id': ObjectId(report_id)})
+        except InvalidId:
+            report = None
         
         if not report:
             return jsonify({'error': 'Report not found'}), 404
         
         report['_id'] = str(report['_id'])
+        anomaly_ids = report.get('anomaly_ids', [])
+        
+        if request.args.get('evidence') == 'stream':
+            def generate():
+                for anomaly in _iter_report_anomalies(anomaly_ids):
+                    yield json.dumps(evidence_entry(anomaly), default=str) + '\n'
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+        if 'evidence_offset' in request.args or 'evidence_limit' in request.args:
+            offset = max(int(request.args.get('evidence_offset', 0)), 0)
+            limit = min(max(int(request.args.get('evidence_limit', EVIDENCE_TOP_K)), 0), 1000)
+            evidence = LazyEvidence(list(_iter_report_anomalies(anomaly_ids)))
+            report['evidence'] = evidence.top(limit, offset)
+            report['evidence_offset'] = offset
+            report['evidence_count'] = len(evidence)
         
         return jsonify(report), 200
     except Exception as e:
@@ -451,7 +1321,7 @@ def get_alerts():
             for alert in alerts:
                 alert['_id'] = str(alert['_id'])
         else:
-            alerts = []
+            alerts = alert_system.get_alert_history(limit=50)
         
         return jsonify({
             'total': len(alerts),
@@ -471,21 +1341,98 @@ def acknowledge_alert():
         if not alert_id:
             return jsonify({'error': 'No alert ID provided'}), 400
         
+        # Alerts held in memory are acknowledged in MongoDB by the persister
+        if alert_system.acknowledge_alert(alert_id):
+            return jsonify({'message': 'Alert acknowledged'}), 200
+        
         if db is not None:
             result = db.alerts.update_one(
                 {'id': alert_id},
                 {'$set': {
                     'acknowledged': True,
-                    'acknowledged_at': datetime.now().isoformat()
+                    'acknowledged_at': datetime.now()
                 }}
             )
             
             if result.modified_count > 0:
                 return jsonify({'message': 'Alert acknowledged'}), 200
-            else:
-                return jsonify({'error': 'Alert not found'}), 404
-        else:
-            return jsonify({'error': 'Database not available'}), 500
+        
+        return jsonify({'error': 'Alert not found'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/alerts/notifications', methods=['GET'])
+def get_notification_statistics():
+    """Get notification delivery metrics (queue depth, latency, retries) per channel"""
+    try:
+        stats = notification_dispatcher.get_statistics()
+        stats['deduplication'] = alert_system.get_dedup_statistics()
+        if alert_persister is not None:
+            stats['persistence'] = alert_persister.get_statistics()
+        stats['escalation'] = alert_system.get_escalation_statistics()
+        stats['digest'] = alert_system.get_digest_statistics()
+        stats['undeliverable'] = alert_system.get_undeliverable_statistics()
+        return jsonify(stats), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/stream', methods=['GET'])
+def stream_events():
+    """
+    Server-Sent Events stream of new alerts ('alert'), anomalies ('anomaly')
+    and RCA results ('rca_result'). A reconnecting client passes the last
+    event ID it received (Last-Event-ID header or last_event_id parameter) to
+    get the events it missed; a 'reset' event means it must refetch instead.
+    """
+    if not request.environ.get('wsgi.multithread'):
+        # On a sync worker one stream would block the worker for every other request
+        return jsonify({'error': 'Event stream needs threaded workers (gunicorn -c gunicorn.conf.py)'}), 503
+    
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        subscription = event_hub.subscribe(last_event_id)
+    except TooManySubscribersError as e:
+        return jsonify({'error': str(e)}), 503
+    
+    def generate():
+        try:
+            while not subscription.closed:
+                events = subscription.get(timeout=STREAM_HEARTBEAT_SECONDS)
+                if events:
+                    yield ''.join(event.encode() for event in events)
+                else:
+                    # Keeps proxies from closing an idle connection
+                    yield ': keep-alive\n\n'
+        finally:
+            subscription.close()
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/stream/stats', methods=['GET'])
+def get_stream_statistics():
+    """Get event stream subscriber and event counters"""
+    try:
+        return jsonify(event_hub.get_statistics()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/alerts/dead-letters', methods=['GET'])
+def get_notification_dead_letters():
+    """Get notifications that could not be delivered"""
+    try:
+        limit = int(request.args.get('limit', 50))
+        letters = notification_dispatcher.get_dead_letters(limit)
+        return jsonify({'total': len(letters), 'dead_letters': letters}), 200
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -501,14 +1448,17 @@ def get_statistics():
         if db is None:
             return jsonify({'error': 'Database not available'}), 500
         
+        # One read of the counters document instead of a count per figure
+        counts = platform_statistics.read()
+        anomalies_by_severity = counts['anomalies']['by_severity']
         stats = {
-            'total_anomalies': db.anomalies.count_documents({}),
-            'total_rca_reports': db.rca_results.count_documents({}),
-            'total_alerts': db.alerts.count_documents({}),
-            'critical_anomalies': db.anomalies.count_documents({'severity': 'CRITICAL'}),
-            'high_anomalies': db.anomalies.count_documents({'severity': 'HIGH'}),
-            'medium_anomalies': db.anomalies.count_documents({'severity': 'MEDIUM'}),
-            'low_anomalies': db.anomalies.count_documents({'severity': 'LOW'}),
+            'total_anomalies': counts['anomalies']['total'],
+            'total_rca_reports': counts['rca_results']['total'],
+            'total_alerts': counts['alerts']['total'],
+            'critical_anomalies': anomalies_by_severity['CRITICAL'],
+            'high_anomalies': anomalies_by_severity['HIGH'],
+            'medium_anomalies': anomalies_by_severity['MEDIUM'],
+            'low_anomalies': anomalies_by_severity['LOW'],
         }
         
         return jsonify(stats), 200
@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration for the ARCA backend
+Usage: gunicorn -c gunicorn.conf.py app:app
+
+GET /api/stream holds its connection (and, on a sync worker, the whole
+worker) for as long as the browser keeps the page open, so the backend
+must run on threaded workers; /api/stream refuses to stream on sync workers.
+"""
+
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', 4))
+# Every open event stream occupies one thread of its worker;
+# STREAM_MAX_SUBSCRIBERS defaults to half of them
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 32))
+# Streams send a keep-alive every STREAM_HEARTBEAT_SECONDS, well within this
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
@@ -7,9 +7,31 @@ from .rca_engine import RCAEngine, RCAResult, Rule, CorrelatedEvent
 from .log_collector import LogCollector, LogEntry
 from .metric_collector import MetricCollector
 from .event_correlator import EventCorrelator
+from .cooccurrence_matrix import CooccurrenceMatrix
 from .recommendation_engine import RecommendationEngine, Recommendation, Fix
 from .alert_system import AlertSystem, Alert
 from .sliding_window import SlidingWindow
+from .lag_analyzer import LagAnalyzer, LagResult
+from .rule_index import RuleIndex, RuleSet, IncidentFeatures, IncidentState
+from .rule_store import RuleStore, YamlRuleSource, MongoRuleSource
+from .rca_cache import RCAResultCache
+from .root_cause_localizer import RootCauseLocalizer
+from .job_queue import JobQueue, Job, QueueFullError
+from .rule_profiler import RuleProfiler
+from .evidence import LazyEvidence, LazyList
+from .causal_ordering import CausalOrdering
+from .incident_index import IncidentVectorizer, SimilarIncidentIndex
+from .change_events import ChangeEventIndex, ChangeEvent
+from .fix_store import FixStore
+from .action_ranker import ActionRanker
+from .notification_dispatcher import NotificationDispatcher, WebhookSender
+from .alert_dedup import AlertDeduplicator
+from .alert_persister import AlertPersister
+from .event_stream import EventHub, TooManySubscribersError
+from .escalation import EscalationScheduler, EscalationStep, TimerWheel
+from .notification_digest import DigestBatcher
+from .bulk_writer import WriteBehindBuffer
+from .statistics_counters import StatisticsCounters
 
 __all__ = [
     'AnomalyDetector',
@@ -23,10 +45,47 @@ __all__ = [
     'LogEntry',
     'MetricCollector',
     'EventCorrelator',
+    'CooccurrenceMatrix',
     'RecommendationEngine',
     'Recommendation',
     'Fix',
     'AlertSystem',
     'Alert',
-    'SlidingWindow'
+    'SlidingWindow',
+    'LagAnalyzer',
+    'LagResult',
+    'RuleIndex',
+    'RuleSet',
+    'RuleStore',
+    'YamlRuleSource',
+    'MongoRuleSource',
+    'IncidentFeatures',
+    'IncidentState',
+    'RCAResultCache',
+    'RootCauseLocalizer',
+    'JobQueue',
+    'Job',
+    'QueueFullError',
+    'IncidentVectorizer',
+    'SimilarIncidentIndex',
+    'RuleProfiler',
+    'LazyEvidence',
+    'LazyList',
+    'CausalOrdering',
+    'ChangeEventIndex',
+    'ChangeEvent',
+    'FixStore',
+    'ActionRanker',
+    'NotificationDispatcher',
+    'WebhookSender',
+    'AlertDeduplicator',
+    'AlertPersister',
+    'EventHub',
+    'TooManySubscribersError',
+    'EscalationScheduler',
+    'EscalationStep',
+    'TimerWheel',
+    'DigestBatcher',
+    'WriteBehindBuffer',
+    'StatisticsCounters'
 ]
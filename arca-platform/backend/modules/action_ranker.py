@@ -0,0 +1,206 @@
+"""
+Action Ranker Module
+Ranks recommended actions by how often they actually resolved a root cause,
+using incrementally maintained per-(root cause, action) outcome counts
+"""
+
+from typing import Dict, List, Optional
+import heapq
+import math
+import threading
+
+
+# Prior success rate of an action that has never been tried, by priority
+PRIORITY_PRIORS = {'HIGH': 0.7, 'MEDIUM': 0.5, 'LOW': 0.3}
+DEFAULT_PRIOR = 0.4
+PRIORITY_ORDER = {'HIGH': 0, 'MEDIUM': 1, 'LOW': 2}
+
+
+class _ActionStats:
+    """Outcome counters of one action for one root cause"""
+    __slots__ = ('successes', 'failures', 'resolve_seconds', 'resolved')
+
+    def __init__(self):
+        self.successes = 0
+        self.failures = 0
+        self.resolve_seconds = 0.0
+        self.resolved = 0
+
+
+class ActionRanker:
+    """
+    ActionRanker Class
+    Keeps success/failure counts and time-to-resolve per (root cause,
+    action) and scores actions by the mean of a Beta posterior whose prior
+    comes from the action's static priority. Recording an outcome is O(1);
+    ranking k candidate actions is O(k log k). An optional UCB-style bonus
+    favors actions that have rarely been tried.
+    """
+
+    def __init__(self, prior_strength: float = 2.0, exploration: float = 0.0):
+        """
+        Initialize ActionRanker
+
+        Args:
+            prior_strength: Weight of the priority prior, in pseudo-attempts
+            exploration: UCB bonus coefficient (0 ranks by posterior mean only)
+        """
+        self.prior_strength = prior_strength
+        self.exploration = exploration
+        # root cause -> action -> counters
+        self._stats: Dict[str, Dict[str, _ActionStats]] = {}
+        self._attempts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, root_cause: str, action: str, success: bool,
+               resolve_seconds: Optional[float] = None):
+        """
+        Record the outcome of one fix attempt
+
+        Args:
+            root_cause: Root cause that was addressed
+            action: Action that was taken
+            success: Whether the action resolved the issue
+            resolve_seconds: Time to resolve, if known (successful fixes only)
+        """
+        with self._lock:
+            actions = self._stats.setdefault(root_cause, {})
+            stats = actions.get(action)
+            if stats is None:
+                stats = _ActionStats()
+                actions[action] = stats
+
+            if success:
+                stats.successes += 1
+                if resolve_seconds is not None:
+                    stats.resolve_seconds += resolve_seconds
+                    stats.resolved += 1
+            else:
+                stats.failures += 1
+            self._attempts[root_cause] = self._attempts.get(root_cause, 0) + 1
+
+    def score(self, root_cause: str, action: str, priority: Optional[str] = None) -> float:
+        """
+        Smoothed success estimate of an action
+
+        Args:
+            root_cause: Root cause identifier
+            action: Action text
+            priority: Static priority used as the prior
+
+        Returns:
+            Posterior mean success rate, plus the exploration bonus if enabled
+        """
+        with self._lock:
+            return self._score(root_cause, action, priority)
+
+    def rank(self, root_cause: str, recommendations: List[Dict]) -> List[Dict]:
+        """
+        Order recommendations by smoothed success rate
+
+        Each recommendation gets success_rate, attempts and (when known)
+        avg_resolve_seconds. Ties go to the higher static priority, then to
+        the faster average resolution; actions never tried keep their
+        priority order.
+
+        Args:
+            root_cause: Root cause the recommendations address
+            recommendations: Recommendation dictionaries with action and priority
+
+        Returns:
+            New list of recommendation dictionaries, best first
+        """
+        keyed = []
+        with self._lock:
+            actions = self._stats.get(root_cause, {})
+            for position, rec in enumerate(recommendations):
+                stats = actions.get(rec['action'])
+                rate = self._score(root_cause, rec['action'], rec.get('priority'))
+                ranked = dict(rec, success_rate=round(rate, 4),
+                              attempts=stats.successes + stats.failures if stats else 0)
+                resolve = None
+                if stats is not None and stats.resolved:
+                    resolve = stats.resolve_seconds / stats.resolved
+                    ranked['avg_resolve_seconds'] = round(resolve, 1)
+                keyed.append((
+                    -rate,
+                    PRIORITY_ORDER.get(rec.get('priority'), len(PRIORITY_ORDER)),
+                    resolve if resolve is not None else math.inf,
+                    position,
+                    ranked
+                ))
+
+        keyed.sort(key=lambda entry: entry[:4])
+        return [entry[4] for entry in keyed]
+
+    def top_actions(self, root_cause: str, k: int = 10) -> List[Dict]:
+        """
+        Best actions recorded for a root cause
+
+        Args:
+            root_cause: Root cause identifier
+            k: Number of actions
+
+        Returns:
+            List of action statistics dictionaries, best first
+        """
+        with self._lock:
+            candidates = [
+                (self._score(root_cause, action, None), action, stats)
+                for action, stats in self._stats.get(root_cause, {}).items()
+            ]
+        best = heapq.nlargest(k, candidates, key=lambda c: c[0])
+        return [
+            {
+                'action': action,
+                'success_rate': round(rate, 4),
+                'successes': stats.successes,
+                'failures': stats.failures,
+                'avg_resolve_seconds': round(stats.resolve_seconds / stats.resolved, 1)
+                if stats.resolved else None
+            }
+            for rate, action, stats in best
+        ]
+
+    def _score(self, root_cause: str, action: str, priority: Optional[str]) -> float:
+        """Posterior mean (plus bonus); caller holds the lock"""
+        prior = PRIORITY_PRIORS.get(priority, DEFAULT_PRIOR)
+        stats = self._stats.get(root_cause, {}).get(action)
+        successes = stats.successes if stats else 0
+        attempts = successes + (stats.failures if stats else 0)
+
+        mean = (successes + prior * self.prior_strength) / (attempts + self.prior_strength)
+        if self.exploration <= 0:
+            return mean
+
+        total = self._attempts.get(root_cause, 0)
+        return mean + self.exploration * math.sqrt(math.log(total + 1) / (attempts + 1))
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing ActionRanker...")
+
+    import time
+
+    ranker = ActionRanker()
+    recommendations = [
+        {'action': 'Restart affected services', 'priority': 'HIGH'},
+        {'action': 'Profile memory usage', 'priority': 'HIGH'},
+        {'action': 'Implement memory limits', 'priority': 'MEDIUM'},
+    ]
+    print(f"✅ Without history: {[r['action'] for r in ranker.rank('MEMORY_LEAK', recommendations)]}")
+
+    for _ in range(4):
+        ranker.record('MEMORY_LEAK', 'Restart affected services', False)
+        ranker.record('MEMORY_LEAK', 'Implement memory limits', True, resolve_seconds=900)
+    ranked = ranker.rank('MEMORY_LEAK', recommendations)
+    print(f"✅ With history: {[(r['action'], r['success_rate']) for r in ranked]}")
+
+    start = time.perf_counter()
+    for i in range(100000):
+        ranker.record('MEMORY_LEAK', f"action-{i % 500}", i % 3 != 0, resolve_seconds=60)
+    print(f"✅ Record: {(time.perf_counter() - start) * 10:.2f} us per fix")
+    print(f"✅ Top action: {ranker.top_actions('MEMORY_LEAK', k=1)[0]['action']}")
+
+    print("✅ ActionRanker tests passed!")
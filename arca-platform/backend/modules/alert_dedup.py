@@ -0,0 +1,266 @@
+"""
+Alert Deduplication Module
+Fingerprints alerts, merges repeats within a time window into the existing
+alert and rate-limits notifications per fingerprint
+"""
+
+from typing import Any, Dict, Iterable, Optional
+from collections import OrderedDict
+import hashlib
+import time
+
+
+def alert_fingerprint(alert_type: str, root_cause: Optional[str] = None,
+                      components: Optional[Iterable[str]] = None) -> str:
+    """
+    Fingerprint of an alert: its type, root cause and affected components
+
+    Args:
+        alert_type: Alert type
+        root_cause: Root cause, if any
+        components: Affected components (order does not matter)
+
+    Returns:
+        Hex digest identifying alerts about the same problem
+    """
+    key = '|'.join([
+        alert_type or '',
+        root_cause or '',
+        ','.join(sorted(set(components or ())))
+    ])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+class BucketedRateCounter:
+    """
+    BucketedRateCounter Class
+    Counts events over a sliding period split into fixed time buckets.
+    A ring of per-bucket counts plus a running total make both adding an
+    event and reading the count O(1) (stale buckets are cleared as the
+    ring advances, at most once each).
+    """
+
+    __slots__ = ('bucket_seconds', 'counts', 'total', 'head')
+
+    def __init__(self, buckets: int, bucket_seconds: float):
+        """
+        Initialize BucketedRateCounter
+
+        Args:
+            buckets: Number of buckets in the period
+            bucket_seconds: Width of one bucket
+        """
+        self.bucket_seconds = bucket_seconds
+        self.counts = [0] * buckets
+        self.total = 0
+        self.head: Optional[int] = None  # absolute index of the newest bucket
+
+    def count(self, now: float) -> int:
+        """Number of events within the period ending at now"""
+        self._advance(now)
+        return self.total
+
+    def add(self, now: float):
+        """Record one event at now"""
+        self._advance(now)
+        self.counts[self.head % len(self.counts)] += 1
+        self.total += 1
+
+    def _advance(self, now: float):
+        """Clear the buckets that fell out of the period"""
+        current = int(now // self.bucket_seconds)
+        if self.head is None:
+            self.head = current
+            return
+        if current <= self.head:
+            return
+
+        size = len(self.counts)
+        if current - self.head >= size:
+            self.counts = [0] * size
+            self.total = 0
+        else:
+            for index in range(self.head + 1, current + 1):
+                slot = index % size
+                self.total -= self.counts[slot]
+                self.counts[slot] = 0
+        self.head = current
+
+
+class AlertDeduplicator:
+    """
+    AlertDeduplicator Class
+    Tracks the open alert of every fingerprint. An alert whose fingerprint
+    was seen less than the window ago is a repeat and is merged into the
+    open alert; expired groups are evicted oldest-first from an ordered
+    dictionary. New alerts of a fingerprint are additionally rate-limited
+    so that a problem flapping slower than the window still cannot flood
+    the notification channels. Not thread-safe; AlertSystem serializes
+    calls.
+    """
+
+    def __init__(self, window_seconds: float = 300, rate_limit: int = 5,
+                 rate_period_seconds: float = 3600, rate_buckets: int = 60,
+                 clock=time.monotonic):
+        """
+        Initialize AlertDeduplicator
+
+        Args:
+            window_seconds: Repeats within this long of the last occurrence are merged
+            rate_limit: Notifications per fingerprint per rate period (0 disables)
+            rate_period_seconds: Length of the rate-limit period
+            rate_buckets: Number of time buckets the period is split into
+            clock: Monotonic time source in seconds
+        """
+        self.window_seconds = window_seconds
+        self.rate_limit = rate_limit
+        self.rate_period_seconds = rate_period_seconds
+        self.rate_buckets = rate_buckets
+        self.clock = clock
+
+        # fingerprint -> (alert, last_seen), least recently seen first
+        self._groups: 'OrderedDict[str, list]' = OrderedDict()
+        # fingerprint -> notification counter, least recently notified first
+        self._rates: 'OrderedDict[str, BucketedRateCounter]' = OrderedDict()
+        self.merged = 0
+        self.throttled = 0
+
+    def find(self, fingerprint: str) -> Optional[Any]:
+        """
+        Find the open alert of a fingerprint and record a repeat on it
+
+        Args:
+            fingerprint: Alert fingerprint
+
+        Returns:
+            The open alert if this is a repeat within the window, else None
+        """
+        now = self.clock()
+        self._expire(now)
+
+        group = self._groups.get(fingerprint)
+        if group is None:
+            return None
+
+        group[1] = now
+        self._groups.move_to_end(fingerprint)
+        self.merged += 1
+        return group[0]
+
+    def peek(self, fingerprint: str) -> Optional[Any]:
+        """
+        Get the open alert of a fingerprint without recording a repeat
+
+        Args:
+            fingerprint: Alert fingerprint
+
+        Returns:
+            The open alert if one was seen within the window, else None
+        """
+        group = self._groups.get(fingerprint)
+        if group is None or self.clock() - group[1] >= self.window_seconds:
+            return None
+        return group[0]
+
+    def open(self, fingerprint: str, alert: Any) -> bool:
+        """
+        Register a new alert for a fingerprint
+
+        Args:
+            fingerprint: Alert fingerprint
+            alert: The new alert
+
+        Returns:
+            True if its notification is allowed, False if throttled
+        """
+        now = self.clock()
+        self._groups[fingerprint] = [alert, now]
+        self._groups.move_to_end(fingerprint)
+
+        if self.rate_limit <= 0:
+            return True
+
+        counter = self._rates.get(fingerprint)
+        if counter is None:
+            counter = BucketedRateCounter(
+                self.rate_buckets, self.rate_period_seconds / self.rate_buckets
+            )
+            self._rates[fingerprint] = counter
+
+        if counter.count(now) >= self.rate_limit:
+            self.throttled += 1
+            return False
+        counter.add(now)
+        self._rates.move_to_end(fingerprint)
+        return True
+
+    def close(self, fingerprint: str, alert: Optional[Any] = None):
+        """
+        Forget the open alert of a fingerprint (e.g. once acknowledged)
+
+        Args:
+            fingerprint: Alert fingerprint
+            alert: Only close the group if this is its open alert
+        """
+        group = self._groups.get(fingerprint)
+        if group is not None and (alert is None or group[0] is alert):
+            del self._groups[fingerprint]
+
+    def get_statistics(self) -> Dict:
+        """Get dedup and throttling counters"""
+        self._expire(self.clock())
+        return {
+            'window_seconds': self.window_seconds,
+            'open_groups': len(self._groups),
+            'merged': self.merged,
+            'throttled': self.throttled
+        }
+
+    def _expire(self, now: float):
+        """Drop groups not seen within the window, oldest first"""
+        groups = self._groups
+        while groups:
+            fingerprint, (_, last_seen) = next(iter(groups.items()))
+            if now - last_seen < self.window_seconds:
+                break
+            groups.popitem(last=False)
+
+        # Counters with no notification in the last period are empty
+        rates = self._rates
+        while rates:
+            fingerprint, counter = next(iter(rates.items()))
+            if counter.count(now) > 0:
+                break
+            rates.popitem(last=False)
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing AlertDeduplicator...")
+
+    clock = [0.0]
+    dedup = AlertDeduplicator(window_seconds=60, rate_limit=2, rate_period_seconds=3600,
+                              clock=lambda: clock[0])
+    fingerprint = alert_fingerprint('CRITICAL_ANOMALY', 'MEMORY_LEAK', ['app-server', 'cache'])
+    print(f"✅ Order-independent fingerprint: "
+          f"{fingerprint == alert_fingerprint('CRITICAL_ANOMALY', 'MEMORY_LEAK', ['cache', 'app-server'])}")
+
+    # Repeats 20 s apart are merged; the problem then flaps every 2 minutes
+    notified = []
+    times = [0, 20, 40] + [160 + 120 * i for i in range(5)]
+    for t in times:
+        clock[0] = float(t)
+        if dedup.find(fingerprint) is None:
+            notified.append(dedup.open(fingerprint, f"alert@{t}"))
+
+    print(f"✅ Notifications allowed: {notified}")
+    print(f"✅ Stats: {dedup.get_statistics()}")
+
+    counter = BucketedRateCounter(60, 60)
+    start = time.perf_counter()
+    for i in range(1000000):
+        counter.add(i * 0.01)
+    print(f"✅ Rate counter: {(time.perf_counter() - start):.2f} us per event, "
+          f"{counter.count(1000000 * 0.01)} in the last hour")
+
+    print("✅ AlertDeduplicator tests passed!")
@@ -0,0 +1,511 @@
+"""
+Alert Persister Module
+Write-behind persistence of alerts to MongoDB: batched unordered inserts,
+coalesced updates and an on-disk spool that survives MongoDB outages and
+restarts
+"""
+
+from typing import Dict, List, Optional
+import glob
+import os
+import shutil
+import threading
+import time
+
+from bson import json_util
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure
+
+try:
+    from .statistics_counters import StatisticsCounters
+except ImportError:
+    from statistics_counters import StatisticsCounters
+
+
+# MongoDB duplicate key error: the document was already written by an
+# earlier (replayed) attempt
+DUPLICATE_KEY = 11000
+
+
+class AlertPersister:
+    """
+    AlertPersister Class
+    Buffers alert inserts and updates and writes them in batches from a
+    background thread: inserts as one unordered insert_many, updates
+    coalesced per alert into one unordered bulk_write.
+
+    With a spool directory every operation is first appended to this
+    process's current spool segment. A flush seals that segment before
+    writing the batch and deletes it only once MongoDB accepted the batch;
+    sealed segments left behind by failed flushes or by crashed workers are
+    replayed on later flushes. Documents are keyed by the alert ID, so a
+    replayed insert fails as a duplicate and is ignored, and updates are
+    plain $set operations: delivery is at-least-once and idempotent.
+
+    Operations MongoDB rejects (write errors other than duplicates) are
+    moved to a dead-letter file right away. A segment or batch whose write
+    keeps failing for any other reason than MongoDB being unreachable is
+    moved there after max_attempts tries, so it cannot block the rest.
+    """
+
+    def __init__(self, collection, spool_dir: Optional[str] = None,
+                 flush_interval_seconds: float = 1.0, batch_size: int = 500,
+                 max_buffered: int = 100000, statistics: Optional[StatisticsCounters] = None,
+                 max_attempts: int = 5, dead_letter_dir: Optional[str] = None):
+        """
+        Initialize AlertPersister
+
+        Args:
+            collection: PyMongo collection receiving alert documents
+            spool_dir: Directory for spool segments (None buffers in memory only)
+            flush_interval_seconds: Time between background flushes
+            batch_size: Buffered operations that trigger an early flush
+            max_buffered: Operations kept in memory without a spool before
+                the oldest are dropped
+            statistics: Counts the alerts once they are inserted (None
+                counts nothing)
+            max_attempts: Failed writes of a segment or batch, other than
+                connection failures, before it is dead-lettered
+            dead_letter_dir: Directory for dead-letter files (default: the
+                spool directory; without either, dead letters are dropped)
+        """
+        self.collection = collection
+        self.spool_dir = spool_dir
+        self.flush_interval_seconds = flush_interval_seconds
+        self.batch_size = batch_size
+        self.max_buffered = max_buffered
+        self.statistics = statistics
+        self.max_attempts = max_attempts
+        self.dead_letter_dir = dead_letter_dir or spool_dir
+
+        self._buffer: List[Dict] = []
+        self._lock = threading.Lock()
+        # Serializes flushes so segments are written in order
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = True
+        self._segment = None
+        self._segment_path: Optional[str] = None
+        # Segment (None for the requeued batch) whose writes keep failing
+        self._failing: Optional[str] = None
+        self._failed_attempts = 0
+
+        self.written = 0
+        self.failed_flushes = 0
+        self.dropped = 0
+        self.dead_lettered = 0
+        self.last_error: Optional[str] = None
+
+        if self.dead_letter_dir:
+            os.makedirs(self.dead_letter_dir, exist_ok=True)
+        if spool_dir:
+            os.makedirs(spool_dir, exist_ok=True)
+            self._seal_orphaned_segments()
+            self._open_segment()
+
+        self._thread = threading.Thread(target=self._flush_loop, name='alert-persister', daemon=True)
+        self._thread.start()
+
+    def insert(self, document: Dict):
+        """
+        Queue a new alert document
+
+        Args:
+            document: Alert document; its '_id' must be the alert ID
+        """
+        self._enqueue({'op': 'insert', 'doc': document})
+
+    def update(self, alert_id: str, fields: Dict):
+        """
+        Queue a change to a stored alert
+
+        Args:
+            alert_id: Alert ID
+            fields: Fields to set
+        """
+        self._enqueue({'op': 'update', 'id': alert_id, 'set': fields})
+
+    def flush(self) -> bool:
+        """
+        Write buffered operations and replay sealed spool segments
+
+        Returns:
+            True if everything pending was written
+        """
+        with self._flush_lock:
+            with self._lock:
+                operations, self._buffer = self._buffer, []
+                if self._segment is not None:
+                    if operations:
+                        self._seal_segment()
+                    spooled = True
+                else:
+                    spooled = False
+
+            if spooled:
+                # The batch is now the newest sealed segment; replaying all
+                # segments oldest first keeps inserts ahead of their updates
+                return self._replay_spool()
+            if not operations:
+                return True
+            error = self._write_batch(operations)
+            if error is None:
+                self._failing = None
+                return True
+            if self._attempts_exhausted(None, error):
+                self._dead_letter(operations, error)
+            else:
+                self._requeue(operations)
+            return False
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop the background thread after a final flush
+
+        Args:
+            timeout: Maximum seconds to wait for the thread
+        """
+        self._running = False
+        self._wakeup.set()
+        self._thread.join(timeout)
+        self.flush()
+        with self._lock:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+
+    def get_statistics(self) -> Dict:
+        """
+        Get persistence counters
+
+        Returns:
+            Dictionary with buffered operations, spooled segments and errors
+        """
+        with self._lock:
+            buffered = len(self._buffer)
+        return {
+            'buffered': buffered,
+            'spooled_segments': len(self._sealed_segments()),
+            'written': self.written,
+            'failed_flushes': self.failed_flushes,
+            'dropped': self.dropped,
+            'dead_lettered': self.dead_lettered,
+            'last_error': self.last_error
+        }
+
+    def _enqueue(self, operation: Dict):
+        """Spool and buffer one operation"""
+        with self._lock:
+            if self._segment is not None:
+                self._segment.write(json_util.dumps(operation) + '\n')
+                self._segment.flush()
+            self._buffer.append(operation)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def _requeue(self, operations: List[Dict]):
+        """Put back a failed batch when there is no spool to keep it"""
+        with self._lock:
+            self._buffer[:0] = operations
+            overflow = len(self._buffer) - self.max_buffered
+            if overflow > 0:
+                del self._buffer[:overflow]
+                self.dropped += overflow
+
+    def _write_batch(self, operations: List[Dict]) -> Optional[Exception]:
+        """
+        Write one batch to MongoDB; operations it rejects are dead-lettered
+
+        Returns:
+            None once written, otherwise the error (also recorded)
+        """
+        inserts = [op for op in operations if op['op'] == 'insert']
+        updates: Dict[str, Dict] = {}
+        for op in operations:
+            if op['op'] == 'update':
+                updates.setdefault(op['id'], {}).update(op['set'])
+
+        inserted = [op['doc'] for op in inserts]
+        rejected: List[Dict] = []
+        rejection: Optional[Exception] = None
+        try:
+            if inserts:
+                try:
+                    self.collection.insert_many([op['doc'] for op in inserts], ordered=False)
+                except BulkWriteError as e:
+                    failed = _rejected_indexes(e)
+                    rejected.extend(inserts[i] for i in failed if e.details['writeErrors'][failed[i]]['code'] != DUPLICATE_KEY)
+                    rejection = e if rejected else rejection
+                    # Replayed alerts that were already stored are not new
+                    inserted = [op['doc'] for i, op in enumerate(inserts) if i not in failed]
+                # Counted as soon as they are stored: if the updates fail, the
+                # retried batch finds these inserts as duplicates and skips them
+                if self.statistics is not None:
+                    self.statistics.record(self.collection.name, inserted)
+            if updates:
+                changes = [{'op': 'update', 'id': alert_id, 'set': fields} for alert_id, fields in updates.items()]
+                try:
+                    self.collection.bulk_write(
+                        [UpdateOne({'_id': change['id']}, {'$set': change['set']}) for change in changes],
+                        ordered=False
+                    )
+                except BulkWriteError as e:
+                    rejected.extend(changes[i] for i in _rejected_indexes(e))
+                    rejection = e
+        except Exception as e:
+            self.failed_flushes += 1
+            self.last_error = str(e)
+            return e
+
+        if rejected:
+            self._dead_letter(rejected, rejection)
+        self.written += len(operations) - len(rejected)
+        return None
+
+    def _attempts_exhausted(self, segment: Optional[str], error: Exception) -> bool:
+        """Count a failed write of a segment (None: the requeued batch); True once it should be dead-lettered"""
+        if isinstance(error, ConnectionFailure):
+            # MongoDB is unreachable, not rejecting this data; keep waiting
+            return False
+        if segment != self._failing:
+            self._failing = segment
+            self._failed_attempts = 0
+        self._failed_attempts += 1
+        if self._failed_attempts < self.max_attempts:
+            return False
+        self._failing = None
+        return True
+
+    def _dead_letter(self, operations: List[Dict], error: Optional[Exception], segment: Optional[str] = None):
+        """Move operations (or a whole sealed segment) out of the way to a dead-letter file"""
+        self.dead_lettered += len(operations)
+        if not self.dead_letter_dir:
+            self.dropped += len(operations)
+            print(f"❌ Error persisting alerts, dropped {len(operations)} operations: {error}")
+            return
+
+        path = os.path.join(self.dead_letter_dir, f"alerts-dead-{time.time_ns()}-{os.getpid()}.jsonl")
+        try:
+            if segment is not None:
+                shutil.move(segment, path)
+            else:
+                with open(path, 'w', encoding='utf-8') as dead_letters:
+                    dead_letters.writelines(json_util.dumps(op) + '\n' for op in operations)
+        except FileNotFoundError:
+            return  # dead-lettered by another worker
+        print(f"❌ Error persisting alerts, moved {len(operations)} operations to {path}: {error}")
+
+    def _replay_spool(self) -> bool:
+        """Write sealed segments left by failed flushes or other processes"""
+        for path in self._sealed_segments():
+            try:
+                with open(path, 'r', encoding='utf-8') as segment:
+                    operations = [json_util.loads(line) for line in segment if line.strip()]
+            except FileNotFoundError:
+                continue  # replayed by another worker
+            except ValueError:
+                # A crash can leave a torn last line; keep what is readable
+                with open(path, 'r', encoding='utf-8') as segment:
+                    operations = []
+                    for line in segment:
+                        try:
+                            operations.append(json_util.loads(line))
+                        except ValueError:
+                            break
+
+            if operations:
+                error = self._write_batch(operations)
+                if error is not None:
+                    if not self._attempts_exhausted(path, error):
+                        return False
+                    self._dead_letter(operations, error, segment=path)
+                    continue
+            self._failing = None
+            self._remove(path)
+        return True
+
+    def _flush_loop(self):
+        """Flush on the interval, or early when a batch fills up"""
+        while self._running:
+            self._wakeup.wait(self.flush_interval_seconds)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self.last_error = str(e)
+
+    def _open_segment(self):
+        """Open this process's current spool segment; caller holds the lock"""
+        self._segment_path = os.path.join(self.spool_dir, f"alerts-current-{os.getpid()}.jsonl")
+        self._segment = open(self._segment_path, 'a', encoding='utf-8')
+
+    def _seal_segment(self):
+        """Close the current segment under a sealed name and start a new one; caller holds the lock"""
+        self._segment.close()
+        sealed = os.path.join(self.spool_dir, f"alerts-sealed-{time.time_ns()}-{os.getpid()}.jsonl")
+        os.replace(self._segment_path, sealed)
+        self._open_segment()
+
+    def _sealed_segments(self) -> List[str]:
+        """Sealed segments, oldest first"""
+        if not self.spool_dir:
+            return []
+        return sorted(glob.glob(os.path.join(self.spool_dir, 'alerts-sealed-*.jsonl')))
+
+    def _seal_orphaned_segments(self):
+        """Seal current segments of processes that are no longer running"""
+        for path in glob.glob(os.path.join(self.spool_dir, 'alerts-current-*.jsonl')):
+            pid = int(path.rsplit('-', 1)[1].split('.')[0])
+            if pid != os.getpid() and _process_alive(pid):
+                continue
+            sealed = os.path.join(self.spool_dir, f"alerts-sealed-{time.time_ns()}-{pid}.jsonl")
+            try:
+                os.replace(path, sealed)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _remove(path: str):
+        """Delete a spool segment that was written"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _rejected_indexes(error: BulkWriteError) -> Dict[int, int]:
+    """
+    Operations a bulk write rejected, as operation index -> write error index
+
+    Raises the error again if it carries a write concern error: those
+    writes may or may not have been applied, so the batch is retried.
+    """
+    if error.details.get('writeConcernErrors'):
+        raise error
+    return {write_error['index']: i for i, write_error in enumerate(error.details.get('writeErrors', []))}
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process exists (always assumed on non-POSIX systems)"""
+    if os.name != 'posix':
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing AlertPersister...")
+
+    import tempfile
+    from datetime import datetime
+    from pymongo.errors import AutoReconnect, DocumentTooLarge
+
+    class FlakyCollection:
+        """Stand-in collection with unique _id that can be taken offline"""
+        name = 'alerts'
+
+        def __init__(self):
+            self.docs = {}
+            self.online = False
+            self.failing_updates = 0
+
+        def insert_many(self, docs, ordered=True):
+            if not self.online:
+                raise AutoReconnect("MongoDB unavailable")
+            if any(doc.get('message') == 'too large' for doc in docs):
+                raise DocumentTooLarge("BSON document too large")
+            errors = []
+            for i, doc in enumerate(docs):
+                if doc['_id'] in self.docs:
+                    errors.append({'index': i, 'code': DUPLICATE_KEY})
+                elif doc.get('severity') == 'INVALID':
+                    errors.append({'index': i, 'code': 121})  # document failed validation
+                else:
+                    self.docs[doc['_id']] = dict(doc)
+            if errors:
+                raise BulkWriteError({'writeErrors': errors})
+
+        def bulk_write(self, requests, ordered=True):
+            if not self.online:
+                raise AutoReconnect("MongoDB unavailable")
+            if self.failing_updates:
+                self.failing_updates -= 1
+                raise AutoReconnect("connection reset")
+            for request in requests:
+                doc = self.docs.get(request._filter['_id'])
+                if doc is not None:
+                    doc.update(request._doc['$set'])
+
+    spool = tempfile.mkdtemp(prefix='alert-spool-')
+    collection = FlakyCollection()
+    persister = AlertPersister(collection, spool_dir=spool, flush_interval_seconds=3600)
+
+    for i in range(1000):
+        persister.insert({'_id': f"ALERT_{i}", 'id': f"ALERT_{i}", 'severity': 'HIGH',
+                          'timestamp': datetime.now(), 'count': 1})
+    persister.update('ALERT_7', {'count': 5})
+
+    print(f"✅ Flush while MongoDB is down: {persister.flush()}, "
+          f"spooled segments: {persister.get_statistics()['spooled_segments']}")
+
+    # A restarted worker replays the spool; a duplicate replay is harmless
+    persister.stop()
+    collection.online = True
+    restarted = AlertPersister(collection, spool_dir=spool, flush_interval_seconds=3600)
+    start = time.perf_counter()
+    restarted.flush()
+    print(f"✅ Replayed after restart: {len(collection.docs)} alerts, ALERT_7 count "
+          f"{collection.docs['ALERT_7']['count']} in {(time.perf_counter() - start) * 1000:.1f} ms")
+    restarted.insert({'_id': 'ALERT_0', 'id': 'ALERT_0'})
+    print(f"✅ Duplicate insert ignored: {restarted.flush()}, {len(collection.docs)} alerts")
+
+    restarted.insert({'_id': 'ALERT_X', 'id': 'ALERT_X', 'severity': 'INVALID'})
+    restarted.insert({'_id': 'ALERT_1000', 'id': 'ALERT_1000'})
+    print(f"✅ Rejected insert dead-lettered: {restarted.flush()}, {len(collection.docs)} alerts, "
+          f"{restarted.get_statistics()['dead_lettered']} dead letter")
+
+    restarted.insert({'_id': 'ALERT_Y', 'id': 'ALERT_Y', 'message': 'too large'})
+    attempts = [restarted.flush() for _ in range(restarted.max_attempts)]
+    restarted.insert({'_id': 'ALERT_1001', 'id': 'ALERT_1001'})
+    print(f"✅ Failing segment dead-lettered after {len(attempts)} attempts: {restarted.flush()}, "
+          f"{len(collection.docs)} alerts, dead-letter files: "
+          f"{len(glob.glob(os.path.join(spool, 'alerts-dead-*')))}")
+    restarted.stop()
+
+    memory_only = AlertPersister(collection, flush_interval_seconds=3600, max_attempts=2)
+    memory_only.insert({'_id': 'ALERT_Z', 'id': 'ALERT_Z', 'message': 'too large'})
+    memory_only.flush()
+    memory_only.flush()
+    memory_only.insert({'_id': 'ALERT_1002', 'id': 'ALERT_1002'})
+    print(f"✅ Without a spool the batch is dropped after 2 attempts: {memory_only.flush()}, "
+          f"{memory_only.get_statistics()['dropped']} dropped")
+    memory_only.stop()
+
+    # Inserts stored before the updates failed are counted once, not on replay
+    class CountersCollection:
+        """Stand-in counters collection applying $inc"""
+        def __init__(self):
+            self.values = {}
+
+        def update_one(self, query, update, upsert=False):
+            for key, amount in update['$inc'].items():
+                self.values[key] = self.values.get(key, 0) + amount
+
+    counters = CountersCollection()
+    counted = AlertPersister(collection, flush_interval_seconds=3600,
+                             statistics=StatisticsCounters(counters, None, start_thread=False))
+    counted.insert({'_id': 'ALERT_2000', 'id': 'ALERT_2000', 'severity': 'HIGH'})
+    counted.update('ALERT_7', {'count': 6})
+    collection.failing_updates = 1
+    print(f"✅ Updates failed after the insert: {counted.flush()}, replayed: {counted.flush()}, "
+          f"counted {counters.values.get('alerts.total')} alert")
+    counted.stop()
+
+    print("✅ AlertPersister tests passed!")
@@ -3,9 +3,26 @@ Alert System Module
 Manages real-time alerts and notifications
 """
 
-from typing import List, Dict, Optional
-from datetime import datetime
+from typing import Callable, Iterator, List, Dict, Optional
+from datetime import datetime, timedelta
 from dataclasses import dataclass
+from itertools import islice
+import heapq
+import threading
+import uuid
+
+try:
+    from .notification_dispatcher import NotificationDispatcher
+    from .alert_dedup import AlertDeduplicator, alert_fingerprint
+    from .alert_persister import AlertPersister
+    from .escalation import EscalationScheduler, EscalationStep
+    from .notification_digest import DigestBatcher
+except ImportError:
+    from notification_dispatcher import NotificationDispatcher
+    from alert_dedup import AlertDeduplicator, alert_fingerprint
+    from alert_persister import AlertPersister
+    from escalation import EscalationScheduler, EscalationStep
+    from notification_digest import DigestBatcher
 
 
 @dataclass
@@ -18,6 +35,179 @@ class Alert:
     timestamp: datetime
     acknowledged: bool = False
     acknowledged_at: Optional[datetime] = None
+    fingerprint: Optional[str] = None
+    count: int = 1  # occurrences merged into this alert
+    last_seen: Optional[datetime] = None
+    notified: bool = True  # False if the notification was throttled
+    escalation_level: int = 0  # escalation steps run so far
+    recipient: Optional[str] = None  # None for each channel's default recipient
+
+
+# Pending alerts are handled most severe first, then oldest first
+SEVERITY_PRIORITY = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
+
+
+class AlertStore:
+    """
+    AlertStore Class
+    Indexes alerts by ID, by severity and, for unacknowledged alerts, by
+    severity again. All indexes are insertion-ordered dictionaries and
+    alerts arrive in timestamp order, so lookups and acknowledgements are
+    O(1), filters cost only the size of their result, the newest N alerts
+    are read backwards without sorting and old alerts are trimmed from the
+    front. The unacknowledged buckets, visited most severe first, form the
+    pending queue: the next alert to handle is the head of the first
+    non-empty bucket.
+    """
+
+    def __init__(self):
+        """Initialize AlertStore"""
+        self._by_id: Dict[str, Alert] = {}
+        self._by_severity: Dict[str, Dict[str, Alert]] = {}
+        self._pending: Dict[str, Dict[str, Alert]] = {}
+
+    def add(self, alert: Alert):
+        """
+        Add an alert (expected in timestamp order)
+
+        Args:
+            alert: Alert object
+        """
+        self._by_id[alert.alert_id] = alert
+        self._by_severity.setdefault(alert.severity, {})[alert.alert_id] = alert
+        if not alert.acknowledged:
+            self._pending_bucket(alert.severity)[alert.alert_id] = alert
+
+    def get(self, alert_id: str) -> Optional[Alert]:
+        """Get an alert by ID"""
+        return self._by_id.get(alert_id)
+
+    def acknowledge(self, alert_id: str, when: datetime) -> Optional[Alert]:
+        """
+        Mark an alert acknowledged
+
+        Args:
+            alert_id: Alert ID
+            when: Acknowledgement time
+
+        Returns:
+            The alert, or None if unknown
+        """
+        alert = self._by_id.get(alert_id)
+        if alert is None:
+            return None
+        if not alert.acknowledged:
+            alert.acknowledged = True
+            alert.acknowledged_at = when
+            self._unqueue(alert)
+        return alert
+
+    def next_pending(self) -> Optional[Alert]:
+        """
+        Get the most severe, oldest unacknowledged alert
+
+        Returns:
+            Alert object or None
+        """
+        for bucket in self._pending.values():
+            if bucket:
+                return next(iter(bucket.values()))
+        return None
+
+    def pending(self, limit: Optional[int] = None) -> List[Alert]:
+        """
+        Get unacknowledged alerts, most severe first, then oldest first
+
+        Args:
+            limit: Maximum number of alerts
+
+        Returns:
+            List of Alert objects
+        """
+        ordered = (alert for bucket in self._pending.values() for alert in bucket.values())
+        return list(islice(ordered, limit))
+
+    def unacknowledged(self) -> List[Alert]:
+        """Get unacknowledged alerts, oldest first (merges the time-ordered pending buckets)"""
+        return list(heapq.merge(
+            *(bucket.values() for bucket in self._pending.values()),
+            key=lambda alert: alert.timestamp
+        ))
+
+    def by_severity(self, severity: str) -> List[Alert]:
+        """Get alerts of one severity, oldest first"""
+        return list(self._by_severity.get(severity, {}).values())
+
+    def newest(self, limit: Optional[int] = None) -> List[Alert]:
+        """
+        Get the most recent alerts
+
+        Args:
+            limit: Maximum number of alerts
+
+        Returns:
+            List of Alert objects, newest first
+        """
+        return list(islice(reversed(self._by_id.values()), limit))
+
+    def remove_before(self, cutoff: datetime) -> List[Alert]:
+        """
+        Remove alerts created before a cutoff
+
+        Args:
+            cutoff: Oldest timestamp kept
+
+        Returns:
+            The removed alerts, oldest first
+        """
+        removed = []
+        while self._by_id:
+            alert = next(iter(self._by_id.values()))
+            if alert.timestamp > cutoff:
+                break
+            del self._by_id[alert.alert_id]
+            self._by_severity[alert.severity].pop(alert.alert_id, None)
+            if not alert.acknowledged:
+                self._unqueue(alert)
+            removed.append(alert)
+        return removed
+
+    def __iter__(self) -> Iterator[Alert]:
+        """Iterate over alerts, oldest first"""
+        return iter(list(self._by_id.values()))
+
+    def __len__(self) -> int:
+        """Return the number of stored alerts"""
+        return len(self._by_id)
+
+    def _pending_bucket(self, severity: str) -> Dict[str, Alert]:
+        """Get (or create) the pending bucket of a severity, keeping buckets in priority order"""
+        bucket = self._pending.get(severity)
+        if bucket is None:
+            bucket = {}
+            self._pending[severity] = bucket
+            self._pending = dict(sorted(
+                self._pending.items(),
+                key=lambda item: SEVERITY_PRIORITY.get(item[0], len(SEVERITY_PRIORITY))
+            ))
+        return bucket
+
+    def _unqueue(self, alert: Alert):
+        """Remove an alert from its pending bucket"""
+        self._pending.get(alert.severity, {}).pop(alert.alert_id, None)
+
+
+def slack_message(alert: Dict) -> Dict:
+    """
+    Build a Slack incoming-webhook body for an alert
+    
+    Args:
+        alert: Alert dictionary
+    
+    Returns:
+        Slack message dictionary
+    """
+    return {'text': f"[{alert['severity']}] {alert['type']}: {alert['message']}"}
 
 
 class AlertSystem:
@@ -26,40 +216,129 @@ class AlertSystem:
     Real-time critical issue notification system
     """
     
-    def __init__(self):
-        """Initialize AlertSystem"""
-        self.alerts: List[Alert] = []
-        self.alert_queue: List[Alert] = []
+    def __init__(self, dispatcher: Optional[NotificationDispatcher] = None,
+                 deduplicator: Optional[AlertDeduplicator] = None,
+                 persister: Optional[AlertPersister] = None,
+                 escalation: Optional[EscalationScheduler] = None,
+                 digest: Optional[DigestBatcher] = None):
+        """
+        Initialize AlertSystem
+        
+        Args:
+            dispatcher: Delivers notifications in the background; channels it
+                does not have yet get the logging placeholders (None sends
+                notifications inline)
+            deduplicator: Merges repeated alerts and throttles notifications
+                per fingerprint (default: 5-minute window, 5 per hour)
+            persister: Writes alerts and their changes to MongoDB in the
+                background (None keeps alerts in memory only)
+            escalation: Re-notifies and escalates alerts nobody acknowledges
+                (None disables escalation)
+            digest: Batches notifications of low-severity alerts into
+                digests; its deliver callback is set to this system's
+                channels when it has none (None sends every alert)
+        """
+        self.store = AlertStore()
         self._alert_counter = 0
+        # Keeps alert IDs unique across workers sharing the alerts collection
+        self._instance = uuid.uuid4().hex[:6]
+        self.dispatcher = dispatcher
+        self.deduplicator = deduplicator if deduplicator is not None else AlertDeduplicator()
+        self.persister = persister
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[Dict], None]] = []
+        # Notifications dropped per channel because nothing delivers on it
+        self._undeliverable: Dict[str, int] = {}
+        self.escalation = escalation
+        if escalation is not None:
+            escalation.subscribe(self._escalate)
+        self.digest = digest
+        if digest is not None and digest.deliver is None:
+            digest.deliver = self._deliver
+        
+        if dispatcher is not None:
+            placeholders = {
+                'email': self._send_email_notification,
+                'slack': self._send_slack_notification,
+                'sms': self._send_sms_notification
+            }
+            for channel, sender in placeholders.items():
+                if channel not in dispatcher.channels:
+                    dispatcher.register_channel(channel, sender, workers=1)
     
-    def send_alert(self, alert_data: Dict):
+    def send_alert(self, alert_data: Dict) -> Alert:
         """
         Send an alert
         
+        An alert with the same fingerprint (type, root cause and affected
+        components) as an open alert seen within the dedup window is merged
+        into it: its count goes up and no new notification is sent.
+        
         Args:
             alert_data: Dictionary containing alert information
+        
+        Returns:
+            The new Alert, or the existing Alert the repeat was merged into
         """
-        # Create alert
-        self._alert_counter += 1
-        alert_id = f"ALERT_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self._alert_counter}"
-        
-        alert = Alert(
-            alert_id=alert_id,
-            alert_type=alert_data.get('type', 'UNKNOWN'),
-            severity=alert_data.get('severity', 'MEDIUM'),
-            message=self._format_alert_message(alert_data),
-            timestamp=datetime.now(),
-            acknowledged=False
+        fingerprint = alert_fingerprint(
+            alert_data.get('type', 'UNKNOWN'),
+            # Threshold alerts have no root cause; the resource tells them apart
+            alert_data.get('root_cause') or alert_data.get('resource'),
+            alert_data.get('affected_components')
         )
+        with self._lock:
+            candidate = self.deduplicator.peek(fingerprint)
+        # Another worker may have acknowledged the open alert in MongoDB only;
+        # a repeat of it then opens a new alert instead of merging
+        if (candidate is not None and not candidate.acknowledged
+                and self._acknowledged_in_store(candidate.alert_id)):
+            self._acknowledged_elsewhere(candidate)
+        
+        now = datetime.now()
+        with self._lock:
+            existing = self.deduplicator.find(fingerprint)
+            if existing is not None and not existing.acknowledged:
+                existing.count += 1
+                existing.last_seen = now
+                if self.persister is not None:
+                    self.persister.update(existing.alert_id,
+                                          {'count': existing.count, 'last_seen': now})
+                alert = existing
+            else:
+                # Create alert
+                self._alert_counter += 1
+                alert_id = f"ALERT_{now.strftime('%Y%m%d_%H%M%S')}_{self._instance}_{self._alert_counter}"
+                
+                alert = Alert(
+                    alert_id=alert_id,
+                    alert_type=alert_data.get('type', 'UNKNOWN'),
+                    severity=alert_data.get('severity', 'MEDIUM'),
+                    message=self._format_alert_message(alert_data),
+                    timestamp=now,
+                    acknowledged=False,
+                    fingerprint=fingerprint,
+                    last_seen=now,
+                    recipient=alert_data.get('recipient')
+                )
+                alert.notified = self.deduplicator.open(fingerprint, alert)
+                
+                self.store.add(alert)
+                if self.persister is not None:
+                    self.persister.insert(self._alert_to_document(alert))
         
-        # Add to alerts list and queue
-        self.alerts.append(alert)
-        self.alert_queue.append(alert)
+        self._notify_subscribers(alert)
+        if existing is alert:
+            return alert
         
-        # Send notification (placeholder for actual notification logic)
-        self._send_notification(alert)
+        if alert.notified:
+            self._send_notification(alert)
+            if self.escalation is not None:
+                self.escalation.start(alert.alert_id, alert.severity)
+            print(f"🚨 Alert sent: {alert.alert_type} - {alert.severity}")
+        else:
+            print(f"🔕 Alert throttled: {alert.alert_type} - {alert.severity}")
         
-        print(f"🚨 Alert sent: {alert.alert_type} - {alert.severity}")
+        return alert
     
     def acknowledge_alert(self, alert_id: str) -> bool:
         """
@@ -71,18 +350,94 @@ class AlertSystem:
         Returns:
             True if successful, False otherwise
         """
-        for alert in self.alerts:
-            if alert.alert_id == alert_id:
-                alert.acknowledged = True
-                alert.acknowledged_at = datetime.now()
-                
-                # Remove from queue
-                self.alert_queue = [a for a in self.alert_queue if a.alert_id != alert_id]
-                
-                print(f"✅ Alert acknowledged: {alert_id}")
-                return True
+        with self._lock:
+            alert = self.store.acknowledge(alert_id, datetime.now())
+            if alert is None:
+                return False
+            
+            # The next occurrence opens a new alert
+            self.deduplicator.close(alert.fingerprint)
+            if self.escalation is not None:
+                self.escalation.cancel(alert_id)
+            if self.persister is not None:
+                self.persister.update(alert_id, {'acknowledged': True,
+                                                 'acknowledged_at': alert.acknowledged_at})
         
-        return False
+        self._notify_subscribers(alert)
+        print(f"✅ Alert acknowledged: {alert_id}")
+        return True
+    
+    def subscribe(self, callback: Callable[[Dict], None]):
+        """
+        Register a callback called with the alert dictionary whenever an
+        alert is created, merged with a repeat or acknowledged
+        
+        Args:
+            callback: Function receiving the alert dictionary
+        """
+        self._subscribers.append(callback)
+    
+    @property
+    def alerts(self) -> List[Alert]:
+        """All stored alerts, oldest first"""
+        with self._lock:
+            return list(self.store)
+    
+    @property
+    def alert_queue(self) -> List[Alert]:
+        """Unacknowledged alerts, most severe first, then oldest first"""
+        with self._lock:
+            return self.store.pending()
+    
+    def get_alert(self, alert_id: str) -> Optional[Alert]:
+        """
+        Get an alert by ID
+        
+        Args:
+            alert_id: Alert ID
+        
+        Returns:
+            Alert object or None
+        """
+        with self._lock:
+            return self.store.get(alert_id)
+    
+    def next_pending_alert(self) -> Optional[Alert]:
+        """
+        Get the most severe, oldest unacknowledged alert
+        
+        Returns:
+            Alert object or None
+        """
+        with self._lock:
+            return self.store.next_pending()
+    
+    def get_digest_statistics(self) -> Optional[Dict]:
+        """Get buffered and sent digests (None without digest batching)"""
+        if self.digest is None:
+            return None
+        return self.digest.get_statistics()
+    
+    def get_undeliverable_statistics(self) -> Dict[str, int]:
+        """Get notifications dropped per channel because the channel has no sender"""
+        with self._lock:
+            return dict(self._undeliverable)
+    
+    def get_escalation_statistics(self) -> Optional[Dict]:
+        """Get pending escalation timers and policies (None without escalation)"""
+        if self.escalation is None:
+            return None
+        return self.escalation.get_statistics()
+    
+    def get_dedup_statistics(self) -> Dict:
+        """
+        Get alert deduplication and throttling statistics
+        
+        Returns:
+            Dictionary with open groups, merged repeats and throttled alerts
+        """
+        with self._lock:
+            return self.deduplicator.get_statistics()
     
     def get_unacknowledged_alerts(self) -> List[Alert]:
         """
@@ -91,7 +446,8 @@ class AlertSystem:
         Returns:
             List of unacknowledged Alert objects
         """
-        return [alert for alert in self.alerts if not alert.acknowledged]
+        with self._lock:
+            return self.store.unacknowledged()
     
     def get_alerts_by_severity(self, severity: str) -> List[Alert]:
         """
@@ -103,7 +459,8 @@ class AlertSystem:
         Returns:
             List of Alert objects
         """
-        return [alert for alert in self.alerts if alert.severity == severity.upper()]
+        with self._lock:
+            return self.store.by_severity(severity.upper())
     
     def get_alert_history(self, limit: Optional[int] = None) -> List[Dict]:
         """
@@ -115,15 +472,11 @@ class AlertSystem:
         Returns:
             List of alert dictionaries
         """
-        history = [self._alert_to_dict(alert) for alert in self.alerts]
-        
-        # Sort by timestamp (most recent first)
-        history.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        if limit:
-            return history[:limit]
+        # The store is in timestamp order, so the newest alerts are read backwards
+        with self._lock:
+            alerts = self.store.newest(limit or None)
         
-        return history
+        return [self._alert_to_dict(alert) for alert in alerts]
     
     def clear_old_alerts(self, days: int = 30):
         """
@@ -134,12 +487,15 @@ class AlertSystem:
         """
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        self.alerts = [
-            alert for alert in self.alerts
-            if alert.timestamp > cutoff_date
-        ]
+        with self._lock:
+            removed = self.store.remove_before(cutoff_date)
+            # Removed alerts must not escalate or absorb repeats anymore
+            for alert in removed:
+                self.deduplicator.close(alert.fingerprint, alert)
+                if self.escalation is not None:
+                    self.escalation.cancel(alert.alert_id)
         
-        print(f"🧹 Cleared alerts older than {days} days")
+        print(f"🧹 Cleared {len(removed)} alerts older than {days} days")
     
     def _format_alert_message(self, alert_data: Dict) -> str:
         """
@@ -171,48 +527,176 @@ class AlertSystem:
         else:
             return alert_data.get('message', 'Alert triggered')
     
-    def _send_notification(self, alert: Alert):
+    def _escalate(self, alert_id: str, step: EscalationStep):
+        """
+        Run an escalation step of an alert that is still unacknowledged
+        
+        Args:
+            alert_id: Alert ID
+            step: Due escalation step
+        """
+        with self._lock:
+            alert = self.store.get(alert_id)
+            if alert is None or alert.acknowledged:
+                return
+        
+        # Another worker may have acknowledged it in MongoDB only
+        if self._acknowledged_in_store(alert_id):
+            self._acknowledged_elsewhere(alert)
+            print(f"✅ Alert acknowledged elsewhere, escalation stopped: {alert_id}")
+            return
+        
+        with self._lock:
+            if alert.acknowledged:
+                return
+            alert.escalation_level += 1
+            if self.persister is not None:
+                self.persister.update(alert_id, {'escalation_level': alert.escalation_level})
+        
+        # Escalations are never held back in a digest
+        channels = list(step.channels) if step.channels else self._notification_channels(alert)
+        self._send_notification(alert, channels=channels)
+        self._notify_subscribers(alert)
+        print(f"⏫ Alert escalated: {alert_id} (level {alert.escalation_level})")
+    
+    def _acknowledged_elsewhere(self, alert: Alert):
+        """
+        Adopt an acknowledgement another worker persisted
+        
+        Args:
+            alert: Local copy of the acknowledged alert
+        """
+        with self._lock:
+            self.store.acknowledge(alert.alert_id, datetime.now())
+            self.deduplicator.close(alert.fingerprint, alert)
+            if self.escalation is not None:
+                self.escalation.cancel(alert.alert_id)
+    
+    def _acknowledged_in_store(self, alert_id: str) -> bool:
+        """
+        Check the persisted acknowledged flag of an alert
+        
+        Args:
+            alert_id: Alert ID
+        
+        Returns:
+            True if MongoDB has the alert acknowledged (False without a
+            persister or when the lookup fails, so the escalation proceeds)
+        """
+        if self.persister is None:
+            return False
+        try:
+            document = self.persister.collection.find_one({'_id': alert_id}, {'acknowledged': 1})
+        except Exception as e:
+            print(f"❌ Error checking acknowledgement of alert {alert_id}: {e}")
+            return False
+        return bool(document and document.get('acknowledged'))
+    
+    def _send_notification(self, alert: Alert, channels: Optional[List[str]] = None):
         """
         Send notification through various channels
         
+        With a dispatcher, notifications are only queued here and delivered
+        by its workers; otherwise the channels are called inline. With a
+        digest batcher, notifications of the severities it batches are
+        buffered into per-channel, per-recipient digests instead; explicit
+        channels (escalations) are always sent right away.
+        
         Args:
             alert: Alert object to send
+            channels: Channels to use (default: the alert's own channels)
         """
-        # This is a placeholder for actual notification logic
-        # In production, this would send notifications via:
-        # - Email
-        # - Slack
-        # - SMS
-        # - PagerDuty
-        # - etc.
+        payload = self._alert_to_dict(alert)
+        batch = channels is None and self.digest is not None and self.digest.accepts(alert.severity)
         
-        # For now, just log it
-        print(f"📧 Notification sent for alert: {alert.alert_id}")
+        if self.dispatcher is None and channels is None:
+            print(f"📧 Notification sent for alert: {alert.alert_id}")
         
-        # Example notification formats:
+        for channel in channels if channels is not None else self._notification_channels(alert):
+            if not self._can_deliver(channel):
+                self._count_undeliverable(channel)
+            elif batch:
+                self.digest.add(channel, alert.recipient, payload)
+            else:
+                self._deliver(channel, payload)
+    
+    def _can_deliver(self, channel: str) -> bool:
+        """Whether a channel has a sender (e.g. webhook only with a URL configured)"""
+        if self.dispatcher is not None:
+            return channel in self.dispatcher.channels
+        return channel in self._inline_senders()
+    
+    def _count_undeliverable(self, channel: str):
+        """Count a notification dropped because its channel has no sender"""
+        with self._lock:
+            self._undeliverable[channel] = self._undeliverable.get(channel, 0) + 1
+    
+    def _deliver(self, channel: str, payload: Dict):
+        """
+        Send one notification (or digest) on a channel
         
-        # Email notification
-        if alert.severity in ['CRITICAL', 'HIGH']:
-            self._send_email_notification(alert)
+        Args:
+            channel: Channel name
+            payload: Notification payload
+        """
+        if not self._can_deliver(channel):
+            self._count_undeliverable(channel)
+            return
+        if self.dispatcher is not None:
+            self.dispatcher.submit(channel, payload)
+            return
+        
+        self._inline_senders()[channel](payload)
+    
+    def _inline_senders(self) -> Dict[str, Callable[[Dict], None]]:
+        """Channels delivered inline when no dispatcher is configured"""
+        return {
+            'email': self._send_email_notification,
+            'slack': self._send_slack_notification,
+            'sms': self._send_sms_notification
+        }
+    
+    def _notify_subscribers(self, alert: Alert):
+        """Pass a created or changed alert to the subscribers"""
+        if not self._subscribers:
+            return
+        payload = self._alert_to_dict(alert)
+        for callback in self._subscribers:
+            try:
+                callback(payload)
+            except Exception as e:
+                print(f"❌ Error notifying alert subscriber: {e}")
+    
+    def _notification_channels(self, alert: Alert) -> List[str]:
+        """
+        Channels an alert is delivered to
+        
+        Args:
+            alert: Alert object
         
-        # Slack notification
+        Returns:
+            List of channel names
+        """
+        channels = ['webhook']
+        if alert.severity in ['CRITICAL', 'HIGH']:
+            channels.append('email')
         if alert.severity == 'CRITICAL':
-            self._send_slack_notification(alert)
+            channels.append('slack')
+        return channels
     
-    def _send_email_notification(self, alert: Alert):
+    def _send_email_notification(self, alert: Dict):
         """Send email notification (placeholder)"""
         # In production, integrate with email service (SendGrid, SES, etc.)
-        print(f"📧 Email notification: {alert.message}")
+        print(f"📧 Email notification: {alert['message']}")
     
-    def _send_slack_notification(self, alert: Alert):
-        """Send Slack notification (placeholder)"""
-        # In production, integrate with Slack API
-        print(f"💬 Slack notification: {alert.message}")
+    def _send_slack_notification(self, alert: Dict):
+        """Send Slack notification (placeholder, see slack_message for webhooks)"""
+        print(f"💬 Slack notification: {alert['message']}")
     
-    def _send_sms_notification(self, alert: Alert):
+    def _send_sms_notification(self, alert: Dict):
         """Send SMS notification (placeholder)"""
         # In production, integrate with SMS service (Twilio, SNS, etc.)
-        print(f"📱 SMS notification: {alert.message}")
+        print(f"📱 SMS notification: {alert['message']}")
     
     def _alert_to_dict(self, alert: Alert) -> Dict:
         """
@@ -231,8 +715,32 @@ class AlertSystem:
             'message': alert.message,
             'timestamp': alert.timestamp.isoformat(),
             'acknowledged': alert.acknowledged,
-            'acknowledged_at': alert.acknowledged_at.isoformat() if alert.acknowledged_at else None
+            'acknowledged_at': alert.acknowledged_at.isoformat() if alert.acknowledged_at else None,
+            'fingerprint': alert.fingerprint,
+            'count': alert.count,
+            'last_seen': alert.last_seen.isoformat() if alert.last_seen else None,
+            'notified': alert.notified,
+            'escalation_level': alert.escalation_level,
+            'recipient': alert.recipient
         }
+    
+    def _alert_to_document(self, alert: Alert) -> Dict:
+        """
+        Convert Alert object to its MongoDB document
+        
+        Args:
+            alert: Alert object
+        
+        Returns:
+            Document keyed by the alert ID, so a replayed insert is a duplicate
+        """
+        document = self._alert_to_dict(alert)
+        document['_id'] = alert.alert_id
+        # Times are stored as dates like the rest of the alerts collection
+        document['timestamp'] = alert.timestamp
+        document['acknowledged_at'] = alert.acknowledged_at
+        document['last_seen'] = alert.last_seen
+        return document
 
 
 # Test code
@@ -272,4 +780,82 @@ if __name__ == "__main__":
     history = alert_system.get_alert_history(limit=10)
     print(f"✅ Alert history: {len(history)} alerts")
     
+    # Index performance at 100k open alerts
+    import time
+    
+    big = AlertSystem(deduplicator=AlertDeduplicator(window_seconds=0, rate_limit=0))
+    base = datetime.now()
+    for i in range(100000):
+        big.store.add(Alert(f"BULK_{i}", 'RESOURCE_THRESHOLD', ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL'][i % 4],
+                            f"bulk {i}", base + timedelta(microseconds=i)))
+    start = time.perf_counter()
+    for i in range(0, 100000, 100):
+        big.store.acknowledge(f"BULK_{i}", base)
+    ack_us = (time.perf_counter() - start) * 1e6 / 1000
+    start = time.perf_counter()
+    top = big.get_alert_history(limit=20)
+    next_alert = big.next_pending_alert()
+    print(f"✅ 100k alerts: acknowledge {ack_us:.1f} us, top-20 history + next pending "
+          f"{(time.perf_counter() - start) * 1000:.2f} ms ({next_alert.alert_id}, newest {top[0]['id']})")
+    
+    # Repeats of the same problem are merged into one alert
+    for _ in range(3):
+        merged = alert_system.send_alert({'type': 'RESOURCE_THRESHOLD', 'severity': 'HIGH',
+                                          'resource': 'Memory', 'value': 91.0,
+                                          'affected_components': ['cache']})
+    print(f"✅ Merged repeats: {merged.alert_id} x{merged.count}")
+    
+    # Background delivery
+    dispatcher = NotificationDispatcher(backoff_base_seconds=0.01)
+    async_alerts = AlertSystem(dispatcher=dispatcher)
+    async_alerts.send_alert({'type': 'CRITICAL_ANOMALY', 'severity': 'CRITICAL',
+                             'root_cause': 'MEMORY_LEAK', 'confidence': 0.9})
+    dispatcher.flush(timeout=5)
+    delivered = {name: c['delivered'] for name, c in dispatcher.get_statistics()['channels'].items()}
+    print(f"✅ Dispatched notifications: {delivered}")
+    dispatcher.stop()
+    
+    # Unacknowledged alerts escalate; acknowledged ones stop
+    clock = [0.0]
+    escalation = EscalationScheduler(clock=lambda: clock[0], start_thread=False)
+    escalating = AlertSystem(escalation=escalation)
+    ignored = escalating.send_alert({'type': 'CRITICAL_ANOMALY', 'severity': 'CRITICAL',
+                                     'root_cause': 'MEMORY_LEAK'})
+    handled = escalating.send_alert({'type': 'CRITICAL_ANOMALY', 'severity': 'CRITICAL',
+                                     'root_cause': 'DISK_FULL'})
+    escalating.acknowledge_alert(handled.alert_id)
+    for minute in range(1, 16):
+        clock[0] = minute * 60.0
+        escalation.run_due()
+    print(f"✅ Escalation levels: ignored {ignored.escalation_level}, acknowledged {handled.escalation_level}")
+    
+    # Cleared alerts stop escalating and no longer absorb repeats
+    stale = escalating.send_alert({'type': 'CRITICAL_ANOMALY', 'severity': 'CRITICAL',
+                                   'root_cause': 'CPU_SPIKE'})
+    escalating.clear_old_alerts(days=0)
+    repeat = escalating.send_alert({'type': 'CRITICAL_ANOMALY', 'severity': 'CRITICAL',
+                                    'root_cause': 'CPU_SPIKE'})
+    print(f"✅ After clearing: repeat opened {'a new' if repeat is not stale else 'the cleared'} alert, "
+          f"{escalation.get_statistics()['pending']} escalating")
+    
+    # Low-severity alerts are batched into digests
+    digest_dispatcher = NotificationDispatcher()
+    delivered = []
+    digest_dispatcher.register_channel('webhook', delivered.append)
+    batched = AlertSystem(dispatcher=digest_dispatcher, digest=DigestBatcher(None, max_alerts=25))
+    for i in range(100):
+        batched.send_alert({'type': 'RESOURCE_THRESHOLD', 'severity': 'MEDIUM', 'resource': f"disk-{i}",
+                            'value': 81.0, 'recipient': 'storage-team'})
+    digest_dispatcher.flush(timeout=5)
+    print(f"✅ 100 MEDIUM alerts -> {len(delivered)} webhook digests of {delivered[0]['count']}")
+    digest_dispatcher.stop()
+    
+    # Channels without a sender are counted as undeliverable, not digested
+    unrouted = AlertSystem(dispatcher=NotificationDispatcher(), digest=DigestBatcher(None, max_alerts=25))
+    for i in range(10):
+        unrouted.send_alert({'type': 'RESOURCE_THRESHOLD', 'severity': 'MEDIUM', 'resource': f"disk-{i}",
+                             'value': 81.0})
+    print(f"✅ Undeliverable: {unrouted.get_undeliverable_statistics()}, "
+          f"digests sent {unrouted.get_digest_statistics()['digests_sent']}")
+    
     print("✅ AlertSystem tests passed!")
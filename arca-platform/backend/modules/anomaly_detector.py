@@ -7,6 +7,7 @@ and statistical methods
 from typing import List, Dict, Optional
 from datetime import datetime
 import statistics
+import uuid
 
 
 class Anomaly:
@@ -19,7 +20,9 @@ class Anomaly:
         self.metric_name = metric_name
         self.timestamp = timestamp
         self.description = description
-        self.id = f"{metric_name}_{timestamp.strftime('%Y%m%d_%H%M%S')}"
+        # Several anomalies of one metric can share a second (e.g. a burst of
+        # error logs), so the suffix keeps IDs unique
+        self.id = f"{metric_name}_{timestamp.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
     
     def to_dict(self):
         """Convert anomaly to dictionary"""
@@ -0,0 +1,300 @@
+"""
+Bulk Writer Module
+Bulk inserts for high-volume collections: unordered insert_many with a
+configurable write concern, and an optional write-behind buffer that
+coalesces inserts from many requests into large batches
+"""
+
+from typing import Dict, List, Optional, Union
+import threading
+import time
+
+from pymongo.errors import BulkWriteError
+from pymongo.write_concern import WriteConcern
+
+
+# MongoDB duplicate key error: the document is already stored
+DUPLICATE_KEY = 11000
+
+
+def write_concern_from_settings(w: Optional[str] = None, journal: Optional[str] = None,
+                                timeout_ms: Optional[str] = None) -> Optional[WriteConcern]:
+    """
+    Build a write concern from string settings (e.g. environment variables)
+
+    Args:
+        w: '0', '1', 'majority', ... (empty for the server default)
+        journal: 'true' or 'false' (empty for the server default)
+        timeout_ms: wtimeout in milliseconds (empty for none)
+
+    Returns:
+        WriteConcern, or None if nothing is set
+    """
+    options: Dict[str, Union[int, str, bool]] = {}
+    if w:
+        options['w'] = int(w) if w.isdigit() else w
+    if journal:
+        options['j'] = journal.lower() == 'true'
+    if timeout_ms:
+        options['wtimeout'] = int(timeout_ms)
+    return WriteConcern(**options) if options else None
+
+
+def insert_unordered(collection, documents: List[Dict]) -> int:
+    """
+    Insert documents in one unordered insert_many
+
+    The server applies the whole batch in one round trip and keeps going
+    past individual failures; documents that are already stored
+    (duplicate key) are not an error.
+
+    Args:
+        collection: PyMongo collection
+        documents: Documents to insert
+
+    Returns:
+        Number of documents inserted
+
+    Raises:
+        BulkWriteError: If any document failed for another reason
+    """
+    if not documents:
+        return 0
+    try:
+        result = collection.insert_many(documents, ordered=False)
+        # Unacknowledged writes (w=0) report nothing back
+        return len(result.inserted_ids) if result.acknowledged else len(documents)
+    except BulkWriteError as e:
+        errors = e.details.get('writeErrors', [])
+        if any(error.get('code') != DUPLICATE_KEY for error in errors):
+            raise
+        return e.details.get('nInserted', len(documents) - len(errors))
+
+
+class WriteBehindBuffer:
+    """
+    WriteBehindBuffer Class
+    Process-wide insert buffer: requests hand their documents over and
+    return, and a background thread writes everything buffered as one
+    unordered insert_many once max_batch documents are waiting or the
+    oldest has waited max_delay_seconds. Failed batches are kept and
+    retried. When more than max_pending documents are waiting (e.g. while
+    MongoDB is down) callers write their documents themselves, which pushes
+    the failure back to the request instead of growing the buffer.
+    """
+
+    def __init__(self, collection, max_batch: int = 1000, max_delay_seconds: float = 0.05,
+                 max_pending: int = 50000, retry_seconds: float = 1.0):
+        """
+        Initialize WriteBehindBuffer
+
+        Args:
+            collection: PyMongo collection (with its write concern applied)
+            max_batch: Documents per insert_many
+            max_delay_seconds: Longest a document waits before it is written
+            max_pending: Buffered documents before callers write synchronously
+            retry_seconds: Wait after a failed batch before retrying
+        """
+        self.collection = collection
+        self.max_batch = max_batch
+        self.max_delay_seconds = max_delay_seconds
+        self.max_pending = max_pending
+        self.retry_seconds = retry_seconds
+
+        self._pending: List[Dict] = []
+        self._oldest: Optional[float] = None
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        # Held while a batch is being written, so flush() can wait for it
+        self._write_lock = threading.Lock()
+        self._stopped = False
+
+        self.written = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.synchronous = 0
+        self.last_error: Optional[str] = None
+
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+
+    def add_many(self, documents: List[Dict]) -> bool:
+        """
+        Hand documents over for writing
+
+        Args:
+            documents: Documents to insert
+
+        Returns:
+            True if buffered, False if they were written synchronously
+            because the buffer is full
+
+        Raises:
+            Exception: The insert error when writing synchronously failed
+        """
+        if not documents:
+            return True
+        with self._lock:
+            if len(self._pending) < self.max_pending:
+                # Wake the writer to start the delay, or for a full batch
+                wake = not self._pending or len(self._pending) + len(documents) >= self.max_batch
+                if not self._pending:
+                    self._oldest = time.monotonic()
+                self._pending.extend(documents)
+                if wake:
+                    self._ready.notify()
+                return True
+
+        self.synchronous += len(documents)
+        insert_unordered(self.collection, documents)
+        return False
+
+    def flush(self) -> bool:
+        """
+        Write everything buffered now
+
+        Returns:
+            True if nothing is left pending
+        """
+        with self._write_lock:
+            while True:
+                batch = self._take()
+                if not batch:
+                    return True
+                if not self._write(batch):
+                    return False
+
+    def stop(self):
+        """Stop the background thread after writing what is buffered"""
+        with self._lock:
+            self._stopped = True
+            self._ready.notify()
+        self._thread.join(timeout=5)
+        self.flush()
+
+    def get_statistics(self) -> Dict:
+        """Get buffered documents and write counters"""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'pending': pending,
+            'written': self.written,
+            'batches': self.batches,
+            'avg_batch_size': round(self.written / self.batches, 1) if self.batches else 0,
+            'failed_batches': self.failed_batches,
+            'synchronous': self.synchronous,
+            'last_error': self.last_error
+        }
+
+    def _take(self) -> List[Dict]:
+        """Remove up to max_batch documents from the buffer"""
+        with self._lock:
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            self._oldest = time.monotonic() if self._pending else None
+            return batch
+
+    def _write(self, batch: List[Dict]) -> bool:
+        """Write one batch; on failure put it back in front of the buffer"""
+        try:
+            insert_unordered(self.collection, batch)
+        except Exception as e:
+            self.failed_batches += 1
+            self.last_error = str(e)
+            with self._lock:
+                self._pending[:0] = batch
+                self._oldest = time.monotonic()
+            return False
+        self.written += len(batch)
+        self.batches += 1
+        return True
+
+    def _run(self):
+        """Write batches when full or old enough"""
+        while True:
+            with self._lock:
+                while not self._stopped:
+                    if len(self._pending) >= self.max_batch:
+                        break
+                    if self._pending:
+                        remaining = self._oldest + self.max_delay_seconds - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._ready.wait(remaining)
+                    else:
+                        self._ready.wait()
+                if self._stopped:
+                    return
+
+            with self._write_lock:
+                batch = self._take()
+                if batch and not self._write(batch):
+                    time.sleep(self.retry_seconds)
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing BulkWriter...")
+
+    class FakeResult:
+        acknowledged = True
+
+        def __init__(self, ids):
+            self.inserted_ids = ids
+
+    class FakeCollection:
+        """Stand-in collection with a unique 'id' and a per-call latency"""
+        def __init__(self, latency=0.001):
+            self.docs = {}
+            self.calls = 0
+            self.latency = latency
+
+        def insert_one(self, doc):
+            self.insert_many([doc])
+
+        def insert_many(self, docs, ordered=True):
+            self.calls += 1
+            time.sleep(self.latency)
+            errors = []
+            for i, doc in enumerate(docs):
+                if doc['id'] in self.docs:
+                    errors.append({'index': i, 'code': DUPLICATE_KEY})
+                else:
+                    self.docs[doc['id']] = doc
+            if errors:
+                raise BulkWriteError({'writeErrors': errors, 'nInserted': len(docs) - len(errors)})
+            return FakeResult([doc['id'] for doc in docs])
+
+    print(f"✅ Write concern: {write_concern_from_settings('majority', 'true', '5000').document}")
+
+    # 200 requests of 10 anomalies each, at 1 ms per round trip
+    requests = [[{'id': f"ANOM_{r}_{i}"} for i in range(10)] for r in range(200)]
+
+    collection = FakeCollection()
+    start = time.perf_counter()
+    for docs in requests:
+        for doc in docs:
+            collection.insert_one(doc)
+    one_by_one = time.perf_counter() - start
+
+    collection = FakeCollection()
+    start = time.perf_counter()
+    for docs in requests:
+        insert_unordered(collection, docs)
+    bulk = time.perf_counter() - start
+
+    collection = FakeCollection()
+    buffer = WriteBehindBuffer(collection, max_batch=500, max_delay_seconds=0.02)
+    start = time.perf_counter()
+    for docs in requests:
+        buffer.add_many(docs)
+    handed_over = time.perf_counter() - start
+    buffer.flush()
+
+    print(f"✅ 2000 documents: insert_one {one_by_one * 1000:.0f} ms, insert_many per request "
+          f"{bulk * 1000:.0f} ms, write-behind {handed_over * 1000:.1f} ms in requests "
+          f"({len(collection.docs)} stored in {collection.calls} calls)")
+    print(f"✅ Duplicate re-insert ignored: {insert_unordered(collection, requests[0])} inserted")
+    buffer.stop()
+
+    print("✅ BulkWriter tests passed!")
@@ -0,0 +1,381 @@
+"""
+Change Events Module
+Ingests explicit change events (deploys, config pushes, feature flags) and
+indexes them per service for RCA attribution
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+import bisect
+import threading
+import uuid
+
+
+CHANGE_TYPES = ('DEPLOY', 'CONFIG_PUSH', 'FEATURE_FLAG')
+
+# Phases accepted by ChangeEventIndex.record(); DEPLOY_START/DEPLOY_END open
+# and close one deploy interval, the others are instantaneous changes
+EVENT_PHASES = ('DEPLOY_START', 'DEPLOY_END', 'CONFIG_PUSH', 'FEATURE_FLAG')
+
+# Service key for platform-wide changes, matched by every query
+GLOBAL_SERVICE = '*'
+
+
+@dataclass
+class ChangeEvent:
+    """A change to a service over a time interval"""
+    change_id: str
+    service: str
+    change_type: str  # "DEPLOY", "CONFIG_PUSH", "FEATURE_FLAG"
+    start: datetime
+    end: Optional[datetime] = None  # None while a deploy is in progress
+    description: str = ''
+    metadata: Dict = field(default_factory=dict)
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'change_id': self.change_id,
+            'service': self.service,
+            'change_type': self.change_type,
+            'start': self.start.isoformat(),
+            'end': self.end.isoformat() if self.end else None,
+            'description': self.description,
+            'metadata': self.metadata
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ChangeEvent':
+        """
+        Rebuild a change event from its dictionary form
+
+        Args:
+            data: Dictionary produced by to_dict()
+
+        Returns:
+            ChangeEvent object
+        """
+        return cls(
+            change_id=data['change_id'],
+            service=data['service'],
+            change_type=data['change_type'],
+            start=_parse_time(data['start']),
+            end=_parse_time(data['end']) if data.get('end') else None,
+            description=data.get('description', ''),
+            metadata=dict(data.get('metadata') or {})
+        )
+
+
+def _naive(value: datetime) -> datetime:
+    """Convert a timezone-aware datetime to naive local time, like the
+    datetime.now() timestamps of anomalies it is compared with"""
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _parse_time(value) -> datetime:
+    """Parse a datetime or ISO string to naive local time, raising ValueError if invalid"""
+    if isinstance(value, datetime):
+        return _naive(value)
+    if isinstance(value, str):
+        return _naive(datetime.fromisoformat(value))
+    raise ValueError(f"Invalid timestamp: {value!r}")
+
+
+def _duration_bucket(event: ChangeEvent) -> int:
+    """Bucket of a finished change: durations in [2^(b-1), 2^b) seconds go to bucket b"""
+    return int((event.end - event.start).total_seconds()).bit_length()
+
+
+class _DurationBucket:
+    """Finished changes of one duration bucket, sorted by start time"""
+
+    def __init__(self, bucket: int):
+        self.max_duration = timedelta(seconds=2 ** bucket)  # exclusive bound
+        self.keys: List[Tuple[datetime, str]] = []
+        self.events: List[ChangeEvent] = []
+
+
+class _ServiceChanges:
+    """Changes of one service: finished ones bucketed by duration, open deploys apart"""
+
+    def __init__(self):
+        self.buckets: Dict[int, _DurationBucket] = {}
+        self.closed = 0
+        self.open: Dict[str, ChangeEvent] = {}
+
+
+class ChangeEventIndex:
+    """
+    ChangeEventIndex Class
+    Per-service index of change intervals sorted by start time. Finished
+    changes are bucketed by duration in powers of two, so "which changes
+    overlap or precede [start, end]" is, per bucket, a binary search for
+    start times in [start - lookback - bucket bound, end] plus a filter on
+    end times. A change can only be a false candidate in its own bucket,
+    where its duration is at least half the bound, so one long deploy does
+    not widen the search of the short ones: O(b log n + k) for b buckets
+    (about 25 for durations up to a year). Deploys still in progress are
+    kept apart and always checked.
+    """
+
+    def __init__(self, max_events_per_service: int = 10000):
+        """
+        Initialize ChangeEventIndex
+
+        Args:
+            max_events_per_service: Oldest changes beyond this are dropped
+        """
+        self.max_events_per_service = max_events_per_service
+        # Bumped on every change so cached RCA results can be invalidated
+        self.version = 0
+        self._services: Dict[str, _ServiceChanges] = {}
+        self._by_id: Dict[str, ChangeEvent] = {}
+        self._lock = threading.Lock()
+
+    def record(self, data: Dict) -> ChangeEvent:
+        """
+        Ingest one change event notification
+
+        Args:
+            data: Dictionary with phase (DEPLOY_START, DEPLOY_END,
+                CONFIG_PUSH or FEATURE_FLAG), service, timestamp and optional
+                change_id, description and metadata. DEPLOY_END must carry
+                the change_id of its DEPLOY_START.
+
+        Returns:
+            The created or updated ChangeEvent
+
+        Raises:
+            ValueError: If the notification is invalid
+            KeyError: If DEPLOY_END refers to an unknown deploy
+        """
+        phase = data.get('phase')
+        if phase not in EVENT_PHASES:
+            raise ValueError(f"phase must be one of {', '.join(EVENT_PHASES)}")
+
+        timestamp = _parse_time(data.get('timestamp') or datetime.now())
+
+        if phase == 'DEPLOY_END':
+            change_id = data.get('change_id')
+            if not change_id:
+                raise ValueError("DEPLOY_END requires the change_id of its DEPLOY_START")
+            return self.close(change_id, timestamp)
+
+        service = data.get('service')
+        if not isinstance(service, str) or not service:
+            raise ValueError("service must be a non-empty string ('*' for platform-wide)")
+
+        instantaneous = phase != 'DEPLOY_START'
+        event = ChangeEvent(
+            change_id=data.get('change_id') or uuid.uuid4().hex,
+            service=service,
+            change_type='DEPLOY' if phase == 'DEPLOY_START' else phase,
+            start=timestamp,
+            end=timestamp if instantaneous else None,
+            description=data.get('description', ''),
+            metadata=dict(data.get('metadata') or {})
+        )
+        self.add(event)
+        return event
+
+    def add(self, event: ChangeEvent):
+        """
+        Add a change event (an existing event with the same ID is replaced)
+
+        Args:
+            event: ChangeEvent object
+        """
+        with self._lock:
+            if event.change_id in self._by_id:
+                self._remove(self._by_id[event.change_id])
+
+            changes = self._services.setdefault(event.service, _ServiceChanges())
+            self._by_id[event.change_id] = event
+
+            if event.end is None:
+                changes.open[event.change_id] = event
+            else:
+                self._insert_closed(changes, event)
+
+            self.version += 1
+
+    def close(self, change_id: str, end: datetime) -> ChangeEvent:
+        """
+        Mark an in-progress deploy as finished
+
+        Args:
+            change_id: ID of the deploy
+            end: Time the deploy finished
+
+        Returns:
+            The closed ChangeEvent
+
+        Raises:
+            KeyError: If the deploy is unknown
+        """
+        with self._lock:
+            event = self._by_id[change_id]
+            changes = self._services[event.service]
+
+            if event.end is None:
+                changes.open.pop(change_id, None)
+            else:
+                # Already closed: re-index under the corrected end time
+                self._remove(event)
+                self._by_id[change_id] = event
+
+            event.end = max(_naive(end), event.start)
+            self._insert_closed(changes, event)
+            self.version += 1
+            return event
+
+    def query(self, services: Optional[Iterable[str]], window_start: datetime,
+              window_end: datetime, lookback: timedelta = timedelta(minutes=30)) -> List[ChangeEvent]:
+        """
+        Find changes that overlapped or shortly preceded a time window
+
+        Args:
+            services: Services to search (platform-wide changes are always
+                included); None searches every service
+            window_start: Start of the incident window
+            window_end: End of the incident window
+            lookback: How long before window_start a finished change still counts
+
+        Returns:
+            List of ChangeEvent objects, most recent start first
+        """
+        window_start, window_end = _naive(window_start), _naive(window_end)
+        earliest_end = window_start - lookback
+
+        with self._lock:
+            if services is None:
+                selected = list(self._services.values())
+            else:
+                names = set(services)
+                names.add(GLOBAL_SERVICE)
+                selected = [self._services[name] for name in names if name in self._services]
+
+            found = []
+            for changes in selected:
+                for bucket in changes.buckets.values():
+                    lo = bisect.bisect_left(bucket.keys, (earliest_end - bucket.max_duration, ''))
+                    hi = bisect.bisect_right(bucket.keys, (window_end, '\uffff'))
+                    for event in bucket.events[lo:hi]:
+                        if event.end >= earliest_end:
+                            found.append(event)
+
+                for event in changes.open.values():
+                    if event.start <= window_end:
+                        found.append(event)
+
+        found.sort(key=lambda e: e.start, reverse=True)
+        return found
+
+    def get(self, change_id: str) -> Optional[ChangeEvent]:
+        """
+        Get a change event by ID
+
+        Args:
+            change_id: Change ID
+
+        Returns:
+            ChangeEvent object or None
+        """
+        with self._lock:
+            return self._by_id.get(change_id)
+
+    def __len__(self) -> int:
+        """Return the number of indexed change events"""
+        return len(self._by_id)
+
+    def _insert_closed(self, changes: _ServiceChanges, event: ChangeEvent):
+        """Insert a finished change in start order; caller holds the lock"""
+        index = _duration_bucket(event)
+        bucket = changes.buckets.get(index)
+        if bucket is None:
+            bucket = changes.buckets[index] = _DurationBucket(index)
+        key = (event.start, event.change_id)
+        position = bisect.bisect_right(bucket.keys, key)
+        bucket.keys.insert(position, key)
+        bucket.events.insert(position, event)
+        changes.closed += 1
+
+        if changes.closed > self.max_events_per_service:
+            # The oldest change is at the front of one of the buckets
+            index, oldest_bucket = min(changes.buckets.items(), key=lambda item: item[1].keys[0])
+            oldest = oldest_bucket.events[0]
+            del oldest_bucket.keys[0]
+            del oldest_bucket.events[0]
+            if not oldest_bucket.events:
+                del changes.buckets[index]
+            changes.closed -= 1
+            self._by_id.pop(oldest.change_id, None)
+
+    def _remove(self, event: ChangeEvent):
+        """Remove an indexed change; caller holds the lock"""
+        changes = self._services.get(event.service)
+        self._by_id.pop(event.change_id, None)
+        if changes is None:
+            return
+
+        if changes.open.pop(event.change_id, None) is not None:
+            return
+
+        index = _duration_bucket(event)
+        bucket = changes.buckets.get(index)
+        if bucket is None:
+            return
+        key = (event.start, event.change_id)
+        position = bisect.bisect_left(bucket.keys, key)
+        if position < len(bucket.keys) and bucket.keys[position] == key:
+            del bucket.keys[position]
+            del bucket.events[position]
+            changes.closed -= 1
+            if not bucket.events:
+                del changes.buckets[index]
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing ChangeEventIndex...")
+
+    import time
+
+    index = ChangeEventIndex(max_events_per_service=1000000)
+    base = datetime(2024, 1, 1, 12, 0, 0)
+
+    deploy = index.record({'phase': 'DEPLOY_START', 'service': 'app-server',
+                           'timestamp': base.isoformat(), 'description': 'v2.3.1'})
+    index.record({'phase': 'DEPLOY_END', 'change_id': deploy.change_id,
+                  'timestamp': (base + timedelta(minutes=4)).isoformat()})
+    index.record({'phase': 'CONFIG_PUSH', 'service': '*',
+                  'timestamp': (base - timedelta(hours=3)).isoformat()})
+    index.record({'phase': 'FEATURE_FLAG', 'service': 'database',
+                  'timestamp': (base + timedelta(minutes=10)).isoformat()})
+
+    nearby = index.query(['app-server'], base + timedelta(minutes=6), base + timedelta(minutes=8))
+    print(f"✅ Changes near incident: {[(e.service, e.change_type) for e in nearby]}")
+
+    for i in range(200000):
+        started = base - timedelta(minutes=200000 - i)
+        index.add(ChangeEvent(f"bulk-{i}", 'payments', 'DEPLOY', started, started + timedelta(seconds=90)))
+
+    # A week-long deploy only widens the search of its own duration bucket
+    index.add(ChangeEvent('long-migration', 'payments', 'DEPLOY',
+                          base - timedelta(days=150), base - timedelta(days=143)))
+
+    aware = index.record({'phase': 'CONFIG_PUSH', 'service': '*',
+                          'timestamp': '2024-01-01T12:00:00+00:00'})
+    print(f"✅ Timezone-aware change stored as naive local time: {aware.start.tzinfo is None}")
+
+    window = base - timedelta(days=30)
+    start = time.perf_counter()
+    for _ in range(1000):
+        found = index.query(['payments'], window, window + timedelta(minutes=5))
+    print(f"✅ {len(found)} changes found among {len(index)} in "
+          f"{(time.perf_counter() - start) * 1000:.1f} us per query")
+
+    print("✅ ChangeEventIndex tests passed!")
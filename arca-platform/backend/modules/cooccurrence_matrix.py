@@ -0,0 +1,404 @@
+"""
+Co-occurrence Matrix Module
+Learns how often (component, metric) pairs become anomalous together
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import math
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; syncs are then unlocked
+    fcntl = None
+
+
+class CooccurrenceMatrix:
+    """
+    CooccurrenceMatrix Class
+    Incrementally updated sparse co-occurrence matrix over (component, metric)
+    keys. Every observed anomaly window counts once per key and once per key
+    pair, so conditional probabilities and pairwise strengths can be derived
+    without storing the windows themselves.
+
+    Counts are additive, so several processes can share one file: each
+    keeps the observations it made since its last sync apart, and sync()
+    adds them to the file under a file lock and adopts the merged counts.
+    """
+
+    def __init__(self, max_keys: int = 5000, max_neighbors: int = 50):
+        """
+        Initialize CooccurrenceMatrix
+
+        Args:
+            max_keys: Maximum number of (component, metric) keys to track
+            max_neighbors: Number of strongest neighbors kept per key (top-k)
+        """
+        if max_keys <= 0 or max_neighbors <= 0:
+            raise ValueError("max_keys and max_neighbors must be positive")
+
+        self.max_keys = max_keys
+        self.max_neighbors = max_neighbors
+        self.total_observations = 0
+        self._key_counts: Dict[str, int] = {}
+        self._pair_counts: Dict[str, Dict[str, int]] = {}
+        self.last_updated: Optional[datetime] = None
+        # Observations made since the last sync(), kept once the matrix is file-backed
+        self.shared = False
+        self._unsynced = _empty_delta()
+        # Guards updates and snapshots; lookups tolerate concurrent writes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(component: str, metric: str) -> str:
+        """
+        Build the matrix key for a (component, metric) pair
+
+        Args:
+            component: Component name
+            metric: Metric name
+
+        Returns:
+            Key string in "component|metric" form
+        """
+        return f"{component}|{metric}"
+
+    def observe(self, keys: Iterable[str]):
+        """
+        Record one window in which all given keys were anomalous together
+
+        Args:
+            keys: Keys that co-occurred (duplicates are ignored)
+        """
+        distinct = sorted(set(keys))
+        if not distinct:
+            return
+
+        with self._lock:
+            self.last_updated = datetime.now()
+            self._apply(distinct)
+            if not self.shared:
+                return
+
+            delta = self._unsynced
+            delta['observations'] += 1
+            for key in distinct:
+                delta['keys'][key] = delta['keys'].get(key, 0) + 1
+            for i, key_a in enumerate(distinct):
+                for key_b in distinct[i + 1:]:
+                    delta['pairs'][(key_a, key_b)] = delta['pairs'].get((key_a, key_b), 0) + 1
+
+    def conditional_probability(self, key_b: str, given_a: str) -> float:
+        """
+        Estimate P(key_b anomalous | given_a anomalous)
+
+        Args:
+            key_b: Key whose probability is estimated
+            given_a: Conditioning key
+
+        Returns:
+            Probability between 0 and 1
+        """
+        count_a = self._key_counts.get(given_a, 0)
+        if count_a == 0:
+            return 0.0
+
+        return self._pair_counts.get(given_a, {}).get(key_b, 0) / count_a
+
+    def strength(self, key_a: str, key_b: str) -> float:
+        """
+        Symmetric pairwise strength, the geometric mean of both conditional
+        probabilities (count_ab / sqrt(count_a * count_b))
+
+        Args:
+            key_a: First key
+            key_b: Second key
+
+        Returns:
+            Strength between 0 and 1
+        """
+        count_a = self._key_counts.get(key_a, 0)
+        count_b = self._key_counts.get(key_b, 0)
+        if count_a == 0 or count_b == 0:
+            return 0.0
+
+        pair_count = self._pair_counts.get(key_a, {}).get(key_b, 0)
+        return min(pair_count / math.sqrt(count_a * count_b), 1.0)
+
+    def group_strength(self, keys: Iterable[str]) -> float:
+        """
+        Average pairwise strength over all distinct pairs of the given keys
+
+        Args:
+            keys: Keys of one anomaly group
+
+        Returns:
+            Mean strength between 0 and 1 (0 for fewer than two keys)
+        """
+        distinct = sorted(set(keys))
+        if len(distinct) < 2:
+            return 0.0
+
+        total = 0.0
+        pairs = 0
+        for i, key_a in enumerate(distinct):
+            for key_b in distinct[i + 1:]:
+                total += self.strength(key_a, key_b)
+                pairs += 1
+
+        return total / pairs
+
+    def get_top_neighbors(self, key: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Get the keys most strongly associated with a key
+
+        Args:
+            key: Key to look up
+            limit: Maximum number of neighbors
+
+        Returns:
+            List of (neighbor_key, strength) tuples, strongest first
+        """
+        neighbors = [
+            (other, self.strength(key, other))
+            for other in list(self._pair_counts.get(key, {}))
+        ]
+        neighbors.sort(key=lambda x: x[1], reverse=True)
+        return neighbors[:limit]
+
+    def size(self) -> Dict[str, int]:
+        """
+        Get matrix size information
+
+        Returns:
+            Dictionary with key, entry and observation counts
+        """
+        with self._lock:
+            return {
+                'keys': len(self._key_counts),
+                'entries': sum(len(row) for row in self._pair_counts.values()),
+                'observations': self.total_observations
+            }
+
+    def to_dict(self) -> Dict:
+        """Convert matrix to a JSON-serializable dictionary"""
+        with self._lock:
+            return {
+                'max_keys': self.max_keys,
+                'max_neighbors': self.max_neighbors,
+                'total_observations': self.total_observations,
+                'key_counts': dict(self._key_counts),
+                'pair_counts': {key: dict(row) for key, row in self._pair_counts.items()},
+                'last_updated': self.last_updated.isoformat() if self.last_updated else None
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CooccurrenceMatrix':
+        """
+        Rebuild a matrix from its dictionary form
+
+        Args:
+            data: Dictionary produced by to_dict()
+
+        Returns:
+            CooccurrenceMatrix object
+        """
+        matrix = cls(
+            max_keys=data.get('max_keys', 5000),
+            max_neighbors=data.get('max_neighbors', 50)
+        )
+        matrix.total_observations = data.get('total_observations', 0)
+        matrix._key_counts = dict(data.get('key_counts', {}))
+        matrix._pair_counts = {
+            key: dict(row) for key, row in data.get('pair_counts', {}).items()
+        }
+        if data.get('last_updated'):
+            matrix.last_updated = datetime.fromisoformat(data['last_updated'])
+        return matrix
+
+    def save(self, path: str):
+        """
+        Persist matrix to a JSON file (written atomically via rename)
+
+        Args:
+            path: Destination file path
+        """
+        # Unique temp name so concurrent workers never share a partial file
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temp_path, path)
+
+    def sync(self, path: str):
+        """
+        Add the observations made since the last sync to the file and
+        adopt the merged counts, which include other processes' learning
+
+        Args:
+            path: Shared matrix file path
+        """
+        with _locked(path):
+            merged = CooccurrenceMatrix.load(path, self.max_keys, self.max_neighbors)
+            with self._lock:
+                delta, self._unsynced = self._unsynced, _empty_delta()
+                merged._merge(delta)
+                if delta['observations']:
+                    merged.save(path)
+                self.total_observations = merged.total_observations
+                self._key_counts = merged._key_counts
+                self._pair_counts = merged._pair_counts
+                self.last_updated = merged.last_updated
+                self.shared = True
+
+    @property
+    def unsynced_observations(self) -> int:
+        """Observations made since the last sync()"""
+        return self._unsynced['observations']
+
+    @classmethod
+    def load(cls, path: str, max_keys: int = 5000, max_neighbors: int = 50) -> 'CooccurrenceMatrix':
+        """
+        Load a matrix from a JSON file, or start empty if it does not exist
+
+        Args:
+            path: Source file path
+            max_keys: Key budget used when starting empty
+            max_neighbors: Neighbor budget used when starting empty
+
+        Returns:
+            CooccurrenceMatrix object
+        """
+        matrix = cls(max_keys=max_keys, max_neighbors=max_neighbors)
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    matrix = cls.from_dict(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Warning: Could not load co-occurrence matrix from {path}: {e}")
+        # Observations are now kept apart until they are synced back to the file
+        matrix.shared = True
+        return matrix
+
+    def _apply(self, distinct: List[str], count: int = 1):
+        """Count one window of distinct sorted keys; caller holds the lock"""
+        self.total_observations += count
+        for key in distinct:
+            self._key_counts[key] = self._key_counts.get(key, 0) + count
+
+        for i, key_a in enumerate(distinct):
+            for key_b in distinct[i + 1:]:
+                self._increment_pair(key_a, key_b, count)
+                self._increment_pair(key_b, key_a, count)
+
+        if len(self._key_counts) > self.max_keys:
+            self._prune_keys()
+
+    def _merge(self, delta: Dict):
+        """Add the counts of an unsynced delta"""
+        self.total_observations += delta['observations']
+        for key, count in delta['keys'].items():
+            self._key_counts[key] = self._key_counts.get(key, 0) + count
+        for (key_a, key_b), count in delta['pairs'].items():
+            self._increment_pair(key_a, key_b, count)
+            self._increment_pair(key_b, key_a, count)
+        if len(self._key_counts) > self.max_keys:
+            self._prune_keys()
+        if delta['observations']:
+            self.last_updated = datetime.now()
+
+    def _increment_pair(self, key_a: str, key_b: str, count: int = 1):
+        """Increment one directed pair count, pruning the row when it grows too large"""
+        row = self._pair_counts.setdefault(key_a, {})
+        row[key_b] = row.get(key_b, 0) + count
+
+        # Prune lazily at 2x the budget so pruning cost is amortized
+        if len(row) > 2 * self.max_neighbors:
+            self._prune_row(key_a)
+
+    def _prune_row(self, key: str):
+        """Keep only the top-k strongest neighbors of a key"""
+        row = self._pair_counts.get(key)
+        if not row:
+            return
+
+        top = sorted(row.items(), key=lambda x: x[1], reverse=True)[:self.max_neighbors]
+        self._pair_counts[key] = dict(top)
+
+    def _prune_keys(self):
+        """Drop the least frequent keys until the key budget is respected"""
+        # Evict down to 90% of the budget so this does not run on every observation
+        target = int(self.max_keys * 0.9)
+        ranked = sorted(self._key_counts.items(), key=lambda x: x[1])
+        evicted = {key for key, _ in ranked[:len(ranked) - target]}
+
+        for key in evicted:
+            self._key_counts.pop(key, None)
+            self._pair_counts.pop(key, None)
+
+        for key, row in self._pair_counts.items():
+            for other in [k for k in row if k in evicted]:
+                del row[other]
+
+
+def _empty_delta() -> Dict:
+    """Counts of observations not yet synced to the shared file"""
+    return {'observations': 0, 'keys': {}, 'pairs': {}}
+
+
+@contextmanager
+def _locked(path: str):
+    """Hold an exclusive lock on the matrix file's lock file"""
+    with open(f"{path}.lock", 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing CooccurrenceMatrix...")
+
+    matrix = CooccurrenceMatrix(max_keys=100, max_neighbors=5)
+
+    app_cpu = CooccurrenceMatrix.make_key('app-server', 'cpu_usage')
+    db_latency = CooccurrenceMatrix.make_key('database', 'response_time')
+    cache_miss = CooccurrenceMatrix.make_key('cache', 'miss_rate')
+
+    for _ in range(8):
+        matrix.observe([app_cpu, db_latency])
+    for _ in range(2):
+        matrix.observe([app_cpu, cache_miss])
+
+    print(f"✅ P(db_latency | app_cpu): {matrix.conditional_probability(db_latency, app_cpu):.2f}")
+    print(f"✅ Strength(app_cpu, db_latency): {matrix.strength(app_cpu, db_latency):.2f}")
+    print(f"✅ Strength(app_cpu, cache_miss): {matrix.strength(app_cpu, cache_miss):.2f}")
+
+    restored = CooccurrenceMatrix.from_dict(matrix.to_dict())
+    print(f"✅ Restored matrix size: {restored.size()}")
+
+    import tempfile
+
+    # Two workers sharing one file keep each other's learning
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'matrix.json')
+        worker_a = CooccurrenceMatrix.load(path)
+        worker_b = CooccurrenceMatrix.load(path)
+        for _ in range(3):
+            worker_a.observe([app_cpu, db_latency])
+        worker_b.observe([app_cpu, cache_miss])
+        worker_a.sync(path)
+        worker_b.sync(path)
+        worker_a.sync(path)
+        print(f"✅ Merged across workers: {worker_a.size()['observations']} and "
+              f"{worker_b.size()['observations']} observations, "
+              f"file {CooccurrenceMatrix.load(path).size()['observations']}")
+
+    print("✅ CooccurrenceMatrix tests passed!")
@@ -0,0 +1,367 @@
+"""
+Escalation Module
+Re-notifies and escalates unacknowledged alerts on per-severity schedules,
+with timers kept in a hierarchical timer wheel
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+import math
+import threading
+import time
+
+
+@dataclass(frozen=True)
+class EscalationStep:
+    """One step of an escalation policy"""
+    after_seconds: float  # since the alert was raised
+    channels: Optional[Tuple[str, ...]] = None  # None re-notifies on the alert's own channels
+
+
+# Default policies: CRITICAL alerts are re-notified after 5 minutes and
+# escalated to SMS after 15; LOW alerts never escalate
+DEFAULT_POLICIES: Dict[str, List[EscalationStep]] = {
+    'CRITICAL': [EscalationStep(300), EscalationStep(900, ('sms',))],
+    'HIGH': [EscalationStep(900), EscalationStep(3600, ('sms',))],
+    'MEDIUM': [EscalationStep(3600)],
+    'LOW': []
+}
+
+
+def parse_policies(spec: Dict[str, List[Dict]]) -> Dict[str, List[EscalationStep]]:
+    """
+    Build policies from their JSON form
+
+    Args:
+        spec: Severity -> list of {'after_seconds': ..., 'channels': [...]}
+
+    Returns:
+        Severity -> steps, in time order
+    """
+    policies = {}
+    for severity, steps in spec.items():
+        policies[severity.upper()] = sorted(
+            (EscalationStep(float(step['after_seconds']),
+                            tuple(step['channels']) if step.get('channels') else None)
+             for step in steps),
+            key=lambda step: step.after_seconds
+        )
+    return policies
+
+
+class Timer:
+    """A scheduled timer; cancel it through its TimerWheel"""
+
+    __slots__ = ('expires', 'payload', 'slot')
+
+    def __init__(self, expires: int, payload: Any):
+        self.expires = expires  # absolute tick
+        self.payload = payload
+        self.slot: Optional[set] = None
+
+
+class TimerWheel:
+    """
+    TimerWheel Class
+    Hierarchical timer wheel. Level 0 has one slot per tick; every slot of
+    level n spans a full revolution of level n-1. A timer goes into the
+    lowest level whose range covers its delay, so scheduling and cancelling
+    are O(1) set operations regardless of how many timers are pending.
+    Timers of a higher-level slot are moved down a level when the wheel
+    reaches that slot, and level-0 slots expire as the wheel ticks. Not
+    thread-safe.
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, slots_per_level: Sequence[int] = (64, 64, 64, 64),
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize TimerWheel
+
+        Args:
+            tick_seconds: Timer resolution
+            slots_per_level: Slots in each level (the default covers
+                64^4 ticks, about 194 days at one-second ticks)
+            clock: Monotonic time source in seconds
+        """
+        self.tick_seconds = tick_seconds
+        self.clock = clock
+        self._sizes = list(slots_per_level)
+        # Ticks spanned by one slot of each level
+        self._spans = [math.prod(self._sizes[:level]) for level in range(len(self._sizes))]
+        self._capacity = self._spans[-1] * self._sizes[-1]
+        self._levels = [[set() for _ in range(size)] for size in self._sizes]
+        self._tick = self._now_tick()
+        self._count = 0
+
+    def schedule(self, delay_seconds: float, payload: Any) -> Timer:
+        """
+        Schedule a timer
+
+        Args:
+            delay_seconds: Delay before it expires (rounded up to whole
+                ticks; capped at the wheel's range)
+            payload: Value returned by advance() when it expires
+
+        Returns:
+            Timer handle for cancel()
+        """
+        ticks = max(1, math.ceil(delay_seconds / self.tick_seconds))
+        timer = Timer(self._tick + min(ticks, self._capacity - 1), payload)
+        self._place(timer)
+        self._count += 1
+        return timer
+
+    def cancel(self, timer: Timer) -> bool:
+        """
+        Cancel a pending timer
+
+        Args:
+            timer: Handle returned by schedule()
+
+        Returns:
+            True if it was pending
+        """
+        if timer.slot is None:
+            return False
+        timer.slot.discard(timer)
+        timer.slot = None
+        self._count -= 1
+        return True
+
+    def advance(self) -> List[Any]:
+        """
+        Move the wheel up to the current time
+
+        Returns:
+            Payloads of the timers that expired, in expiry order
+        """
+        expired = []
+        target = self._now_tick()
+        while self._tick < target:
+            self._tick += 1
+            # Move timers down from every level whose slot boundary was reached
+            for level in range(len(self._sizes) - 1, 0, -1):
+                span = self._spans[level]
+                if self._tick % span == 0:
+                    slot = self._levels[level][(self._tick // span) % self._sizes[level]]
+                    timers = list(slot)
+                    slot.clear()
+                    for timer in timers:
+                        self._place(timer)
+
+            slot = self._levels[0][self._tick % self._sizes[0]]
+            for timer in slot:
+                timer.slot = None
+                expired.append(timer.payload)
+            self._count -= len(slot)
+            slot.clear()
+        return expired
+
+    def __len__(self) -> int:
+        """Return the number of pending timers"""
+        return self._count
+
+    def _now_tick(self) -> int:
+        """Current time in ticks"""
+        return int(self.clock() // self.tick_seconds)
+
+    def _place(self, timer: Timer):
+        """Put a timer in the lowest level covering its remaining delay"""
+        delay = max(timer.expires - self._tick, 0)
+        level = 0
+        while level < len(self._sizes) - 1 and delay >= self._spans[level + 1]:
+            level += 1
+        slot = self._levels[level][(timer.expires // self._spans[level]) % self._sizes[level]]
+        slot.add(timer)
+        timer.slot = slot
+
+
+class EscalationScheduler:
+    """
+    EscalationScheduler Class
+    Keeps one timer per unacknowledged alert for its next escalation step.
+    A background thread advances the timer wheel once per tick and passes
+    every due step to the subscribers, then schedules the alert's next
+    step; cancelling an alert (e.g. on acknowledgement) removes its timer.
+    """
+
+    def __init__(self, policies: Optional[Dict[str, List[EscalationStep]]] = None,
+                 tick_seconds: float = 1.0, clock: Callable[[], float] = time.monotonic,
+                 start_thread: bool = True):
+        """
+        Initialize EscalationScheduler
+
+        Args:
+            policies: Severity -> escalation steps (default: DEFAULT_POLICIES)
+            tick_seconds: Timer resolution
+            clock: Monotonic time source in seconds
+            start_thread: Run due steps from a background thread (False
+                leaves it to run_due())
+        """
+        self.policies = policies if policies is not None else DEFAULT_POLICIES
+        self.tick_seconds = tick_seconds
+        self._wheel = TimerWheel(tick_seconds=tick_seconds, clock=clock)
+        # alert_id -> (timer, severity, index of the step it fires)
+        self._timers: Dict[str, Tuple[Timer, str, int]] = {}
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[str, EscalationStep], None]] = []
+        self._stopped = threading.Event()
+        self.escalations = 0
+
+        if start_thread:
+            self._thread = threading.Thread(target=self._run, name='alert-escalation', daemon=True)
+            self._thread.start()
+
+    def subscribe(self, callback: Callable[[str, EscalationStep], None]):
+        """
+        Register a callback called with the alert ID and step whenever an
+        escalation step is due
+
+        Args:
+            callback: Function receiving (alert_id, step)
+        """
+        self._subscribers.append(callback)
+
+    def start(self, alert_id: str, severity: str) -> bool:
+        """
+        Start escalating an alert according to its severity's policy
+
+        Args:
+            alert_id: Alert ID
+            severity: Alert severity
+
+        Returns:
+            True if the policy has any steps
+        """
+        steps = self.policies.get(severity)
+        if not steps:
+            return False
+        with self._lock:
+            self._schedule(alert_id, severity, 0, steps[0].after_seconds)
+        return True
+
+    def cancel(self, alert_id: str) -> bool:
+        """
+        Stop escalating an alert
+
+        Args:
+            alert_id: Alert ID
+
+        Returns:
+            True if the alert had a pending step
+        """
+        with self._lock:
+            entry = self._timers.pop(alert_id, None)
+            if entry is None:
+                return False
+            self._wheel.cancel(entry[0])
+            return True
+
+    def run_due(self) -> int:
+        """
+        Pass every due step to the subscribers
+
+        Returns:
+            Number of steps run
+        """
+        due = []
+        with self._lock:
+            for alert_id, severity, index in self._wheel.advance():
+                entry = self._timers.get(alert_id)
+                if entry is None or entry[2] != index:
+                    continue
+                steps = self.policies[severity]
+                due.append((alert_id, steps[index]))
+                if index + 1 < len(steps):
+                    self._schedule(alert_id, severity, index + 1,
+                                   steps[index + 1].after_seconds - steps[index].after_seconds)
+                else:
+                    del self._timers[alert_id]
+            self.escalations += len(due)
+
+        for alert_id, step in due:
+            for callback in self._subscribers:
+                try:
+                    callback(alert_id, step)
+                except Exception as e:
+                    print(f"❌ Error escalating alert {alert_id}: {e}")
+        return len(due)
+
+    def stop(self):
+        """Stop the background thread"""
+        self._stopped.set()
+
+    def get_statistics(self) -> Dict:
+        """Get pending timers and escalations run"""
+        with self._lock:
+            return {
+                'pending': len(self._timers),
+                'escalations': self.escalations,
+                'policies': {
+                    severity: [
+                        {'after_seconds': step.after_seconds,
+                         'channels': list(step.channels) if step.channels else None}
+                        for step in steps
+                    ]
+                    for severity, steps in self.policies.items()
+                }
+            }
+
+    def _schedule(self, alert_id: str, severity: str, index: int, delay_seconds: float):
+        """Set the timer of an alert's next step; caller holds the lock"""
+        entry = self._timers.get(alert_id)
+        if entry is not None:
+            self._wheel.cancel(entry[0])
+        timer = self._wheel.schedule(delay_seconds, (alert_id, severity, index))
+        self._timers[alert_id] = (timer, severity, index)
+
+    def _run(self):
+        """Advance the wheel once per tick"""
+        while not self._stopped.wait(self.tick_seconds):
+            self.run_due()
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing EscalationScheduler...")
+
+    clock = [0.0]
+    scheduler = EscalationScheduler(clock=lambda: clock[0], start_thread=False)
+    fired = []
+    scheduler.subscribe(lambda alert_id, step: fired.append((clock[0], alert_id, step.channels)))
+
+    scheduler.start('ALERT_1', 'CRITICAL')
+    scheduler.start('ALERT_2', 'CRITICAL')
+    scheduler.start('ALERT_3', 'LOW')
+    for minute in range(1, 21):
+        clock[0] = minute * 60.0
+        if minute == 10:
+            scheduler.cancel('ALERT_2')  # acknowledged after the re-notification
+        scheduler.run_due()
+    print(f"✅ Escalations: {fired}")
+
+    # Long delays cascade down the levels and still fire on time
+    wheel = TimerWheel(tick_seconds=1.0, clock=lambda: clock[0])
+    for delay in (1, 63, 64, 4095, 4096, 300000):
+        wheel.schedule(delay, delay)
+    start_time = clock[0]
+    expired_at = {}
+    while len(wheel):
+        clock[0] += 1
+        for payload in wheel.advance():
+            expired_at[payload] = clock[0] - start_time
+    print(f"✅ Fired on time: {all(expired_at[d] == d for d in expired_at)} ({sorted(expired_at)})")
+
+    # 100k timers: schedule and cancel cost
+    wheel = TimerWheel(tick_seconds=1.0, clock=lambda: clock[0])
+    start = time.perf_counter()
+    timers = [wheel.schedule(300 + i % 3600, i) for i in range(100000)]
+    scheduled = time.perf_counter() - start
+    start = time.perf_counter()
+    for timer in timers:
+        wheel.cancel(timer)
+    cancelled = time.perf_counter() - start
+    print(f"✅ 100k timers: schedule {scheduled * 10:.2f} us, cancel {cancelled * 10:.2f} us each, "
+          f"{len(wheel)} left")
+
+    print("✅ EscalationScheduler tests passed!")
@@ -6,6 +6,12 @@ Correlates related anomalies across time and services
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+import os
+
+try:
+    from .cooccurrence_matrix import CooccurrenceMatrix
+except ImportError:
+    from cooccurrence_matrix import CooccurrenceMatrix
 
 
 @dataclass
@@ -23,21 +29,64 @@ class EventCorrelator:
     Links related anomalies across time windows and service dependencies
     """
     
-    def __init__(self, window_size_minutes: int = 5):
+    def __init__(self, window_size_minutes: int = 5,
+                 cooccurrence_matrix: Optional[CooccurrenceMatrix] = None,
+                 cooccurrence_path: Optional[str] = None,
+                 learning_warmup: int = 50,
+                 autosave_every: int = 20):
         """
         Initialize EventCorrelator
         
         Args:
             window_size_minutes: Time window size for correlation in minutes
+            cooccurrence_matrix: Optional pre-built co-occurrence matrix
+            cooccurrence_path: Optional JSON file the matrix is loaded from and
+                synced to; workers sharing it merge their observations
+            learning_warmup: Observations needed before learned strengths fully
+                replace the static severity/dependency heuristics
+            autosave_every: Sync the matrix after this many new observations
         """
         self.correlation_window = window_size_minutes
         self.correlated_events: List[CorrelatedEvent] = []
         self.dependency_graph: Dict[str, List[str]] = {}
+        
+        if cooccurrence_matrix is None:
+            cooccurrence_matrix = (
+                CooccurrenceMatrix.load(cooccurrence_path)
+                if cooccurrence_path else CooccurrenceMatrix()
+            )
+        self.cooccurrence_matrix = cooccurrence_matrix
+        self.cooccurrence_path = cooccurrence_path
+        self.learning_warmup = max(learning_warmup, 1)
+        self.autosave_every = max(autosave_every, 1)
+        self._synced_mtime = self._matrix_mtime()
+    
+    def learn(self, anomalies: List):
+        """
+        Teach the co-occurrence matrix the anomaly windows of newly detected anomalies
+        
+        Only call this once per anomaly, at ingest: re-analysing anomalies
+        that were already learned would count their windows again.
+        
+        Args:
+            anomalies: List of Anomaly objects or dictionaries
+        """
+        for window_anomalies in self._group_by_timestamp(anomalies).values():
+            if len(window_anomalies) >= 2:
+                self.cooccurrence_matrix.observe(
+                    self._cooccurrence_key(a) for a in window_anomalies
+                )
+        
+        if self.cooccurrence_path and self.cooccurrence_matrix.unsynced_observations >= self.autosave_every:
+            self.save_cooccurrence_matrix()
     
     def correlate_anomalies(self, anomalies: List) -> List[CorrelatedEvent]:
         """
         Correlate anomalies based on time and dependencies
         
+        Scoring does not change the co-occurrence matrix (see learn()), so
+        correlating the same anomalies again gives the same scores.
+        
         Args:
             anomalies: List of Anomaly objects or dictionaries
         
@@ -47,6 +96,10 @@ class EventCorrelator:
         if not anomalies:
             return []
         
+        # Pick up what other workers learned since the last sync
+        if self.cooccurrence_path and self._matrix_mtime() != self._synced_mtime:
+            self.save_cooccurrence_matrix()
+        
         # Group anomalies by time window
         time_windows = self._group_by_timestamp(anomalies)
         
@@ -74,8 +127,29 @@ class EventCorrelator:
             correlated_events.append(correlated_event)
         
         self.correlated_events = correlated_events
+        
         return correlated_events
     
+    def save_cooccurrence_matrix(self):
+        """Merge new observations into cooccurrence_path and load other workers' learning"""
+        if not self.cooccurrence_path:
+            return
+        
+        try:
+            self.cooccurrence_matrix.sync(self.cooccurrence_path)
+            self._synced_mtime = self._matrix_mtime()
+        except OSError as e:
+            print(f"❌ Error saving co-occurrence matrix: {e}")
+    
+    def _matrix_mtime(self) -> Optional[int]:
+        """Modification time of the shared matrix file, or None"""
+        if not self.cooccurrence_path:
+            return None
+        try:
+            return os.stat(self.cooccurrence_path).st_mtime_ns
+        except OSError:
+            return None
+    
     def find_related_events(self, anomaly) -> List:
         """
         Find events related to a specific anomaly
@@ -116,6 +190,33 @@ class EventCorrelator:
         
         return related
     
+    def component_anomaly_scores(self, anomalies: List) -> Dict[str, float]:
+        """
+        Aggregate anomaly severities per component
+        
+        Args:
+            anomalies: List of Anomaly objects or dictionaries
+        
+        Returns:
+            Dictionary mapping component to summed severity weight
+        """
+        severity_weights = {'CRITICAL': 1.0, 'HIGH': 0.7, 'MEDIUM': 0.4, 'LOW': 0.1}
+        scores: Dict[str, float] = {}
+        
+        for anomaly in anomalies:
+            component = self.extract_component(anomaly)
+            if not component:
+                continue
+            
+            if isinstance(anomaly, dict):
+                severity = anomaly.get('severity', 'LOW')
+            else:
+                severity = getattr(anomaly, 'severity', 'LOW')
+            
+            scores[component] = scores.get(component, 0.0) + severity_weights.get(severity, 0.1)
+        
+        return scores
+    
     def set_dependencies(self, dependencies: Dict[str, List[str]]):
         """
         Set service dependency graph
@@ -199,6 +300,10 @@ class EventCorrelator:
         """
         Calculate correlation score for a group of anomalies
         
+        Blends the static heuristics (severity, dependencies) with learned
+        pairwise strengths from the co-occurrence matrix. The learned part
+        takes over gradually as the matrix accumulates observations.
+        
         Args:
             anomalies: List of anomaly objects
         
@@ -208,6 +313,34 @@ class EventCorrelator:
         if len(anomalies) < 2:
             return 0.0
         
+        static_score = self._calculate_static_score(anomalies)
+        
+        learned_weight = min(
+            self.cooccurrence_matrix.total_observations / self.learning_warmup, 1.0
+        )
+        if learned_weight == 0:
+            return static_score
+        
+        # Time proximity still contributes its fixed share; learned strength
+        # replaces the severity and dependency factors
+        learned_strength = self.cooccurrence_matrix.group_strength(
+            self._cooccurrence_key(a) for a in anomalies
+        )
+        learned_score = 0.3 + 0.7 * learned_strength
+        
+        score = (1 - learned_weight) * static_score + learned_weight * learned_score
+        return min(score, 1.0)
+    
+    def _calculate_static_score(self, anomalies: List) -> float:
+        """
+        Calculate the fixed heuristic correlation score
+        
+        Args:
+            anomalies: List of anomaly objects
+        
+        Returns:
+            Correlation score between 0 and 1
+        """
         score = 0.0
         
         # Factor 1: Time proximity (already grouped by window)
@@ -259,28 +392,61 @@ class EventCorrelator:
         components = set()
         
         for anomaly in anomalies:
-            # Try to extract component from metric name or type
-            if isinstance(anomaly, dict):
-                metric = anomaly.get('metric', '')
-                anomaly_type = anomaly.get('type', '')
-            else:
-                metric = getattr(anomaly, 'metric_name', '')
-                anomaly_type = getattr(anomaly, 'anomaly_type', '')
-            
-            # Extract component name from metric
-            # e.g., "app-server.cpu_usage" -> "app-server"
-            if '.' in metric:
-                component = metric.split('.')[0]
+            component = self.extract_component(anomaly)
+            if component:
                 components.add(component)
-            elif '_' in metric:
-                component = metric.split('_')[0]
-                components.add(component)
-            else:
-                # Use anomaly type as component fallback
-                if anomaly_type:
-                    components.add(anomaly_type.lower())
         
         return list(components) if components else ['unknown']
+    
+    def extract_component(self, anomaly) -> Optional[str]:
+        """
+        Extract the component name of a single anomaly
+        
+        Args:
+            anomaly: Anomaly object or dictionary
+        
+        Returns:
+            Component name, or None if it cannot be determined
+        """
+        # Try to extract component from metric name or type
+        if isinstance(anomaly, dict):
+            metric = anomaly.get('metric', '')
+            anomaly_type = anomaly.get('type', '')
+        else:
+            metric = getattr(anomaly, 'metric_name', '')
+            anomaly_type = getattr(anomaly, 'anomaly_type', '')
+        
+        # Extract component name from metric
+        # e.g., "app-server.cpu_usage" -> "app-server"
+        if '.' in metric:
+            return metric.split('.')[0]
+        elif '_' in metric:
+            return metric.split('_')[0]
+        elif anomaly_type:
+            # Use anomaly type as component fallback
+            return anomaly_type.lower()
+        
+        return None
+    
+    def _cooccurrence_key(self, anomaly) -> str:
+        """
+        Build the co-occurrence matrix key of an anomaly
+        
+        Args:
+            anomaly: Anomaly object or dictionary
+        
+        Returns:
+            Key combining component and metric name
+        """
+        if isinstance(anomaly, dict):
+            metric = anomaly.get('metric', '')
+        else:
+            metric = getattr(anomaly, 'metric_name', '')
+        
+        component = self.extract_component(anomaly) or 'unknown'
+        metric_name = metric.split('.', 1)[1] if '.' in metric else metric
+        
+        return CooccurrenceMatrix.make_key(component, metric_name)
 
 
 # Test code
@@ -321,6 +487,7 @@ if __name__ == "__main__":
     })
     
     # Correlate anomalies
+    correlator.learn(test_anomalies)
     correlated = correlator.correlate_anomalies(test_anomalies)
     
     print(f"✅ Correlated {len(correlated)} event groups")
@@ -328,4 +495,7 @@ if __name__ == "__main__":
         print(f"✅ Correlation Score: {correlated[0].correlation_score:.2f}")
         print(f"✅ Affected Components: {correlated[0].affected_components}")
     
+    scores = [correlator.correlate_anomalies(test_anomalies)[0].correlation_score for _ in range(5)]
+    print(f"✅ Re-analysis leaves the score unchanged: {len(set(scores)) == 1}")
+    
     print("✅ EventCorrelator tests passed!")
@@ -0,0 +1,256 @@
+"""
+Event Stream Module
+Fan-out hub pushing new alerts, anomalies and RCA results to Server-Sent
+Events subscribers, with bounded per-subscriber buffers and resume by
+last event ID
+"""
+
+from typing import Any, Dict, List, Optional
+from collections import deque
+from itertools import count
+import json
+import threading
+import uuid
+
+
+class TooManySubscribersError(Exception):
+    """Raised when the hub already serves its maximum number of subscribers"""
+    pass
+
+
+class StreamEvent:
+    """One published event, serialized once for all subscribers"""
+
+    __slots__ = ('event_id', 'event', 'data')
+
+    def __init__(self, event_id: str, event: str, data: str):
+        self.event_id = event_id
+        self.event = event
+        self.data = data
+
+    def encode(self) -> str:
+        """Format as a Server-Sent Events message"""
+        return f"id: {self.event_id}\nevent: {self.event}\ndata: {self.data}\n\n"
+
+
+class Subscription:
+    """
+    Subscription Class
+    Bounded buffer of events for one subscriber. A subscriber that falls
+    more than the buffer size behind loses its buffered events and gets a
+    single 'reset' event instead, telling the client to refetch; the
+    publisher never blocks on a slow client.
+    """
+
+    def __init__(self, hub: 'EventHub', buffer_size: int):
+        self._hub = hub
+        self._buffer: deque = deque()
+        self._buffer_size = buffer_size
+        self._ready = threading.Condition(hub._lock)
+        self.closed = False
+        self.overflows = 0
+
+    def get(self, timeout: Optional[float] = None) -> List[StreamEvent]:
+        """
+        Wait for events and take all buffered ones
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            Buffered events, oldest first (empty on timeout or once closed)
+        """
+        with self._ready:
+            if not self._buffer and not self.closed:
+                self._ready.wait(timeout)
+            events = list(self._buffer)
+            self._buffer.clear()
+            return events
+
+    def close(self):
+        """Stop receiving events"""
+        self._hub._unsubscribe(self)
+
+    def _push(self, event: StreamEvent):
+        """Buffer one event; caller holds the hub lock"""
+        if len(self._buffer) >= self._buffer_size:
+            self.overflows += 1
+            self._buffer.clear()
+            self._buffer.append(self._hub._reset_event())
+        else:
+            self._buffer.append(event)
+        self._ready.notify()
+
+
+class EventHub:
+    """
+    EventHub Class
+    Publishes events to every subscriber. Each event is serialized once and
+    kept in a bounded history so a reconnecting client resumes after the
+    last event ID it saw; a client whose ID is older than the history, or
+    from another process or run, gets a 'reset' event and refetches instead.
+    Event IDs are '<hub id>-<sequence>'. The hub lives in one worker
+    process: it only carries what that worker publishes.
+    """
+
+    def __init__(self, buffer_size: int = 256, history_size: int = 1000,
+                 max_subscribers: int = 100):
+        """
+        Initialize EventHub
+
+        Args:
+            buffer_size: Events buffered per subscriber before it is reset
+            history_size: Recent events kept for resuming clients
+            max_subscribers: Maximum concurrent subscribers
+        """
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self.hub_id = uuid.uuid4().hex[:8]
+
+        self._lock = threading.Lock()
+        self._sequence = count(1)
+        self._last_seq = 0
+        self._history: deque = deque(maxlen=history_size)
+        self._subscribers: List[Subscription] = []
+        self.published = 0
+        self.resets = 0
+
+    def publish(self, event: str, data: Any) -> str:
+        """
+        Publish an event to all subscribers
+
+        Args:
+            event: Event type (e.g. 'alert', 'anomaly', 'rca_result')
+            data: JSON-serializable payload
+
+        Returns:
+            Event ID
+        """
+        payload = json.dumps(data, default=str)
+        with self._lock:
+            self._last_seq = next(self._sequence)
+            stream_event = StreamEvent(f"{self.hub_id}-{self._last_seq}", event, payload)
+            self._history.append((self._last_seq, stream_event))
+            for subscription in self._subscribers:
+                subscription._push(stream_event)
+            self.published += 1
+        return stream_event.event_id
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Subscribe to new events
+
+        Args:
+            last_event_id: ID of the last event the client received; the
+                events after it are replayed first
+
+        Returns:
+            Subscription
+
+        Raises:
+            TooManySubscribersError: If the subscriber limit is reached
+        """
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise TooManySubscribersError(
+                    f"Event stream is at its limit of {self.max_subscribers} subscribers"
+                )
+
+            subscription = Subscription(self, self.buffer_size)
+            if last_event_id:
+                seq = self._resume_point(last_event_id)
+                if seq is None:
+                    subscription._push(self._reset_event())
+                else:
+                    for event_seq, event in self._history:
+                        if event_seq > seq:
+                            subscription._push(event)
+
+            self._subscribers.append(subscription)
+            return subscription
+
+    def get_statistics(self) -> Dict:
+        """Get subscriber and event counters"""
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'published': self.published,
+                'resets': self.resets,
+                'history': len(self._history),
+                'last_event_id': f"{self.hub_id}-{self._last_seq}"
+            }
+
+    def _resume_point(self, last_event_id: str) -> Optional[int]:
+        """Sequence number to replay after, or None if the client must reset; caller holds the lock"""
+        hub_id, _, seq = last_event_id.rpartition('-')
+        if hub_id != self.hub_id or not seq.isdigit():
+            return None
+        seq = int(seq)
+        if seq > self._last_seq:
+            return None
+        oldest = self._history[0][0] if self._history else self._last_seq + 1
+        # Events between the client's ID and the oldest kept one are lost
+        if seq < oldest - 1:
+            return None
+        return seq
+
+    def _reset_event(self) -> StreamEvent:
+        """Event telling a client to refetch; resuming from it starts at the latest event"""
+        self.resets += 1
+        return StreamEvent(f"{self.hub_id}-{self._last_seq}", 'reset', '{}')
+
+    def _unsubscribe(self, subscription: Subscription):
+        """Remove a subscriber and wake it up"""
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+            subscription.closed = True
+            subscription._ready.notify_all()
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing EventHub...")
+
+    import time
+
+    hub = EventHub(buffer_size=3, history_size=5, max_subscribers=2)
+    fast = hub.subscribe()
+    slow = hub.subscribe()
+
+    hub.publish('alert', {'id': 'ALERT_1', 'severity': 'HIGH'})
+    print(f"✅ Delivered: {[e.encode() for e in fast.get(timeout=1)]}")
+
+    received = []
+    for i in range(2, 6):
+        hub.publish('anomaly', {'id': f"ANOM_{i}"})
+        received.extend(e.event for e in fast.get(timeout=1))
+    print(f"✅ Fast subscriber: {received}")
+    print(f"✅ Slow subscriber after overflow: {[e.event for e in slow.get(timeout=1)]}")
+
+    # Resume from the second event; the first has to be skipped
+    fast.close()
+    resumed = hub.subscribe(last_event_id=f"{hub.hub_id}-2")
+    print(f"✅ Resumed: {[e.event_id for e in resumed.get(timeout=1)]}")
+    slow.close()
+    stale = hub.subscribe(last_event_id='other-7')
+    print(f"✅ Unknown ID: {[e.event for e in stale.get(timeout=1)]}")
+
+    try:
+        hub.subscribe()
+    except TooManySubscribersError as e:
+        print(f"✅ Limit enforced: {e}")
+
+    # Fan-out cost with 100 subscribers
+    stale.close()
+    resumed.close()
+    hub = EventHub(buffer_size=10000, max_subscribers=100)
+    subscribers = [hub.subscribe() for _ in range(100)]
+    start = time.perf_counter()
+    for i in range(10000):
+        hub.publish('anomaly', {'id': f"ANOM_{i}", 'severity': 'LOW'})
+    elapsed = time.perf_counter() - start
+    print(f"✅ 10000 events to 100 subscribers: {elapsed * 1e6 / 10000:.1f} us per event, "
+          f"{len(subscribers[0].get(timeout=1))} received")
+
+    print("✅ EventHub tests passed!")
@@ -0,0 +1,241 @@
+"""
+Evidence Module
+Lazy views over an incident's anomalies so RCA results only build evidence
+and causal chains that are actually read
+"""
+
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+from collections.abc import Sequence as SequenceABC
+from datetime import datetime
+import heapq
+import threading
+
+
+# Lower rank sorts first
+SEVERITY_RANK = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
+
+
+def evidence_entry(anomaly) -> Dict:
+    """
+    Build the evidence dictionary of one anomaly
+
+    Args:
+        anomaly: Anomaly object or dictionary
+
+    Returns:
+        Evidence dictionary with type, severity, description and timestamp
+    """
+    if isinstance(anomaly, dict):
+        return {
+            'type': anomaly.get('type', 'UNKNOWN'),
+            'severity': anomaly.get('severity', 'UNKNOWN'),
+            'description': anomaly.get('description', ''),
+            'timestamp': anomaly.get('timestamp', '')
+        }
+
+    return {
+        'type': getattr(anomaly, 'anomaly_type', 'UNKNOWN'),
+        'severity': getattr(anomaly, 'severity', 'UNKNOWN'),
+        'description': getattr(anomaly, 'description', ''),
+        'timestamp': getattr(anomaly, 'timestamp', datetime.now()).isoformat()
+    }
+
+
+def _severity_rank(anomaly) -> int:
+    """Sort rank of an anomaly's severity (unknown severities last)"""
+    if isinstance(anomaly, dict):
+        severity = anomaly.get('severity')
+    else:
+        severity = getattr(anomaly, 'severity', None)
+    return SEVERITY_RANK.get(severity, len(SEVERITY_RANK))
+
+
+class LazyEvidence(SequenceABC):
+    """
+    LazyEvidence Class
+    Read-only view of the evidence of a list of anomalies. Holds a reference
+    to the anomaly list instead of copying it; evidence dictionaries are
+    built per item on access. A length can be fixed so that a view over an
+    append-only list stays a stable snapshot while the list keeps growing.
+    """
+
+    def __init__(self, anomalies: Sequence, length: Optional[int] = None):
+        """
+        Initialize LazyEvidence
+
+        Args:
+            anomalies: Anomaly objects or dictionaries (not copied)
+            length: Number of leading anomalies covered (default: all)
+        """
+        self._anomalies = anomalies
+        self._length = len(anomalies) if length is None else min(length, len(anomalies))
+
+    def __len__(self) -> int:
+        """Return the number of evidence items"""
+        return self._length
+
+    def __getitem__(self, index):
+        """Build the evidence of one anomaly (or a list for a slice)"""
+        if isinstance(index, slice):
+            return [evidence_entry(self._anomalies[i]) for i in range(*index.indices(self._length))]
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("evidence index out of range")
+        return evidence_entry(self._anomalies[index])
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Stream evidence in anomaly order"""
+        for i in range(self._length):
+            yield evidence_entry(self._anomalies[i])
+
+    def __eq__(self, other) -> bool:
+        """Compare by content with another evidence sequence"""
+        if not isinstance(other, SequenceABC):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def top(self, k: int = 10, offset: int = 0) -> List[Dict]:
+        """
+        Get one page of evidence ordered by severity, most severe first
+
+        Uses a bounded heap, so a page costs O(n log(offset + k)) without
+        sorting or materializing the whole incident.
+
+        Args:
+            k: Page size
+            offset: Number of items to skip
+
+        Returns:
+            List of evidence dictionaries (ties keep anomaly order)
+        """
+        if k <= 0 or offset >= self._length:
+            return []
+
+        anomalies = self._anomalies
+        positions = heapq.nsmallest(
+            offset + k, range(self._length),
+            key=lambda i: (_severity_rank(anomalies[i]), i)
+        )
+        return [evidence_entry(anomalies[i]) for i in positions[offset:]]
+
+    def severity_counts(self) -> Dict[str, int]:
+        """
+        Count evidence items per severity
+
+        Returns:
+            Dictionary mapping severity to count
+        """
+        counts: Dict[str, int] = {}
+        for i in range(self._length):
+            anomaly = self._anomalies[i]
+            if isinstance(anomaly, dict):
+                severity = anomaly.get('severity', 'UNKNOWN')
+            else:
+                severity = getattr(anomaly, 'severity', 'UNKNOWN')
+            counts[severity] = counts.get(severity, 0) + 1
+        return counts
+
+    def __repr__(self) -> str:
+        return f"LazyEvidence({self._length} items)"
+
+
+class LazyList(SequenceABC):
+    """
+    LazyList Class
+    Read-only list whose items are produced by a factory on first access.
+    Results can be shared between request threads (e.g. through the RCA
+    cache), so the factory runs under a lock and exactly once.
+    """
+
+    def __init__(self, factory: Callable[[], List]):
+        """
+        Initialize LazyList
+
+        Args:
+            factory: Callable returning the list items
+        """
+        self._factory: Optional[Callable[[], List]] = factory
+        self._items: Optional[List] = None
+        self._lock = threading.Lock()
+
+    def _materialize(self) -> List:
+        """Build the items once and drop the factory"""
+        items = self._items
+        if items is not None:
+            return items
+        with self._lock:
+            if self._items is None:
+                self._items = list(self._factory())
+                self._factory = None
+            return self._items
+
+    def __len__(self) -> int:
+        return len(self._materialize())
+
+    def __getitem__(self, index):
+        return self._materialize()[index]
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __eq__(self, other) -> bool:
+        """Compare by content with another sequence"""
+        if not isinstance(other, SequenceABC):
+            return NotImplemented
+        return self._materialize() == list(other)
+
+    def __add__(self, other) -> List:
+        return self._materialize() + list(other)
+
+    def __repr__(self) -> str:
+        if self._items is None:
+            return "LazyList(<not materialized>)"
+        return f"LazyList({self._items!r})"
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing LazyEvidence...")
+
+    import time
+
+    severities = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
+    anomalies = [
+        {'type': 'METRIC_ANOMALY', 'severity': severities[i % 4],
+         'description': f"anomaly {i}", 'timestamp': f"2024-01-01T00:{i % 60:02d}:00"}
+        for i in range(50000)
+    ]
+
+    start = time.perf_counter()
+    evidence = LazyEvidence(anomalies)
+    print(f"✅ Created view over {len(evidence)} anomalies in {(time.perf_counter() - start) * 1e6:.1f} us")
+
+    start = time.perf_counter()
+    page = evidence.top(k=5, offset=5)
+    print(f"✅ Page 2 by severity: {[e['description'] for e in page]} "
+          f"in {(time.perf_counter() - start) * 1000:.2f} ms")
+    print(f"✅ Severity counts: {evidence.severity_counts()}")
+
+    anomalies.append({'type': 'LOG_ERROR', 'severity': 'CRITICAL'})
+    print(f"✅ Snapshot length unchanged after append: {len(evidence)}")
+
+    calls = []
+    chain = LazyList(lambda: calls.append(1) or ["step 1", "step 2"])
+    print(f"✅ Causal chain built on access: {calls == []} -> {list(chain)}, built {len(calls)} time(s)")
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    def slow_chain():
+        calls.append(1)
+        time.sleep(0.05)
+        return ["step 1"]
+
+    calls.clear()
+    shared = LazyList(slow_chain)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        lengths = list(pool.map(lambda _: len(shared), range(8)))
+    print(f"✅ Read by 8 threads at once: built {len(calls)} time(s), lengths {set(lengths)}")
+
+    print("✅ LazyEvidence tests passed!")
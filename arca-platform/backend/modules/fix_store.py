@@ -0,0 +1,394 @@
+"""
+Fix Store Module
+Historical fix records grouped per root cause, cached in memory and
+optionally persisted to MongoDB so every worker sees the same history
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from datetime import datetime
+from collections import deque
+from itertools import islice
+import threading
+import time
+import uuid
+
+
+# A sequence number that was allocated but never shows up (the writer died
+# between allocating and inserting) is skipped after this long
+GAP_TIMEOUT_SECONDS = 30
+
+
+class Fix:
+    """Historical fix record"""
+    def __init__(self, root_cause: str, action_taken: str,
+                 success: bool, timestamp: datetime, fix_id: Optional[str] = None,
+                 resolve_seconds: Optional[float] = None, report_id: Optional[str] = None):
+        self.root_cause = root_cause
+        self.action_taken = action_taken
+        self.success = success
+        self.timestamp = timestamp
+        self.fix_id = fix_id or uuid.uuid4().hex
+        self.resolve_seconds = resolve_seconds
+        # RCA report of the incident the fix was applied to, if known
+        self.report_id = report_id
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'fix_id': self.fix_id,
+            'root_cause': self.root_cause,
+            'action_taken': self.action_taken,
+            'success': self.success,
+            'timestamp': self.timestamp.isoformat(),
+            'resolve_seconds': self.resolve_seconds,
+            'report_id': self.report_id
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Fix':
+        """
+        Rebuild a fix from its dictionary form
+
+        Args:
+            data: Dictionary produced by to_dict()
+
+        Returns:
+            Fix object
+        """
+        timestamp = data['timestamp']
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        return cls(
+            root_cause=data['root_cause'],
+            action_taken=data['action_taken'],
+            success=bool(data['success']),
+            timestamp=timestamp,
+            fix_id=data.get('fix_id'),
+            resolve_seconds=data.get('resolve_seconds'),
+            report_id=data.get('report_id')
+        )
+
+
+class FixStore:
+    """
+    FixStore Class
+    Keeps the most recent fixes of every root cause in a bounded deque,
+    newest first, so the top N fixes of a cause are read off the front
+    without scanning or sorting the whole history.
+
+    With a MongoDB collection the store is shared between workers: every
+    fix gets a sequence number from a counter document, and readers compare
+    that counter with the last number they applied (a single point read,
+    at most once per check interval) and only load the fixes they miss.
+    """
+
+    def __init__(self, collection=None, counters=None, max_fixes_per_cause: int = 50,
+                 check_interval_seconds: float = 5.0, initial_load_limit: int = 10000):
+        """
+        Initialize FixStore
+
+        Args:
+            collection: PyMongo collection of fix documents (None keeps
+                fixes in memory only)
+            counters: PyMongo collection holding the sequence counter
+                (required with a collection)
+            max_fixes_per_cause: Fixes kept in memory per root cause
+            check_interval_seconds: Minimum time between version checks
+            initial_load_limit: Most recent fixes loaded on first use
+        """
+        if collection is not None and counters is None:
+            raise ValueError("A counters collection is required with a fix collection")
+
+        self.collection = collection
+        self.counters = counters
+        self.max_fixes_per_cause = max_fixes_per_cause
+        self.check_interval_seconds = check_interval_seconds
+        self.initial_load_limit = initial_load_limit
+
+        self._by_cause: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        # Highest sequence number below which every fix has been applied
+        self._seq = 0
+        self._applied_ahead = set()
+        self._gaps: Dict[int, float] = {}
+        self._loaded = collection is None
+        self._last_check = 0.0
+        self._subscribers: List[Callable[[Fix], None]] = []
+
+    @property
+    def version(self) -> int:
+        """Sequence number of the latest fix applied in order"""
+        return self._seq
+
+    def subscribe(self, callback: Callable[[Fix], None]):
+        """
+        Register a callback called once for every fix recorded by this
+        worker or loaded from MongoDB after subscribing
+
+        Args:
+            callback: Function receiving the Fix
+        """
+        self._subscribers.append(callback)
+
+    def record(self, fix: Fix) -> Fix:
+        """
+        Record a fix (persisted first when the store is backed by MongoDB)
+
+        Args:
+            fix: Fix object
+
+        Returns:
+            The recorded Fix
+        """
+        if self.collection is not None:
+            counter = self.counters.find_one_and_update(
+                {'_id': self.collection.name},
+                {'$inc': {'seq': 1}},
+                upsert=True,
+                return_document=True  # ReturnDocument.AFTER
+            )
+            self.collection.insert_one(dict(fix.to_dict(), seq=counter['seq']))
+
+        with self._lock:
+            if self.collection is not None:
+                # Skipped when this worker loads its own fix back
+                self._applied_ahead.add(counter['seq'])
+            self._insert(fix)
+            self._notify(fix)
+        return fix
+
+    def recent(self, root_cause: str, limit: Optional[int] = None) -> List[Fix]:
+        """
+        Get the most recent fixes of a root cause
+
+        Args:
+            root_cause: Root cause identifier
+            limit: Maximum number of fixes (default: all kept in memory)
+
+        Returns:
+            List of Fix objects, most recent first
+        """
+        self.refresh()
+        with self._lock:
+            fixes = self._by_cause.get(root_cause)
+            if not fixes:
+                return []
+            return list(islice(fixes, limit))
+
+    def for_reports(self, report_ids: Iterable[str],
+                    limit: Optional[int] = None) -> Dict[str, List[Fix]]:
+        """
+        Get the fixes recorded against RCA reports
+
+        Backed by MongoDB this queries the collection, so fixes that are no
+        longer among the most recent ones kept per root cause are found too.
+
+        Args:
+            report_ids: RCA report IDs
+            limit: Maximum number of fixes per report
+
+        Returns:
+            Dictionary mapping report ID to its fixes, most recent first
+            (reports without fixes are left out)
+        """
+        wanted = set(report_ids)
+        if not wanted:
+            return {}
+
+        fixes = None
+        if self.collection is not None:
+            try:
+                fixes = [Fix.from_dict(doc) for doc in self.collection.find(
+                    {'report_id': {'$in': list(wanted)}}, {'_id': 0}
+                )]
+            except Exception as e:
+                print(f"❌ Error loading fixes of reports: {e}")
+        if fixes is None:
+            fixes = [fix for fix in self if fix.report_id in wanted]
+
+        by_report: Dict[str, List[Fix]] = {}
+        for fix in sorted(fixes, key=lambda f: f.timestamp, reverse=True):
+            report_fixes = by_report.setdefault(fix.report_id, [])
+            if limit is None or len(report_fixes) < limit:
+                report_fixes.append(fix)
+        return by_report
+
+    def refresh(self, force: bool = False):
+        """
+        Load fixes recorded by other workers
+
+        Checks the shared counter at most once per check interval; fixes are
+        only fetched when it moved past the last applied sequence number.
+
+        Args:
+            force: Check even if the interval has not elapsed
+        """
+        if self.collection is None:
+            return
+
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval_seconds:
+            return
+        self._last_check = now
+
+        try:
+            counter = self.counters.find_one({'_id': self.collection.name}, {'seq': 1})
+            latest = counter['seq'] if counter else 0
+
+            with self._lock:
+                if not self._loaded:
+                    self._load_initial(latest)
+                    return
+                if latest <= self._seq:
+                    return
+
+                docs = self.collection.find({'seq': {'$gt': self._seq}}, {'_id': 0}).sort('seq', 1)
+                for doc in docs:
+                    self._apply(doc)
+                self._advance(latest, now)
+        except Exception as e:
+            print(f"❌ Error refreshing historical fixes: {e}")
+
+    def __iter__(self) -> Iterator[Fix]:
+        """Iterate over all fixes kept in memory"""
+        with self._lock:
+            fixes = [fix for cause_fixes in self._by_cause.values() for fix in cause_fixes]
+        return iter(fixes)
+
+    def __len__(self) -> int:
+        """Return the number of fixes kept in memory"""
+        with self._lock:
+            return sum(len(fixes) for fixes in self._by_cause.values())
+
+    def _load_initial(self, latest: int):
+        """Load the most recent fixes on first use; caller holds the lock"""
+        docs = list(self.collection.find({}, {'_id': 0})
+                    .sort('seq', -1).limit(self.initial_load_limit))
+        for doc in reversed(docs):
+            if doc['seq'] not in self._applied_ahead:
+                fix = Fix.from_dict(doc)
+                self._insert(fix)
+                self._notify(fix)
+        self._seq = latest
+        self._applied_ahead = {seq for seq in self._applied_ahead if seq > latest}
+        self._loaded = True
+
+    def _apply(self, doc: Dict):
+        """Apply one fix loaded from MongoDB; caller holds the lock"""
+        seq = doc['seq']
+        if seq <= self._seq or seq in self._applied_ahead:
+            return
+        self._applied_ahead.add(seq)
+        self._gaps.pop(seq, None)
+
+        fix = Fix.from_dict(doc)
+        self._insert(fix)
+        self._notify(fix)
+
+    def _notify(self, fix: Fix):
+        """Pass a new fix to the subscribers; caller holds the lock"""
+        for callback in self._subscribers:
+            callback(fix)
+
+    def _advance(self, latest: int, now: float):
+        """Move the applied watermark over contiguous sequence numbers; caller holds the lock"""
+        while self._seq < latest:
+            seq = self._seq + 1
+            if seq in self._applied_ahead:
+                self._applied_ahead.discard(seq)
+            elif now - self._gaps.setdefault(seq, now) < GAP_TIMEOUT_SECONDS:
+                # Allocated but not inserted yet; look again on the next check
+                break
+            else:
+                del self._gaps[seq]
+            self._seq = seq
+
+    def _insert(self, fix: Fix):
+        """Insert a fix in timestamp order, newest first; caller holds the lock"""
+        fixes = self._by_cause.get(fix.root_cause)
+        if fixes is None:
+            fixes = deque(maxlen=self.max_fixes_per_cause)
+            self._by_cause[fix.root_cause] = fixes
+
+        # Fixes almost always arrive newest-last, which is an O(1) appendleft
+        if not fixes or fix.timestamp >= fixes[0].timestamp:
+            fixes.appendleft(fix)
+            return
+
+        if len(fixes) == fixes.maxlen:
+            if fix.timestamp < fixes[-1].timestamp:
+                return
+            fixes.pop()
+
+        position = next(
+            (i for i, existing in enumerate(fixes) if existing.timestamp <= fix.timestamp),
+            len(fixes)
+        )
+        fixes.insert(position, fix)
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing FixStore...")
+
+    from datetime import timedelta
+
+    store = FixStore(max_fixes_per_cause=3)
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    for i in range(5):
+        store.record(Fix('MEMORY_LEAK', f"Restart #{i}", i % 2 == 0, base + timedelta(minutes=i)))
+    store.record(Fix('MEMORY_LEAK', "Late report", True, base + timedelta(minutes=3, seconds=30)))
+
+    print(f"✅ Top fixes: {[f.action_taken for f in store.recent('MEMORY_LEAK')]}")
+
+    # Two workers sharing one collection
+    class FakeCursor(list):
+        def sort(self, key, direction):
+            return FakeCursor(sorted(self, key=lambda d: d[key], reverse=direction < 0))
+
+        def limit(self, n):
+            return FakeCursor(self[:n])
+
+    class FakeCollection:
+        def __init__(self, name):
+            self.name = name
+            self.docs = []
+
+        def insert_one(self, doc):
+            self.docs.append(dict(doc))
+
+        def find(self, query, projection=None):
+            if 'report_id' in query:
+                return FakeCursor(d for d in self.docs if d.get('report_id') in query['report_id']['$in'])
+            bound = query.get('seq', {}).get('$gt', float('-inf'))
+            return FakeCursor(d for d in self.docs if d['seq'] > bound)
+
+        def find_one(self, query, projection=None):
+            return next((d for d in self.docs if d['_id'] == query['_id']), None)
+
+        def find_one_and_update(self, query, update, upsert=False, return_document=False):
+            doc = self.find_one(query)
+            if doc is None:
+                doc = {'_id': query['_id'], 'seq': 0}
+                self.docs.append(doc)
+            doc['seq'] += update['$inc']['seq']
+            return dict(doc)
+
+    fixes, counters = FakeCollection('historical_fixes'), FakeCollection('counters')
+    worker_a = FixStore(fixes, counters, check_interval_seconds=0)
+    worker_b = FixStore(fixes, counters, check_interval_seconds=0)
+    worker_a.record(Fix('DATABASE_CONNECTION_FAILURE', "Rotate credentials", True, base))
+    worker_b.refresh()
+    worker_a.record(Fix('DATABASE_CONNECTION_FAILURE', "Raise pool size", True, base + timedelta(minutes=1)))
+    print(f"✅ Worker B sees: {[f.action_taken for f in worker_b.recent('DATABASE_CONNECTION_FAILURE')]} "
+          f"(version {worker_b.version})")
+
+    # Fixes of a report are found after they left the per-cause window
+    small = FixStore(fixes, counters, max_fixes_per_cause=2, check_interval_seconds=0)
+    small.record(Fix('DISK_FULL', "Rotate logs", True, base, report_id='REPORT_1'))
+    for i in range(5):
+        small.record(Fix('DISK_FULL', f"Grow volume #{i}", True, base + timedelta(minutes=i + 1)))
+    print(f"✅ Fixes of REPORT_1: {[f.action_taken for f in small.for_reports(['REPORT_1'])['REPORT_1']]} "
+          f"(not among the {len(small.recent('DISK_FULL'))} most recent)")
+
+    print("✅ FixStore tests passed!")
@@ -0,0 +1,357 @@
+"""
+Incident Index Module
+Vectorizes incidents and retrieves the most similar past RCA results
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import re
+import threading
+import numpy as np
+
+
+# Rows scored per matrix product, bounding the float32 copy of a full scan
+SCAN_CHUNK_ROWS = 65536
+
+
+class IncidentVectorizer:
+    """
+    IncidentVectorizer Class
+    Hashed bag-of-features vectorizer over anomaly types, metrics, components
+    and log templates (descriptions with variable parts masked). Uses a
+    stable hash, so vectors are identical across processes and restarts.
+    """
+
+    _TEMPLATE_PATTERNS = [
+        (re.compile(r'\b[0-9a-f]{8,}\b'), '<hex>'),
+        (re.compile(r'\d+(\.\d+)?'), '<num>'),
+        (re.compile(r'\s+'), ' ')
+    ]
+
+    def __init__(self, dimensions: int = 256):
+        """
+        Initialize IncidentVectorizer
+
+        Args:
+            dimensions: Size of the hashed feature space
+        """
+        if dimensions <= 0:
+            raise ValueError("dimensions must be positive")
+
+        self.dimensions = dimensions
+
+    def extract_features(self, anomalies: Iterable, components: Iterable[str] = ()) -> List[str]:
+        """
+        Extract the feature strings of an incident
+
+        Args:
+            anomalies: Anomaly objects or dictionaries
+            components: Affected component names
+
+        Returns:
+            Sorted list of unique feature strings
+        """
+        features = set()
+
+        for anomaly in anomalies:
+            if isinstance(anomaly, dict):
+                anomaly_type = anomaly.get('type', '')
+                metric = anomaly.get('metric', '')
+                description = anomaly.get('description', '')
+            else:
+                anomaly_type = getattr(anomaly, 'anomaly_type', '')
+                metric = getattr(anomaly, 'metric_name', '')
+                description = getattr(anomaly, 'description', '')
+
+            if anomaly_type:
+                features.add(f"type:{anomaly_type}")
+            if metric:
+                features.add(f"metric:{metric}")
+            if description:
+                features.add(f"template:{self.log_template(description)}")
+
+        for component in components:
+            features.add(f"component:{component}")
+
+        return sorted(features)
+
+    def features_from_report(self, report: Dict) -> List[str]:
+        """
+        Get the feature strings of a stored RCA result
+
+        Uses the stored 'incident_features' when present, otherwise derives
+        them from the evidence and affected components.
+
+        Args:
+            report: RCA result document
+
+        Returns:
+            List of feature strings
+        """
+        if report.get('incident_features'):
+            return list(report['incident_features'])
+
+        return self.extract_features(
+            report.get('evidence', []),
+            report.get('affected_components', [])
+        )
+
+    def vectorize(self, features: Iterable[str]) -> np.ndarray:
+        """
+        Hash features into an L2-normalized vector
+
+        Args:
+            features: Feature strings
+
+        Returns:
+            float32 vector of length dimensions
+        """
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+
+        for feature in features:
+            digest = int.from_bytes(
+                hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little'
+            )
+            # Low bits pick the slot, one more bit picks the sign
+            sign = 1.0 if (digest >> 63) & 1 else -1.0
+            vector[digest % self.dimensions] += sign
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+
+        return vector
+
+    def log_template(self, message: str) -> str:
+        """
+        Reduce a log message to its template by masking variable parts
+
+        Args:
+            message: Log message or anomaly description
+
+        Returns:
+            Lowercased template string
+        """
+        template = message.lower()
+        for pattern, replacement in self._TEMPLATE_PATTERNS:
+            template = pattern.sub(replacement, template)
+        return template.strip()
+
+
+class SimilarIncidentIndex:
+    """
+    SimilarIncidentIndex Class
+    In-process nearest-neighbor index over incident vectors. Vectors live in
+    a growable NumPy matrix; random-hyperplane LSH tables narrow each query
+    to a small candidate set that is then re-ranked by exact cosine
+    similarity. Falls back to a full scan when LSH finds too few candidates.
+
+    Every worker holds its own copy. Vectors are stored as float16 (cosine
+    error around 1e-3), so a row costs 2 * dimensions bytes plus about
+    100 bytes of LSH entries and metadata: 256 dimensions and the default
+    cap of 200,000 incidents take about 120 MB per worker. Once the cap is
+    reached the oldest incident is replaced by each new one.
+    """
+
+    def __init__(self, dimensions: int = 256, num_tables: int = 8,
+                 bits_per_table: int = 12, initial_capacity: int = 1024,
+                 max_incidents: int = 200000, seed: int = 13):
+        """
+        Initialize SimilarIncidentIndex
+
+        Args:
+            dimensions: Vector dimensionality
+            num_tables: Number of LSH hash tables
+            bits_per_table: Hyperplanes (signature bits) per table
+            initial_capacity: Initial number of matrix rows
+            max_incidents: Incidents kept; the oldest is replaced beyond that
+            seed: Random seed for the hyperplanes
+        """
+        if max_incidents <= 0:
+            raise ValueError("max_incidents must be positive")
+
+        self.dimensions = dimensions
+        self.num_tables = num_tables
+        self.bits_per_table = bits_per_table
+        self.max_incidents = max_incidents
+
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal(
+            (num_tables * bits_per_table, dimensions)
+        ).astype(np.float32)
+        self._bit_weights = (1 << np.arange(bits_per_table)).astype(np.int64)
+
+        capacity = min(max(initial_capacity, 1), max_incidents)
+        self._vectors = np.zeros((capacity, dimensions), dtype=np.float16)
+        self._signatures = np.zeros((capacity, num_tables), dtype=np.int64)
+        self._metadata: List[Dict] = []
+        self._ids: Dict[str, int] = {}
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(num_tables)]
+        # Row the next incident replaces once the index is full
+        self._oldest = 0
+        self._lock = threading.Lock()
+
+    def add(self, incident_id: str, vector: np.ndarray, metadata: Optional[Dict] = None):
+        """
+        Add an incident to the index (ignored if the ID is already indexed);
+        replaces the oldest incident when the index is full
+
+        Args:
+            incident_id: Unique incident ID (e.g. RCA report ID)
+            vector: L2-normalized incident vector
+            metadata: Data returned with query results (root cause, fixes, ...)
+        """
+        signature = self._signature(vector)
+
+        with self._lock:
+            if incident_id in self._ids:
+                return
+
+            entry = {'incident_id': incident_id, **(metadata or {})}
+            row = len(self._metadata)
+            if row >= self.max_incidents:
+                row = self._oldest
+                self._oldest = (row + 1) % self.max_incidents
+                self._evict(row)
+                self._metadata[row] = entry
+            else:
+                if row >= self._vectors.shape[0]:
+                    self._grow(min(self._vectors.shape[0] * 2, self.max_incidents))
+                self._metadata.append(entry)
+
+            self._vectors[row] = vector
+            self._signatures[row] = signature
+            self._ids[incident_id] = row
+
+            for table, key in zip(self._tables, signature):
+                table.setdefault(int(key), []).append(row)
+
+    def query(self, vector: np.ndarray, k: int = 5,
+              exclude: Iterable[str] = ()) -> List[Tuple[float, Dict]]:
+        """
+        Find the k most similar indexed incidents
+
+        Args:
+            vector: L2-normalized query vector
+            k: Number of results
+            exclude: Incident IDs to leave out of the results
+
+        Returns:
+            List of (cosine similarity, metadata) tuples, most similar first
+        """
+        if k <= 0 or not np.any(vector):
+            return []
+
+        signature = self._signature(vector)
+        excluded = set(exclude)
+
+        with self._lock:
+            count = len(self._metadata)
+            vectors = self._vectors
+            metadata = self._metadata
+
+            candidates = set()
+            for table, key in zip(self._tables, signature):
+                candidates.update(table.get(int(key), ()))
+
+        if count == 0:
+            return []
+
+        if len(candidates) >= k + len(excluded):
+            rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        else:
+            rows = np.arange(count)
+
+        similarities = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), SCAN_CHUNK_ROWS):
+            chunk = rows[start:start + SCAN_CHUNK_ROWS]
+            similarities[start:start + len(chunk)] = vectors[chunk].astype(np.float32) @ vector
+        wanted = min(k + len(excluded), len(rows))
+        top = np.argpartition(-similarities, wanted - 1)[:wanted]
+        top = top[np.argsort(-similarities[top])]
+
+        results = []
+        for i in top:
+            entry = metadata[rows[i]]
+            if entry['incident_id'] in excluded:
+                continue
+            results.append((float(similarities[i]), entry))
+            if len(results) == k:
+                break
+
+        return results
+
+    def _grow(self, capacity: int):
+        """Reallocate the row arrays with a larger capacity; caller holds the lock"""
+        rows = len(self._metadata)
+        vectors = np.zeros((capacity, self.dimensions), dtype=np.float16)
+        vectors[:rows] = self._vectors[:rows]
+        signatures = np.zeros((capacity, self.num_tables), dtype=np.int64)
+        signatures[:rows] = self._signatures[:rows]
+        # Queries keep reading the old arrays they captured
+        self._vectors = vectors
+        self._signatures = signatures
+
+    def _evict(self, row: int):
+        """Remove the incident stored in a row from the ID map and LSH tables; caller holds the lock"""
+        del self._ids[self._metadata[row]['incident_id']]
+        for table, key in zip(self._tables, self._signatures[row]):
+            bucket = table[int(key)]
+            bucket.remove(row)
+            if not bucket:
+                del table[int(key)]
+
+    def _signature(self, vector: np.ndarray) -> np.ndarray:
+        """LSH bucket key per table"""
+        bits = (self._planes @ vector > 0).reshape(self.num_tables, self.bits_per_table)
+        return bits.astype(np.int64) @ self._bit_weights
+
+    def __len__(self) -> int:
+        """Return the number of indexed incidents"""
+        return len(self._metadata)
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing SimilarIncidentIndex...")
+
+    import time
+
+    vectorizer = IncidentVectorizer(dimensions=256)
+    index = SimilarIncidentIndex(dimensions=256, max_incidents=2)
+
+    past = [
+        ('rca-1', [{'type': 'LOG_ERROR', 'metric': 'database.connections',
+                    'description': 'Connection pool exhausted after 30000 ms'}],
+         ['database'], 'DATABASE_CONNECTION_FAILURE', ['Review connection pool settings']),
+        ('rca-2', [{'type': 'METRIC_ANOMALY', 'metric': 'memory_usage',
+                    'description': 'memory_usage exceeded threshold: 97.80 > 85'}],
+         ['memory'], 'MEMORY_LEAK', ['Restart affected services']),
+    ]
+    for incident_id, anomalies, components, root_cause, fixes in past:
+        features = vectorizer.extract_features(anomalies, components)
+        index.add(incident_id, vectorizer.vectorize(features), {'root_cause': root_cause})
+
+    query = vectorizer.vectorize(vectorizer.extract_features(
+        [{'type': 'LOG_ERROR', 'metric': 'database.connections',
+          'description': 'Connection pool exhausted after 45000 ms'}],
+        ['database']
+    ))
+    similarity, best = index.query(query, k=1)[0]
+    print(f"✅ Most similar: {best['incident_id']} ({best['root_cause']}, cosine={similarity:.2f})")
+
+    index.add('rca-3', vectorizer.vectorize(['metric:disk_usage']), {'root_cause': 'DISK_FULL'})
+    remaining = sorted(entry['incident_id'] for _, entry in index.query(query, k=5))
+    print(f"✅ Over capacity the oldest is replaced: {remaining}")
+
+    rng = np.random.default_rng(1)
+    bulk = SimilarIncidentIndex(dimensions=256, initial_capacity=100000, max_incidents=100000)
+    for i, row in enumerate(rng.integers(0, 2000, size=(100000, 6))):
+        bulk.add(f"bulk-{i}", vectorizer.vectorize(f"metric:m{j}" for j in row))
+
+    start = time.perf_counter()
+    bulk.query(vectorizer.vectorize(f"metric:m{j}" for j in range(6)), k=5)
+    print(f"✅ Top-5 over {len(bulk)} incidents in {(time.perf_counter() - start) * 1000:.2f} ms")
+    print(f"✅ Vector storage: {bulk._vectors.nbytes / 2**20:.1f} MB for {len(bulk)} incidents")
+
+    print("✅ SimilarIncidentIndex tests passed!")
@@ -0,0 +1,352 @@
+"""
+Job Queue Module
+Runs long analyses on a bounded worker pool with status polling and
+coalescing of duplicate submissions, optionally shared by all workers
+through MongoDB
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import uuid
+
+from pymongo.errors import DuplicateKeyError
+
+
+@dataclass
+class Job:
+    """Represents a submitted job"""
+    job_id: str
+    key: str
+    status: str  # "PENDING", "RUNNING", "COMPLETED", "FAILED"
+    submitted_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Any = None
+    error: Optional[str] = None
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'submitted_at': self.submitted_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'result': self.result,
+            'error': self.error
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Job':
+        """
+        Rebuild a job from its stored form
+
+        Args:
+            data: Dictionary produced by to_dict() plus its key
+
+        Returns:
+            Job object
+        """
+        def parse(value):
+            return datetime.fromisoformat(value) if value else None
+
+        return cls(
+            job_id=data['job_id'],
+            key=data.get('key', ''),
+            status=data['status'],
+            submitted_at=parse(data['submitted_at']),
+            started_at=parse(data.get('started_at')),
+            finished_at=parse(data.get('finished_at')),
+            result=data.get('result'),
+            error=data.get('error')
+        )
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another job"""
+
+
+class JobQueue:
+    """
+    JobQueue Class
+    Bounded thread pool for background jobs. Submissions with the same key
+    while a job is pending or running return the existing job instead of
+    starting a new one. Finished jobs are kept for polling up to a limit.
+
+    With a MongoDB collection, every job is also stored there: any worker
+    process can answer a status poll, and a submission coalesces with an
+    active job of another process through a unique index on 'active_key'
+    (the key, set only while the job is pending or running). Stored jobs
+    expire through a TTL index on 'expires_at'. An active job older than
+    max_runtime_seconds is taken to belong to a dead process and no longer
+    coalesces submissions.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 100,
+                 max_finished: int = 1000, collection=None,
+                 finished_ttl_seconds: float = 3600, max_runtime_seconds: float = 600):
+        """
+        Initialize JobQueue
+
+        Args:
+            max_workers: Number of worker threads
+            max_pending: Maximum number of pending or running jobs
+            max_finished: Number of finished jobs kept for status polling
+            collection: PyMongo collection jobs are shared through (None
+                keeps them in this process only)
+            finished_ttl_seconds: How long a stored finished job can be polled
+            max_runtime_seconds: Age after which an active stored job is
+                considered abandoned
+        """
+        if max_workers <= 0 or max_pending <= 0:
+            raise ValueError("max_workers and max_pending must be positive")
+
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.collection = collection
+        self.finished_ttl = timedelta(seconds=finished_ttl_seconds)
+        self.max_runtime = timedelta(seconds=max_runtime_seconds)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='rca-job')
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._active_by_key: Dict[str, str] = {}
+        self._finished: OrderedDict = OrderedDict()
+        self._stats = {'submitted': 0, 'coalesced': 0, 'rejected': 0, 'completed': 0, 'failed': 0}
+
+    def submit(self, key: str, func: Callable, *args, **kwargs) -> Tuple[Job, bool]:
+        """
+        Submit a job, coalescing with an active job of the same key
+
+        Args:
+            key: Deduplication key (e.g. fingerprint of the input)
+            func: Callable to run
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Tuple of (Job, coalesced) where coalesced is True if an existing
+            job was returned
+
+        Raises:
+            QueueFullError: If max_pending jobs are already queued or running
+        """
+        with self._lock:
+            existing_id = self._active_by_key.get(key)
+            if existing_id is not None:
+                self._stats['coalesced'] += 1
+                return self._jobs[existing_id], True
+
+            if len(self._active_by_key) >= self.max_pending:
+                self._stats['rejected'] += 1
+                raise QueueFullError(f"Job queue is full ({self.max_pending} active jobs)")
+
+            job = Job(
+                job_id=uuid.uuid4().hex,
+                key=key,
+                status='PENDING',
+                submitted_at=datetime.now()
+            )
+            self._jobs[job.job_id] = job
+            self._active_by_key[key] = job.job_id
+
+        if self.collection is not None:
+            try:
+                shared = self._store_new(job)
+            except Exception as e:
+                # Still run it here; only this process can answer its polls
+                print(f"❌ Error storing job {job.job_id}: {e}")
+                shared = None
+            if shared is not None:
+                with self._lock:
+                    self._jobs.pop(job.job_id, None)
+                    self._active_by_key.pop(key, None)
+                    self._stats['coalesced'] += 1
+                return shared, True
+
+        with self._lock:
+            self._stats['submitted'] += 1
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job, False
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """
+        Get a job by ID
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job object, or None if unknown or already expired
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None and self.collection is not None:
+            # Submitted to another worker process
+            document = self.collection.find_one({'_id': job_id})
+            if document is not None:
+                job = Job.from_dict(document)
+        return job
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Get queue statistics
+
+        Returns:
+            Dictionary with active/finished counts and counters
+        """
+        with self._lock:
+            return {
+                'active': len(self._active_by_key),
+                'finished': len(self._finished),
+                'max_pending': self.max_pending,
+                **self._stats
+            }
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting jobs and shut down the worker pool
+
+        Args:
+            wait: Wait for running jobs to finish
+        """
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: Job, func: Callable, args: tuple, kwargs: Dict):
+        """Execute a job on a worker thread and record its outcome"""
+        job.status = 'RUNNING'
+        job.started_at = datetime.now()
+        self._store_update(job, {'status': job.status, 'started_at': job.started_at.isoformat()})
+
+        try:
+            result = func(*args, **kwargs)
+            job.result = result
+            job.status = 'COMPLETED'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'FAILED'
+
+        job.finished_at = datetime.now()
+        self._store_update(job, {
+            'status': job.status,
+            'finished_at': job.finished_at.isoformat(),
+            'result': job.result,
+            'error': job.error,
+            'expires_at': datetime.now(timezone.utc) + self.finished_ttl
+        }, finished=True)
+
+        with self._lock:
+            self._active_by_key.pop(job.key, None)
+            self._stats['completed' if job.status == 'COMPLETED' else 'failed'] += 1
+
+            self._finished[job.job_id] = True
+            while len(self._finished) > self.max_finished:
+                expired_id, _ = self._finished.popitem(last=False)
+                self._jobs.pop(expired_id, None)
+
+    def _store_new(self, job: Job) -> Optional[Job]:
+        """
+        Store a new job, or find the active job of its key in another process
+
+        Returns:
+            The other process's job to coalesce with, or None once this job
+            is stored
+        """
+        document = dict(job.to_dict(), _id=job.job_id, key=job.key, active_key=job.key,
+                        expires_at=datetime.now(timezone.utc) + self.max_runtime + self.finished_ttl)
+        for _ in range(2):
+            active = self.collection.find_one({'active_key': job.key})
+            if active is not None:
+                if datetime.fromisoformat(active['submitted_at']) >= datetime.now() - self.max_runtime:
+                    return Job.from_dict(active)
+                # Its process died before finishing it
+                self.collection.update_one(
+                    {'_id': active['_id'], 'active_key': job.key},
+                    {'$set': {'status': 'FAILED', 'error': 'Job abandoned'}, '$unset': {'active_key': ''}}
+                )
+            try:
+                self.collection.insert_one(document)
+                return None
+            except DuplicateKeyError:
+                continue  # another process submitted the same key just now
+        # Lost both races: run it without cross-process coalescing
+        del document['active_key']
+        self.collection.insert_one(document)
+        return None
+
+    def _store_update(self, job: Job, fields: Dict, finished: bool = False):
+        """Write a job's new state to MongoDB; errors are printed, the local job stays current"""
+        if self.collection is None:
+            return
+        update = {'$set': fields}
+        if finished:
+            update['$unset'] = {'active_key': ''}
+        try:
+            self.collection.update_one({'_id': job.job_id}, update)
+        except Exception as e:
+            print(f"❌ Error storing job {job.job_id}: {e}")
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing JobQueue...")
+
+    import time
+
+    def slow_analysis(ids: List[str]) -> Dict:
+        time.sleep(0.2)
+        return {'analyzed': len(ids)}
+
+    queue = JobQueue(max_workers=2, max_pending=10)
+
+    first, _ = queue.submit('incident-1', slow_analysis, ['a1', 'a2'])
+    duplicate, coalesced = queue.submit('incident-1', slow_analysis, ['a1', 'a2'])
+    print(f"✅ Duplicate coalesced: {coalesced and duplicate.job_id == first.job_id}")
+
+    while queue.get_job(first.job_id).status in ('PENDING', 'RUNNING'):
+        time.sleep(0.05)
+
+    print(f"✅ Job result: {queue.get_job(first.job_id).to_dict()['result']}")
+    print(f"✅ Queue statistics: {queue.get_statistics()}")
+
+    queue.shutdown()
+
+    class FakeCollection:
+        """Stand-in rca_jobs collection with the unique active_key index"""
+        def __init__(self):
+            self.docs = {}
+
+        def find_one(self, query):
+            return next((dict(d) for d in self.docs.values()
+                         if all(d.get(k) == v for k, v in query.items())), None)
+
+        def insert_one(self, document):
+            if 'active_key' in document and self.find_one({'active_key': document['active_key']}):
+                raise DuplicateKeyError("active_key")
+            self.docs[document['_id']] = dict(document)
+
+        def update_one(self, query, update):
+            document = self.docs.get(query['_id'])
+            if document is not None:
+                document.update(update.get('$set', {}))
+                for field in update.get('$unset', {}):
+                    document.pop(field, None)
+
+    # Two worker processes sharing the jobs collection
+    jobs = FakeCollection()
+    worker_a = JobQueue(max_workers=1, collection=jobs)
+    worker_b = JobQueue(max_workers=1, collection=jobs)
+    first, _ = worker_a.submit('incident-2', slow_analysis, ['a1'])
+    other, coalesced = worker_b.submit('incident-2', slow_analysis, ['a1'])
+    print(f"✅ Coalesced across workers: {coalesced and other.job_id == first.job_id}")
+
+    while worker_b.get_job(first.job_id).status in ('PENDING', 'RUNNING'):
+        time.sleep(0.05)
+    print(f"✅ Polled from the other worker: {worker_b.get_job(first.job_id).to_dict()['result']}")
+
+    worker_a.shutdown()
+    worker_b.shutdown()
+    print("✅ JobQueue tests passed!")
@@ -0,0 +1,342 @@
+"""
+Lag Analyzer Module
+Infers lead/lag relationships between metric series using FFT-based
+normalized cross-correlation
+"""
+
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime
+from dataclasses import dataclass
+from statistics import NormalDist
+import numpy as np
+
+
+@dataclass
+class LagResult:
+    """Lead/lag relationship between two metric series"""
+    leader: str
+    follower: str
+    lag_seconds: float
+    correlation: float
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'leader': self.leader,
+            'follower': self.follower,
+            'lag_seconds': self.lag_seconds,
+            'correlation': self.correlation
+        }
+
+
+class LagAnalyzer:
+    """
+    LagAnalyzer Class
+    Computes normalized cross-correlation over a range of lags for every
+    pair of metric series. All series share one FFT per series, and pairs are
+    processed in batches, so each pair costs O(n log n).
+    """
+
+    def __init__(self, resample_seconds: int = 60, max_lag_seconds: int = 1800,
+                 min_correlation: float = 0.3, min_points: int = 8,
+                 batch_size: int = 256, false_positive_rate: float = 0.01):
+        """
+        Initialize LagAnalyzer
+
+        Args:
+            resample_seconds: Spacing of the uniform grid series are resampled to
+            max_lag_seconds: Largest lag (in either direction) that is considered
+            min_correlation: Minimum peak correlation for a pair to be reported
+            min_points: Minimum number of samples a series needs to be analyzed
+            batch_size: Number of pairs cross-correlated per FFT batch
+            false_positive_rate: Chance that a pair of unrelated series is
+                reported. The peak correlation must exceed the matching
+                number of standard errors (1/sqrt(overlap), so short overlaps
+                need a stronger correlation), corrected for the number of
+                lags tested
+        """
+        if resample_seconds <= 0:
+            raise ValueError("resample_seconds must be positive")
+
+        self.resample_seconds = resample_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.min_correlation = min_correlation
+        self.min_points = min_points
+        self.batch_size = max(batch_size, 1)
+        self.false_positive_rate = false_positive_rate
+
+    def extract_series(self, metric_docs: List[Dict]) -> Dict[str, List[Tuple[float, float]]]:
+        """
+        Extract per-metric time series from metric documents
+
+        Each numeric field of a document becomes a series. Documents carrying
+        a 'component' or 'source' field produce "component.metric" names.
+
+        Args:
+            metric_docs: Metric documents as stored in db.metrics
+
+        Returns:
+            Dictionary mapping series name to (epoch_seconds, value) samples
+        """
+        series: Dict[str, List[Tuple[float, float]]] = {}
+
+        for doc in metric_docs:
+            timestamp = self._to_epoch(doc.get('timestamp'))
+            if timestamp is None:
+                continue
+
+            component = doc.get('component') or doc.get('source')
+
+            for field, value in doc.items():
+                if field in ('_id', 'timestamp', 'component', 'source'):
+                    continue
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+
+                name = f"{component}.{field}" if component else field
+                series.setdefault(name, []).append((timestamp, float(value)))
+
+        return series
+
+    def analyze(self, metric_docs: List[Dict],
+                pairs: Optional[List[Tuple[str, str]]] = None) -> List[LagResult]:
+        """
+        Infer lead/lag relationships from metric documents
+
+        Args:
+            metric_docs: Metric documents as stored in db.metrics
+            pairs: Optional series pairs to restrict the analysis to
+                (defaults to all pairs)
+
+        Returns:
+            List of LagResult objects, strongest correlation first
+        """
+        return self.analyze_series(self.extract_series(metric_docs), pairs)
+
+    def analyze_series(self, series: Dict[str, List[Tuple[float, float]]],
+                       pairs: Optional[List[Tuple[str, str]]] = None) -> List[LagResult]:
+        """
+        Infer lead/lag relationships from raw time series
+
+        Args:
+            series: Dictionary mapping series name to (epoch_seconds, value) samples
+            pairs: Optional series pairs to restrict the analysis to
+
+        Returns:
+            List of LagResult objects, strongest correlation first
+        """
+        names, matrix = self._resample(series)
+        if len(names) < 2:
+            return []
+
+        index = {name: i for i, name in enumerate(names)}
+        if pairs is None:
+            pair_idx = [(i, j) for i in range(len(names)) for j in range(i + 1, len(names))]
+        else:
+            pair_idx = [
+                (index[a], index[b]) for a, b in pairs
+                if a in index and b in index and a != b
+            ]
+        if not pair_idx:
+            return []
+
+        n = matrix.shape[1]
+        # Every lag keeps at least half the samples overlapping
+        max_lag = min(int(self.max_lag_seconds // self.resample_seconds), n // 2)
+        lags, correlations = self._cross_correlate(matrix, pair_idx, max_lag)
+
+        # Pick the most significant lag, not the largest correlation: a
+        # correlation over few samples is mostly noise
+        overlap = (n - np.abs(lags)).astype(float)
+        z_scores = correlations * np.sqrt(overlap)
+        significance = NormalDist().inv_cdf(1 - self.false_positive_rate / len(lags))
+
+        results = []
+        best = np.argmax(z_scores, axis=1)
+        for p, (i, j) in enumerate(pair_idx):
+            peak = float(correlations[p, best[p]])
+            if peak < self.min_correlation or z_scores[p, best[p]] < significance:
+                continue
+
+            lag = int(lags[best[p]])
+            # Negative lag: series i moves first; positive lag: series j moves first
+            if lag <= 0:
+                leader, follower = names[i], names[j]
+            else:
+                leader, follower = names[j], names[i]
+
+            results.append(LagResult(
+                leader=leader,
+                follower=follower,
+                lag_seconds=float(abs(lag) * self.resample_seconds),
+                correlation=round(peak, 4)
+            ))
+
+        results.sort(key=lambda r: r.correlation, reverse=True)
+        return results
+
+    @staticmethod
+    def lead_lag_order(results: List) -> List[str]:
+        """
+        Order series from earliest mover to latest
+
+        Each series scores +correlation for every pair it leads and
+        -correlation for every pair it follows. Simultaneous pairs are ignored.
+
+        Args:
+            results: LagResult objects or their dictionary form
+
+        Returns:
+            List of series names, leaders first
+        """
+        scores: Dict[str, float] = {}
+
+        for result in results:
+            if isinstance(result, dict):
+                leader = result.get('leader')
+                follower = result.get('follower')
+                lag = result.get('lag_seconds', 0)
+                weight = result.get('correlation', 0)
+            else:
+                leader, follower = result.leader, result.follower
+                lag, weight = result.lag_seconds, result.correlation
+
+            if not leader or not follower or lag == 0:
+                continue
+
+            scores[leader] = scores.get(leader, 0.0) + weight
+            scores[follower] = scores.get(follower, 0.0) - weight
+
+        return sorted(scores, key=lambda name: scores[name], reverse=True)
+
+    def _resample(self, series: Dict[str, List[Tuple[float, float]]]) -> Tuple[List[str], np.ndarray]:
+        """
+        Resample all series onto one uniform grid and z-normalize them
+
+        Args:
+            series: Dictionary mapping series name to (epoch_seconds, value) samples
+
+        Returns:
+            Tuple of (series names, matrix of shape [series, samples])
+        """
+        usable = {
+            name: samples for name, samples in series.items()
+            if len(samples) >= self.min_points
+        }
+        if not usable:
+            return [], np.empty((0, 0))
+
+        start = min(min(t for t, _ in samples) for samples in usable.values())
+        end = max(max(t for t, _ in samples) for samples in usable.values())
+        grid = np.arange(start, end + self.resample_seconds, self.resample_seconds)
+        if len(grid) < self.min_points:
+            return [], np.empty((0, 0))
+
+        names = []
+        rows = []
+        for name in sorted(usable):
+            samples = np.array(sorted(usable[name]), dtype=float)
+            values = np.interp(grid, samples[:, 0], samples[:, 1])
+
+            std = values.std()
+            if std == 0:
+                # A flat series carries no timing information
+                continue
+
+            names.append(name)
+            rows.append((values - values.mean()) / std)
+
+        if not rows:
+            return [], np.empty((0, 0))
+
+        return names, np.vstack(rows)
+
+    def _cross_correlate(self, matrix: np.ndarray, pair_idx: List[Tuple[int, int]],
+                         max_lag: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Normalized cross-correlation for series pairs via batched FFT
+
+        Args:
+            matrix: Z-normalized series of shape [series, samples]
+            pair_idx: Row index pairs (i, j) to correlate
+            max_lag: Largest lag in grid steps
+
+        Returns:
+            Tuple of (lags from -max_lag to max_lag, correlations of shape [pairs, lags])
+        """
+        n = matrix.shape[1]
+        # Zero-pad to avoid circular wrap-around
+        nfft = 1 << int(np.ceil(np.log2(2 * n - 1)))
+        spectra = np.fft.rfft(matrix, n=nfft, axis=1)
+
+        lags = np.arange(-max_lag, max_lag + 1)
+        # Number of overlapping samples at each lag, for an unbiased estimate
+        overlap = (n - np.abs(lags)).astype(float)
+
+        correlations = np.empty((len(pair_idx), len(lags)))
+        pairs = np.array(pair_idx)
+
+        for start in range(0, len(pairs), self.batch_size):
+            batch = pairs[start:start + self.batch_size]
+            cross = np.fft.irfft(
+                spectra[batch[:, 0]] * np.conj(spectra[batch[:, 1]]),
+                n=nfft, axis=1
+            )
+            # cross[:, k] = sum_t x_i[t + k] * x_j[t]; negative lags wrap to the end
+            window = np.concatenate(
+                [cross[:, nfft - max_lag:], cross[:, :max_lag + 1]], axis=1
+            ) if max_lag > 0 else cross[:, :1]
+            correlations[start:start + len(batch)] = window / overlap
+
+        return lags, np.clip(correlations, -1.0, 1.0)
+
+    @staticmethod
+    def _to_epoch(timestamp) -> Optional[float]:
+        """Convert a datetime or ISO string to epoch seconds"""
+        if isinstance(timestamp, str):
+            try:
+                timestamp = datetime.fromisoformat(timestamp)
+            except ValueError:
+                return None
+
+        if isinstance(timestamp, datetime):
+            return timestamp.timestamp()
+
+        return None
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing LagAnalyzer...")
+
+    from datetime import timedelta
+
+    rng = np.random.default_rng(42)
+    base_time = datetime.now() - timedelta(hours=2)
+    latency = rng.normal(250, 20, 120)
+    latency[60:70] += 2000
+
+    docs = []
+    for i in range(120):
+        # app-server CPU follows the database latency spike 3 minutes later
+        cpu = 45 + rng.normal(0, 3) + (40 if 63 <= i < 73 else 0)
+        docs.append({'timestamp': base_time + timedelta(minutes=i), 'component': 'database',
+                     'response_time': float(latency[i])})
+        docs.append({'timestamp': base_time + timedelta(minutes=i), 'component': 'app-server',
+                     'cpu_usage': float(cpu)})
+
+    analyzer = LagAnalyzer(resample_seconds=60, max_lag_seconds=900)
+    results = analyzer.analyze(docs)
+
+    for result in results:
+        print(f"✅ {result.leader} leads {result.follower} by {result.lag_seconds:.0f}s "
+              f"(r={result.correlation:.2f})")
+    print(f"✅ Lead/lag order: {LagAnalyzer.lead_lag_order(results)}")
+
+    # Unrelated short series must not come back as lead/lag relationships
+    noise = {f"noise_{k}": [(i * 60.0, float(v)) for i, v in enumerate(rng.normal(0, 1, 12))]
+             for k in range(40)}
+    spurious = analyzer.analyze_series(noise)
+    print(f"✅ Independent noise: {len(spurious)} of {40 * 39 // 2} pairs reported")
+
+    print("✅ LagAnalyzer tests passed!")
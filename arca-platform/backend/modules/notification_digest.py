@@ -0,0 +1,224 @@
+"""
+Notification Digest Module
+Batches notifications of non-critical alerts per channel and recipient
+into periodic digests
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime
+import threading
+import time
+import uuid
+
+
+SEVERITY_ORDER = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
+
+# Alert messages quoted in a digest's summary line
+SUMMARY_MESSAGES = 3
+
+
+def _severity_rank(severity: str) -> int:
+    """Position of a severity from least to most severe (unknown ones sort first)"""
+    return SEVERITY_ORDER.index(severity) if severity in SEVERITY_ORDER else -1
+
+
+def build_digest(recipient: Optional[str], alerts: List[Dict]) -> Dict:
+    """
+    Build one digest notification from buffered alert payloads
+
+    The digest has the fields every channel sender reads from an alert
+    ('type', 'severity', 'message'), plus the alerts themselves.
+
+    Args:
+        recipient: Recipient the digest is for (None for the channel default)
+        alerts: Alert payloads, oldest first
+
+    Returns:
+        Digest payload
+    """
+    severity = max((a.get('severity', 'LOW') for a in alerts), key=_severity_rank)
+    quoted = '; '.join(a.get('message', '') for a in alerts[:SUMMARY_MESSAGES])
+    more = len(alerts) - SUMMARY_MESSAGES
+    return {
+        'id': f"DIGEST_{uuid.uuid4().hex[:12]}",
+        'type': 'ALERT_DIGEST',
+        'severity': severity,
+        'message': f"{len(alerts)} alerts: {quoted}" + (f" (+{more} more)" if more > 0 else ''),
+        'timestamp': datetime.now().isoformat(),
+        'recipient': recipient,
+        'count': len(alerts),
+        'alerts': alerts
+    }
+
+
+class DigestBatcher:
+    """
+    DigestBatcher Class
+    Buffers alert notifications per (channel, recipient) and delivers each
+    buffer as one digest once it holds max_alerts alerts or its oldest
+    alert has waited max_wait_seconds. Buffers are kept in the order their
+    first alert arrived, so the background check only looks at buffers that
+    are actually due.
+    """
+
+    def __init__(self, deliver: Optional[Callable[[str, Dict], None]],
+                 severities: Iterable[str] = ('LOW', 'MEDIUM'),
+                 max_alerts: int = 50, max_wait_seconds: float = 300,
+                 check_interval_seconds: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic, start_thread: bool = True):
+        """
+        Initialize DigestBatcher
+
+        Args:
+            deliver: Called with (channel, digest payload) to send a digest
+                (None until AlertSystem sets it)
+            severities: Alert severities that are batched
+            max_alerts: Alerts per digest before it is sent right away
+            max_wait_seconds: Longest an alert waits for its digest
+            check_interval_seconds: Time between checks for due digests
+            clock: Monotonic time source in seconds
+            start_thread: Send due digests from a background thread (False
+                leaves it to flush_due())
+        """
+        self.deliver = deliver
+        self.severities = {s.strip().upper() for s in severities if s.strip()}
+        self.max_alerts = max_alerts
+        self.max_wait_seconds = max_wait_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.clock = clock
+
+        # (channel, recipient) -> (first alert time, alert payloads)
+        self._buffers: 'OrderedDict[Tuple[str, Optional[str]], Tuple[float, List[Dict]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self.batched = 0
+        self.digests_sent = 0
+
+        if start_thread:
+            self._thread = threading.Thread(target=self._run, name='notification-digest', daemon=True)
+            self._thread.start()
+
+    def accepts(self, severity: str) -> bool:
+        """Whether notifications of a severity are batched"""
+        return severity in self.severities
+
+    def add(self, channel: str, recipient: Optional[str], payload: Dict):
+        """
+        Buffer one alert notification
+
+        Args:
+            channel: Notification channel
+            recipient: Recipient (None for the channel default)
+            payload: Alert payload
+        """
+        key = (channel, recipient)
+        with self._lock:
+            entry = self._buffers.get(key)
+            if entry is None:
+                entry = (self.clock(), [])
+                self._buffers[key] = entry
+            entry[1].append(payload)
+            self.batched += 1
+            full = self._buffers.pop(key) if len(entry[1]) >= self.max_alerts else None
+
+        if full is not None:
+            self._send(key, full[1])
+
+    def flush_due(self) -> int:
+        """
+        Send digests whose oldest alert has waited long enough
+
+        Returns:
+            Number of digests sent
+        """
+        due = []
+        now = self.clock()
+        with self._lock:
+            while self._buffers:
+                key, (first, alerts) = next(iter(self._buffers.items()))
+                if now - first < self.max_wait_seconds:
+                    break
+                self._buffers.popitem(last=False)
+                due.append((key, alerts))
+
+        for key, alerts in due:
+            self._send(key, alerts)
+        return len(due)
+
+    def flush(self) -> int:
+        """
+        Send all buffered digests now
+
+        Returns:
+            Number of digests sent
+        """
+        with self._lock:
+            due = [(key, alerts) for key, (_, alerts) in self._buffers.items()]
+            self._buffers.clear()
+
+        for key, alerts in due:
+            self._send(key, alerts)
+        return len(due)
+
+    def stop(self):
+        """Stop the background thread and send what is buffered"""
+        self._stopped.set()
+        self.flush()
+
+    def get_statistics(self) -> Dict:
+        """Get buffered alerts and digests sent"""
+        with self._lock:
+            buffered = sum(len(alerts) for _, alerts in self._buffers.values())
+            buffers = len(self._buffers)
+        return {
+            'severities': sorted(self.severities, key=_severity_rank),
+            'max_alerts': self.max_alerts,
+            'max_wait_seconds': self.max_wait_seconds,
+            'buffered_alerts': buffered,
+            'open_digests': buffers,
+            'batched_alerts': self.batched,
+            'digests_sent': self.digests_sent
+        }
+
+    def _send(self, key: Tuple[str, Optional[str]], alerts: List[Dict]):
+        """Deliver one digest"""
+        channel, recipient = key
+        try:
+            self.deliver(channel, build_digest(recipient, alerts))
+            self.digests_sent += 1
+        except Exception as e:
+            print(f"❌ Error sending {channel} digest: {e}")
+
+    def _run(self):
+        """Send due digests periodically"""
+        while not self._stopped.wait(self.check_interval_seconds):
+            self.flush_due()
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing DigestBatcher...")
+
+    clock = [0.0]
+    sent = []
+    batcher = DigestBatcher(lambda channel, digest: sent.append((channel, digest)),
+                            max_alerts=100, max_wait_seconds=300,
+                            clock=lambda: clock[0], start_thread=False)
+
+    # A noisy hour: 2000 MEDIUM alerts to two recipients of one channel
+    for i in range(2000):
+        clock[0] = i * 1.8
+        batcher.add('webhook', 'ops' if i % 4 else 'dba', {
+            'id': f"ALERT_{i}", 'type': 'RESOURCE_THRESHOLD', 'severity': 'MEDIUM',
+            'message': f"CPU at {80 + i % 20}%"
+        })
+        batcher.flush_due()
+    batcher.flush()
+
+    print(f"✅ 2000 alerts -> {len(sent)} digests "
+          f"({sum(d['count'] for _, d in sent)} alerts delivered)")
+    print(f"✅ First digest: {sent[0][1]['recipient']}: {sent[0][1]['message']}")
+    print(f"✅ Stats: {batcher.get_statistics()}")
+
+    print("✅ DigestBatcher tests passed!")
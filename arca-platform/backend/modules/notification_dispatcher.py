@@ -0,0 +1,482 @@
+"""
+Notification Dispatcher Module
+Delivers alert notifications in the background: bounded per-channel queues,
+worker pools, pooled HTTP connections, exponential-backoff retries and a
+dead-letter store
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime
+from dataclasses import dataclass, field
+from collections import deque
+import heapq
+import queue
+import random
+import threading
+import time
+import uuid
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Delivery latencies kept per channel for the percentile metrics
+LATENCY_SAMPLES = 1000
+
+
+@dataclass
+class Notification:
+    """A notification waiting for delivery on one channel"""
+    channel: str
+    payload: Dict
+    enqueued_at: float  # time.monotonic() when submitted
+    attempts: int = 0
+    last_error: Optional[str] = None
+    notification_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'notification_id': self.notification_id,
+            'channel': self.channel,
+            'payload': self.payload,
+            'attempts': self.attempts,
+            'last_error': self.last_error
+        }
+
+
+class WebhookSender:
+    """
+    WebhookSender Class
+    Posts notifications as JSON to an HTTP endpoint over a pooled session,
+    so workers reuse keep-alive connections instead of reconnecting
+    """
+
+    def __init__(self, url: str, formatter: Optional[Callable[[Dict], Dict]] = None,
+                 timeout_seconds: float = 5.0, pool_size: int = 10,
+                 session: Optional[requests.Session] = None):
+        """
+        Initialize WebhookSender
+
+        Args:
+            url: Endpoint URL
+            formatter: Turns a notification payload into the request body
+                (default: the payload itself)
+            timeout_seconds: Connect and read timeout per request
+            pool_size: Connections kept open to the endpoint
+            session: Shared requests session (default: a new pooled session)
+        """
+        self.url = url
+        self.formatter = formatter
+        self.timeout_seconds = timeout_seconds
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+
+    def __call__(self, payload: Dict):
+        """
+        Deliver one notification
+
+        Raises:
+            requests.RequestException: If the request fails or returns an error status
+        """
+        body = self.formatter(payload) if self.formatter else payload
+        response = self.session.post(self.url, json=body, timeout=self.timeout_seconds)
+        response.raise_for_status()
+
+
+class _ChannelMetrics:
+    """Delivery counters of one channel; guarded by the dispatcher lock"""
+
+    def __init__(self):
+        self.submitted = 0
+        self.delivered = 0
+        self.failed_attempts = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+
+class NotificationDispatcher:
+    """
+    NotificationDispatcher Class
+    Accepts notifications without blocking the caller and delivers them
+    from a worker pool per channel. Each channel has its own bounded queue,
+    so a slow provider only backs up its own channel. Failed deliveries are
+    retried with exponential backoff and jitter from a timer heap (workers
+    never sleep on a retry); notifications that exhaust their retries, or
+    that arrive while their queue is full, go to a bounded dead-letter
+    store.
+    """
+
+    def __init__(self, max_queue_size: int = 1000, max_retries: int = 3,
+                 backoff_base_seconds: float = 0.5, backoff_max_seconds: float = 30.0,
+                 dead_letter_size: int = 1000, dead_letter_collection=None):
+        """
+        Initialize NotificationDispatcher
+
+        Args:
+            max_queue_size: Pending notifications per channel before rejecting
+            max_retries: Retries after the first failed attempt
+            backoff_base_seconds: Delay before the first retry (doubled each retry)
+            backoff_max_seconds: Upper bound of the retry delay
+            dead_letter_size: Dead letters kept in memory
+            dead_letter_collection: Optional PyMongo collection that also
+                receives dead letters
+        """
+        self.max_queue_size = max_queue_size
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.dead_letter_collection = dead_letter_collection
+
+        self._senders: Dict[str, Callable[[Dict], Any]] = {}
+        self._queues: Dict[str, queue.Queue] = {}
+        self._workers: Dict[str, List[threading.Thread]] = {}
+        self._metrics: Dict[str, _ChannelMetrics] = {}
+        self._dead_letters = deque(maxlen=dead_letter_size)
+
+        self._lock = threading.Lock()
+        # Signalled when retries are scheduled and when work completes
+        self._condition = threading.Condition(self._lock)
+        self._retry_heap: List = []
+        self._retry_sequence = 0
+        self._in_flight = 0
+        self._running = True
+
+        self._retry_thread = threading.Thread(
+            target=self._retry_loop, name='notification-retries', daemon=True
+        )
+        self._retry_thread.start()
+
+    def register_channel(self, name: str, sender: Callable[[Dict], Any], workers: int = 2):
+        """
+        Register a delivery channel and start its workers
+
+        Args:
+            name: Channel name (e.g. "email", "slack", "webhook")
+            sender: Callable delivering one payload; raising marks the attempt failed
+            workers: Number of worker threads for this channel
+        """
+        if name in self._senders:
+            raise ValueError(f"Channel already registered: {name}")
+
+        self._senders[name] = sender
+        self._queues[name] = queue.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._metrics[name] = _ChannelMetrics()
+
+        self._workers[name] = []
+        for i in range(workers):
+            worker = threading.Thread(
+                target=self._worker_loop, args=(name,),
+                name=f"notify-{name}-{i}", daemon=True
+            )
+            worker.start()
+            self._workers[name].append(worker)
+
+    @property
+    def channels(self) -> List[str]:
+        """Registered channel names"""
+        return list(self._senders)
+
+    def submit(self, channel: str, payload: Dict) -> bool:
+        """
+        Queue a notification for delivery
+
+        Args:
+            channel: Registered channel name
+            payload: Notification payload passed to the channel's sender
+
+        Returns:
+            True if queued, False if the channel's queue was full or the
+            dispatcher is stopped (the notification is dead-lettered)
+
+        Raises:
+            KeyError: If the channel is not registered
+        """
+        notification = Notification(channel, payload, time.monotonic())
+        channel_queue = self._queues[channel]
+
+        with self._lock:
+            self._metrics[channel].submitted += 1
+            self._in_flight += 1
+            running = self._running
+
+        if not running:
+            notification.last_error = 'dispatcher stopped'
+            self._dead_letter(notification)
+            return False
+
+        try:
+            channel_queue.put_nowait(notification)
+            return True
+        except queue.Full:
+            notification.last_error = 'queue full'
+            with self._lock:
+                self._metrics[channel].rejected += 1
+            self._dead_letter(notification)
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every submitted notification was delivered or dead-lettered
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if nothing is pending anymore
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop the workers after draining what is pending
+
+        Queued notifications are delivered before the workers exit. Retries
+        still waiting for their backoff and anything the workers could not
+        reach within the timeout are dead-lettered rather than lost.
+
+        Args:
+            timeout: Maximum seconds to wait for pending notifications
+        """
+        deadline = time.monotonic() + timeout
+        self.flush(timeout)
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            pending_retries = [notification for _, _, notification in self._retry_heap]
+            self._retry_heap.clear()
+            self._condition.notify_all()
+        # The retry thread may be re-queueing one notification; let it finish
+        # so nothing lands behind the workers' stop sentinels
+        self._retry_thread.join(max(deadline - time.monotonic(), 0))
+
+        for notification in pending_retries:
+            notification.last_error = f"stopped before retry: {notification.last_error}"
+            self._dead_letter(notification)
+
+        for name, channel_queue in self._queues.items():
+            for _ in self._workers[name]:
+                channel_queue.put(None)
+        for workers in self._workers.values():
+            for worker in workers:
+                worker.join(max(deadline - time.monotonic(), 0))
+
+        for channel_queue in self._queues.values():
+            while True:
+                try:
+                    notification = channel_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if notification is not None:
+                    notification.last_error = 'stopped before delivery'
+                    self._dead_letter(notification)
+
+    def get_dead_letters(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get dead-lettered notifications
+
+        Args:
+            limit: Maximum number returned
+
+        Returns:
+            List of dead-letter dictionaries, most recent first
+        """
+        with self._lock:
+            letters = list(reversed(self._dead_letters))
+        return letters[:limit] if limit else letters
+
+    def get_statistics(self) -> Dict:
+        """
+        Get delivery metrics
+
+        Returns:
+            Dictionary with per-channel counters, queue depth and delivery
+            latency (submit to delivery, including retries)
+        """
+        with self._lock:
+            channels = {}
+            for name, metrics in self._metrics.items():
+                latencies = sorted(metrics.latencies)
+                channels[name] = {
+                    'queue_depth': self._queues[name].qsize(),
+                    'workers': len(self._workers.get(name, [])),
+                    'submitted': metrics.submitted,
+                    'delivered': metrics.delivered,
+                    'failed_attempts': metrics.failed_attempts,
+                    'retried': metrics.retried,
+                    'dead_lettered': metrics.dead_lettered,
+                    'rejected': metrics.rejected,
+                    'latency_ms': {
+                        'avg': sum(latencies) * 1000 / len(latencies) if latencies else None,
+                        'p50': latencies[len(latencies) // 2] * 1000 if latencies else None,
+                        'p95': latencies[int(len(latencies) * 0.95)] * 1000 if latencies else None,
+                        'max': latencies[-1] * 1000 if latencies else None
+                    }
+                }
+
+            return {
+                'in_flight': self._in_flight,
+                'scheduled_retries': len(self._retry_heap),
+                'dead_letters': len(self._dead_letters),
+                'channels': channels
+            }
+
+    def _worker_loop(self, channel: str):
+        """Deliver notifications of one channel until stopped"""
+        channel_queue = self._queues[channel]
+        sender = self._senders[channel]
+
+        while True:
+            notification = channel_queue.get()
+            if notification is None:
+                return
+
+            notification.attempts += 1
+            try:
+                sender(notification.payload)
+            except Exception as e:
+                notification.last_error = str(e)
+                self._handle_failure(notification)
+                continue
+
+            with self._condition:
+                metrics = self._metrics[channel]
+                metrics.delivered += 1
+                metrics.latencies.append(time.monotonic() - notification.enqueued_at)
+                self._finish()
+
+    def _handle_failure(self, notification: Notification):
+        """Schedule a retry or dead-letter a failed notification"""
+        with self._condition:
+            metrics = self._metrics[notification.channel]
+            metrics.failed_attempts += 1
+
+            if notification.attempts <= self.max_retries and self._running:
+                metrics.retried += 1
+                delay = min(self.backoff_base_seconds * 2 ** (notification.attempts - 1),
+                            self.backoff_max_seconds)
+                # Full jitter keeps retries from many workers from synchronizing
+                due = time.monotonic() + random.uniform(delay / 2, delay)
+                self._retry_sequence += 1
+                heapq.heappush(self._retry_heap, (due, self._retry_sequence, notification))
+                self._condition.notify_all()
+                return
+
+        self._dead_letter(notification)
+
+    def _retry_loop(self):
+        """Re-queue notifications whose backoff has elapsed"""
+        while True:
+            with self._condition:
+                while self._running and (
+                    not self._retry_heap or self._retry_heap[0][0] > time.monotonic()
+                ):
+                    timeout = self._retry_heap[0][0] - time.monotonic() if self._retry_heap else None
+                    self._condition.wait(timeout)
+                if not self._running:
+                    return
+                _, _, notification = heapq.heappop(self._retry_heap)
+
+            try:
+                self._queues[notification.channel].put_nowait(notification)
+            except queue.Full:
+                notification.last_error = 'queue full on retry'
+                self._dead_letter(notification)
+
+    def _dead_letter(self, notification: Notification):
+        """Move a notification to the dead-letter store"""
+        letter = dict(notification.to_dict(), failed_at=datetime.now().isoformat())
+
+        with self._condition:
+            self._metrics[notification.channel].dead_lettered += 1
+            self._dead_letters.append(letter)
+            self._finish()
+
+        if self.dead_letter_collection is not None:
+            try:
+                self.dead_letter_collection.insert_one(dict(letter))
+            except Exception as e:
+                print(f"❌ Error storing dead-lettered notification: {e}")
+
+    def _finish(self):
+        """Mark one notification as done; caller holds the lock"""
+        self._in_flight -= 1
+        if self._in_flight == 0:
+            self._condition.notify_all()
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing NotificationDispatcher...")
+
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    # Local webhook stand-in that fails every third request
+    received = []
+
+    class WebhookHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, so the sender's pool is reused
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            received.append(body)
+            status = 503 if len(received) % 3 == 0 else 200
+            self.send_response(status)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), WebhookHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/hook"
+
+    dispatcher = NotificationDispatcher(max_retries=3, backoff_base_seconds=0.01)
+    dispatcher.register_channel('webhook', WebhookSender(url), workers=4)
+
+    def always_down(payload):
+        raise ConnectionError("provider unavailable")
+    dispatcher.register_channel('sms', always_down, workers=1)
+
+    start = time.perf_counter()
+    for i in range(200):
+        dispatcher.submit('webhook', {'alert_id': f"ALERT_{i}", 'severity': 'CRITICAL'})
+    dispatcher.submit('sms', {'alert_id': 'ALERT_SMS'})
+    submit_ms = (time.perf_counter() - start) * 1000
+
+    dispatcher.flush(timeout=30)
+    stats = dispatcher.get_statistics()
+    webhook = stats['channels']['webhook']
+    print(f"✅ Submitted 201 notifications in {submit_ms:.1f} ms")
+    print(f"✅ Webhook: {webhook['delivered']} delivered, {webhook['retried']} retried, "
+          f"p95 latency {webhook['latency_ms']['p95']:.1f} ms")
+    print(f"✅ Dead letters: {[(d['channel'], d['attempts']) for d in dispatcher.get_dead_letters()]}")
+
+    dispatcher.stop()
+    server.shutdown()
+
+    # Stopping drains the queues and dead-letters retries still backing off
+    slow = NotificationDispatcher(max_retries=3, backoff_base_seconds=60)
+    drained = []
+    slow.register_channel('slack', lambda payload: (time.sleep(0.01), drained.append(payload)), workers=1)
+    slow.register_channel('sms', always_down, workers=1)
+    for i in range(20):
+        slow.submit('slack', {'alert_id': f"ALERT_{i}"})
+    slow.submit('sms', {'alert_id': 'ALERT_SMS'})
+    slow.stop(timeout=0.05)
+    letters = {}
+    for letter in slow.get_dead_letters():
+        letters[letter['last_error']] = letters.get(letter['last_error'], 0) + 1
+    print(f"✅ Stop delivered {len(drained)} queued notifications and dead-lettered {letters}")
+    print("✅ NotificationDispatcher tests passed!")
@@ -0,0 +1,201 @@
+"""
+RCA Cache Module
+Caches RCA results by a content fingerprint of the analyzed incident
+"""
+
+from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+import time
+
+
+def fingerprint_incident(correlated_events: List, rules_version: int = 0,
+                         extra: Optional[Any] = None) -> str:
+    """
+    Compute a stable fingerprint of a correlated anomaly set
+
+    The fingerprint ignores the order of events and anomalies, so the same
+    incident submitted by different callers maps to the same key. Only the
+    anomalies themselves are keyed: correlation scores and affected
+    components are derived from them (scores also from learned
+    co-occurrences, which move with every ingest) and would make every
+    re-analysis a miss.
+
+    Args:
+        correlated_events: List of CorrelatedEvent objects
+        rules_version: Version of the rule set the analysis runs against
+        extra: Optional additional JSON-serializable input (e.g. changes version)
+
+    Returns:
+        Hex digest string
+    """
+    events = sorted(
+        sorted(_anomaly_signature(a) for a in ce.anomalies) for ce in correlated_events
+    )
+
+    payload = json.dumps(
+        {'events': events, 'rules_version': rules_version, 'extra': extra},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _anomaly_signature(anomaly) -> str:
+    """Canonical string of the anomaly fields RCA reads"""
+    if isinstance(anomaly, dict):
+        fields = {
+            'id': anomaly.get('id'),
+            'type': anomaly.get('type'),
+            'severity': anomaly.get('severity'),
+            'metric': anomaly.get('metric'),
+            'value': anomaly.get('value'),
+            'description': anomaly.get('description'),
+            'timestamp': anomaly.get('timestamp')
+        }
+    else:
+        fields = {
+            'id': getattr(anomaly, 'id', None),
+            'type': getattr(anomaly, 'anomaly_type', None),
+            'severity': getattr(anomaly, 'severity', None),
+            'metric': getattr(anomaly, 'metric_name', None),
+            'value': getattr(anomaly, 'value', None),
+            'description': getattr(anomaly, 'description', None),
+            'timestamp': getattr(anomaly, 'timestamp', None)
+        }
+
+    return json.dumps(fields, sort_keys=True, default=str)
+
+
+class RCAResultCache:
+    """
+    RCAResultCache Class
+    Thread-safe LRU cache with per-entry time-to-live and hit/miss counters
+    """
+
+    def __init__(self, max_size: int = 256, ttl_seconds: float = 300):
+        """
+        Initialize RCAResultCache
+
+        Args:
+            max_size: Maximum number of cached results
+            ttl_seconds: Seconds after which a cached result expires
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value
+
+        Args:
+            key: Fingerprint key
+
+        Returns:
+            Cached value, or None on miss or expiry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+            value, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def put(self, key: str, value: Any):
+        """
+        Store a value, evicting the least recently used entry if full
+
+        Args:
+            key: Fingerprint key
+            value: Value to cache
+        """
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        """Drop all cached entries (counted as an invalidation)"""
+        with self._lock:
+            self._entries.clear()
+            self._stats['invalidations'] += 1
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with size, counters and hit rate
+        """
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                **self._stats,
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        """Return the number of cached entries"""
+        return len(self._entries)
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing RCAResultCache...")
+
+    from types import SimpleNamespace
+
+    event = SimpleNamespace(
+        anomalies=[{'id': 'a1', 'type': 'LOG_ERROR'}, {'id': 'a2', 'type': 'METRIC_ANOMALY'}],
+        correlation_score=0.8,
+        affected_components=['app-server', 'database']
+    )
+    reordered = SimpleNamespace(
+        anomalies=list(reversed(event.anomalies)),
+        correlation_score=0.8,
+        affected_components=['database', 'app-server']
+    )
+
+    key = fingerprint_incident([event], rules_version=1)
+    print(f"✅ Order-independent fingerprint: {key == fingerprint_incident([reordered], rules_version=1)}")
+    print(f"✅ Rule version changes key: {key != fingerprint_incident([event], rules_version=2)}")
+    rescored = SimpleNamespace(anomalies=event.anomalies, correlation_score=0.81,
+                               affected_components=event.affected_components)
+    print(f"✅ Drifting correlation score keeps key: {key == fingerprint_incident([rescored], rules_version=1)}")
+
+    cache = RCAResultCache(max_size=2, ttl_seconds=60)
+    cache.put(key, 'result')
+    cache.get(key)
+    cache.get('missing')
+    print(f"✅ Cache statistics: {cache.get_statistics()}")
+
+    print("✅ RCAResultCache tests passed!")
@@ -4,9 +4,41 @@ Identifies root causes of system failures by analyzing correlated events
 and applying predefined rules
 """
 
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional, Sequence
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
+from collections import OrderedDict
+import copy
+import threading
+import time
+import uuid
+
+try:
+    from .rule_index import RuleSet, IncidentState, extract_features
+    from .rca_cache import RCAResultCache, fingerprint_incident
+    from .root_cause_localizer import RootCauseLocalizer
+    from .rule_profiler import RuleProfiler
+    from .evidence import LazyEvidence, LazyList
+    from .causal_ordering import CausalOrdering, describe_causal_order, to_datetime
+    from .change_events import ChangeEventIndex
+    from .lag_analyzer import LagAnalyzer
+except ImportError:
+    from rule_index import RuleSet, IncidentState, extract_features
+    from rca_cache import RCAResultCache, fingerprint_incident
+    from root_cause_localizer import RootCauseLocalizer
+    from rule_profiler import RuleProfiler
+    from evidence import LazyEvidence, LazyList
+    from causal_ordering import CausalOrdering, describe_causal_order, to_datetime
+    from change_events import ChangeEventIndex
+    from lag_analyzer import LagAnalyzer
+
+
+# Root cause blamed on deploys and config changes, and how much a nearby
+# change adds to its confidence
+CHANGE_ROOT_CAUSE = 'DEPLOYMENT_CONFIGURATION_ERROR'
+CHANGE_CONFIDENCE_BOOST = 0.2
+# Confidence of a change-attributed cause when no deployment rule matched
+CHANGE_BASE_CONFIDENCE = 0.4
 
 
 @dataclass
@@ -30,14 +62,60 @@ class Rule:
 
 @dataclass
 class RCAResult:
-    """Root cause analysis result"""
+    """
+    Root cause analysis result
+    
+    causal_chain and evidence may be lazy sequences (LazyList, LazyEvidence)
+    that are only built when read; use evidence.top(k) for a severity-ranked
+    page instead of materializing every item.
+    """
     root_cause: str
     confidence: float
     affected_components: List[str]
-    causal_chain: List[str]
-    evidence: List[Dict]
+    causal_chain: Sequence[str]
+    evidence: Sequence[Dict]
     recommendations: List[str]
     timestamp: datetime
+    root_cause_candidates: List[Dict] = field(default_factory=list)
+    causal_order: Dict = field(default_factory=dict)
+    related_changes: List[Dict] = field(default_factory=list)
+
+
+def copy_result(result: RCAResult, **changes) -> RCAResult:
+    """
+    Copy an RCA result without sharing its mutable fields
+    
+    The lazy causal chain and evidence are read-only and stay shared.
+    
+    Args:
+        result: RCA result
+        **changes: Fields to replace in the copy
+    
+    Returns:
+        RCAResult that can be modified without affecting the original
+    """
+    return replace(
+        result,
+        affected_components=list(result.affected_components),
+        recommendations=list(result.recommendations),
+        root_cause_candidates=copy.deepcopy(result.root_cause_candidates),
+        causal_order=copy.deepcopy(result.causal_order),
+        related_changes=copy.deepcopy(result.related_changes),
+        **changes
+    )
+
+
+@dataclass
+class OpenIncident:
+    """Incident analyzed incrementally as new correlated events arrive"""
+    incident_id: str
+    state: IncidentState
+    events: List[CorrelatedEvent]
+    loose_anomalies: List
+    updated_at: datetime
+    ordering: Optional[CausalOrdering] = None
+    window_start: Optional[datetime] = None
+    window_end: Optional[datetime] = None
 
 
 class RCAEngine:
@@ -47,26 +125,110 @@ class RCAEngine:
     and applying predefined rules
     """
     
-    def __init__(self, rules: List[Rule]):
+    def __init__(self, rules: List[Rule], cache_size: int = 256,
+                 cache_ttl_seconds: float = 300, max_open_incidents: int = 1000,
+                 profile_rules: bool = True,
+                 component_resolver: Optional[Callable[[Any], Optional[str]]] = None,
+                 change_index: Optional[ChangeEventIndex] = None,
+                 change_lookback_minutes: float = 30,
+                 onset_resolution_seconds: float = 10):
         """
         Initialize RCA Engine
         
         Args:
             rules: List of Rule objects for root cause identification
+            cache_size: Maximum number of cached RCA results
+            cache_ttl_seconds: Seconds a cached RCA result stays valid
+            max_open_incidents: Maximum number of incrementally analyzed
+                incidents kept (least recently updated are dropped first)
+            profile_rules: Whether per-rule evaluation telemetry is recorded
+            component_resolver: Optional callable mapping an anomaly to its
+                component name; enables data-driven causal ordering from
+                first-onset times (e.g. EventCorrelator.extract_component)
+            change_index: Optional index of deploys, config pushes and
+                feature flags used to attribute incidents to recent changes
+            change_lookback_minutes: How long after a change ends it can
+                still be blamed for an incident
+            onset_resolution_seconds: Sampling resolution of anomaly times;
+                closer onsets are not treated as a propagation order
         """
         if not isinstance(rules, list):
             raise ValueError("Rules must be a list")
         
-        self.root_cause_rules = rules if rules else self._get_default_rules()
+        self._rule_set = RuleSet.compile(rules if rules else self._get_default_rules(), version=1)
+        self.result_cache = RCAResultCache(max_size=cache_size, ttl_seconds=cache_ttl_seconds)
+        self.localizer = RootCauseLocalizer()
+        self.profiler = RuleProfiler(enabled=profile_rules)
+        self.component_resolver = component_resolver
+        self.change_index = change_index
+        self.change_lookback = timedelta(minutes=change_lookback_minutes)
+        self.onset_resolution_seconds = onset_resolution_seconds
         self.correlated_events: List[CorrelatedEvent] = []
         self.analysis_history: List[RCAResult] = []
+        self.max_open_incidents = max_open_incidents
+        self._open_incidents: OrderedDict = OrderedDict()
+        self._incidents_lock = threading.Lock()
+    
+    @property
+    def root_cause_rules(self) -> List[Rule]:
+        """Rules of the active rule set"""
+        return list(self._rule_set.rules)
+    
+    @property
+    def rules_version(self) -> int:
+        """Version of the active rule set"""
+        return self._rule_set.version
+    
+    @property
+    def rule_set(self) -> RuleSet:
+        """Active compiled rule set"""
+        return self._rule_set
     
-    def analyze_root_cause(self, correlated_events: List[CorrelatedEvent]) -> RCAResult:
+    def set_rules(self, rules: List[Rule]):
+        """
+        Replace the rule set and recompile the rule index
+        
+        Args:
+            rules: List of Rule objects (empty list restores the defaults)
+        """
+        if not isinstance(rules, list):
+            raise ValueError("Rules must be a list")
+        
+        self.set_rule_set(RuleSet.compile(
+            rules if rules else self._get_default_rules(),
+            version=self.rules_version + 1
+        ))
+    
+    def set_rule_set(self, rule_set: RuleSet):
+        """
+        Atomically swap in a compiled rule set
+        
+        Analyses already running keep the rule set they started with.
+        
+        Args:
+            rule_set: Compiled RuleSet object
+        """
+        self._rule_set = rule_set
+        
+        # The version is part of every fingerprint, so stale results can
+        # never be served; clearing just frees the memory early
+        self.result_cache.clear()
+    
+    def analyze_root_cause(self, correlated_events: List[CorrelatedEvent],
+                           lead_lag: Optional[List[Dict]] = None,
+                           component_scores: Optional[Dict[str, float]] = None,
+                           dependency_graph: Optional[Dict[str, List[str]]] = None) -> RCAResult:
         """
         Analyze correlated events to identify root cause
         
         Args:
             correlated_events: List of CorrelatedEvent objects
+            lead_lag: Optional lead/lag relationships between metric series
+                (LagResult dictionaries) used to order the causal chain
+            component_scores: Optional anomaly score per component; when given,
+                affected components are ranked by graph-based localization
+            dependency_graph: Optional service dependency graph used for
+                graph-based localization
         
         Returns:
             RCAResult object with identified root cause
@@ -77,77 +239,346 @@ class RCAEngine:
                 confidence=0.0,
                 affected_components=[],
                 causal_chain=[],
-                evidence=[],
+                evidence=LazyEvidence([]),
                 recommendations=["No events to analyze"],
                 timestamp=datetime.now()
             )
         
         self.correlated_events = correlated_events
         
+        # Pin the rule set so a concurrent hot-swap cannot change it mid-analysis
+        rule_set = self._rule_set
+        
+        # Serve repeated analyses of the same incident from the cache. Scores
+        # and lead/lag data derived from the anomalies are left out of the key:
+        # they drift as new data arrives, and a cached result reflects them as
+        # of its analysis for at most the cache TTL
+        cache_key = fingerprint_incident(
+            correlated_events, rule_set.version,
+            {'rules_source': rule_set.source, 'dependency_graph': dependency_graph,
+             'changes_version': self.change_index.version if self.change_index else None}
+        )
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            # Callers may modify the result; the cached one must stay intact
+            result = copy_result(cached, timestamp=datetime.now())
+            self.analysis_history.append(result)
+            return result
+        
         # Extract all anomalies from correlated events
         all_anomalies = []
         for ce in correlated_events:
             all_anomalies.extend(ce.anomalies)
         
-        # Find matching rules
+        # Find matching rules with a single pass over the incident
+        profiling = self.profiler.enabled
+        match_start = time.perf_counter()
+        features = extract_features(all_anomalies)
+        evaluated = [] if profiling else None
+        matched_rules = rule_set.index.match(features, evaluated)
+        index_seconds = time.perf_counter() - match_start
         possible_causes = []
         
-        for rule in self.root_cause_rules:
-            if self.apply_rule(rule, correlated_events):
-                confidence = self._calculate_confidence(rule, correlated_events)
-                possible_causes.append({
-                    'cause': rule.root_cause,
-                    'confidence': confidence,
-                    'rule_id': rule.rule_id,
-                    'description': rule.description
-                })
+        for rule in matched_rules:
+            confidence = self._calculate_confidence(rule, correlated_events)
+            possible_causes.append({
+                'cause': rule.root_cause,
+                'confidence': confidence,
+                'rule_id': rule.rule_id,
+                'description': rule.description
+            })
+        
+        # Get affected components (unique, in first-seen order)
+        affected_components = list(dict.fromkeys(
+            component
+            for ce in correlated_events
+            for component in ce.affected_components
+        ))
+        
+        # Blame recent deploys and config changes of the affected services
+        window_start, window_end = None, None
+        for anomaly in all_anomalies:
+            window_start, window_end = self._extend_window(window_start, window_end, anomaly)
+        related_changes = self._attribute_changes(
+            possible_causes, affected_components, window_start, window_end
+        )
         
         # Rank causes by confidence
+        best_cause = None
         if possible_causes:
             ranked_causes = sorted(possible_causes, key=lambda x: x['confidence'], reverse=True)
             best_cause = ranked_causes[0]
+        
+        if profiling:
+            matched_ids = {rule.rule_id for rule in matched_rules}
+            self.profiler.record_analysis(
+                [(rule.rule_id, rule.rule_id in matched_ids) for rule in evaluated],
+                [(cause['rule_id'], cause['confidence']) for cause in possible_causes],
+                top_rule_id=best_cause['rule_id'] if best_cause else None,
+                match_seconds=index_seconds,
+                scoring_seconds=time.perf_counter() - match_start - index_seconds,
+                # The anomaly set, whatever the rule set
+                incident_key=fingerprint_incident(correlated_events)
+            )
+        
+        causal_order = None
+        if self.component_resolver is not None:
+            ordering = CausalOrdering(dependency_graph or {})
+            self._observe_onsets(ordering, all_anomalies)
+            causal_order = ordering.to_dict()
+        
+        result = self._build_result(
+            best_cause, all_anomalies, affected_components,
+            LazyEvidence(all_anomalies), lead_lag, causal_order
+        )
+        result.related_changes = related_changes
+        
+        # Rank candidate root-cause components over the dependency graph
+        if component_scores is not None:
+            result.root_cause_candidates = self.localize_root_cause(
+                component_scores, dependency_graph or {}
+            )
+            result.affected_components = [c['component'] for c in result.root_cause_candidates]
+        
+        # Store in history and cache
+        self.analysis_history.append(result)
+        self.result_cache.put(cache_key, copy_result(result))
+        
+        return result
+    
+    def open_incident(self, incident_id: Optional[str] = None,
+                      dependency_graph: Optional[Dict[str, List[str]]] = None) -> str:
+        """
+        Start an incrementally analyzed incident
+        
+        Args:
+            incident_id: Optional ID (a random one is generated if omitted)
+            dependency_graph: Optional service dependency graph used to
+                orient the incident's causal ordering
+        
+        Returns:
+            Incident ID
+        """
+        incident_id = incident_id or uuid.uuid4().hex
+        
+        with self._incidents_lock:
+            self._open_incidents[incident_id] = OpenIncident(
+                incident_id=incident_id,
+                state=IncidentState(self._rule_set),
+                events=[],
+                loose_anomalies=[],
+                updated_at=datetime.now(),
+                ordering=CausalOrdering(dependency_graph or {})
+                if self.component_resolver is not None else None
+            )
+            while len(self._open_incidents) > self.max_open_incidents:
+                self._open_incidents.popitem(last=False)
+        
+        return incident_id
+    
+    def update_incident(self, incident_id: str, correlated_events: List[CorrelatedEvent],
+                        anomalies: Optional[List] = None,
+                        lead_lag: Optional[List[Dict]] = None) -> RCAResult:
+        """
+        Add new correlated events to an open incident and re-analyze it
+        
+        Only the rules indexed under the new anomalies' types, metrics and
+        keywords are rescored, so the cost depends on the size of the update
+        rather than on the size of the incident.
+        
+        Args:
+            incident_id: ID returned by open_incident()
+            correlated_events: Newly correlated events of the incident
+            anomalies: Optional new anomalies that belong to the incident but
+                were not grouped into an event; they count towards rule
+                matches and evidence but not towards the correlation score
+            lead_lag: Optional lead/lag relationships used to order the
+                causal chain
+        
+        Returns:
+            RCAResult object for the incident so far
+        
+        Raises:
+            KeyError: If the incident is unknown or was dropped
+        """
+        with self._incidents_lock:
+            incident = self._open_incidents[incident_id]
+            self._open_incidents.move_to_end(incident_id)
             
-            # Generate causal chain
-            causal_chain = self.generate_causal_chain(best_cause['cause'], all_anomalies)
+            # A hot-swapped rule set invalidates the partial matches; replay once
+            if incident.state.rule_set is not self._rule_set:
+                incident.state = IncidentState(self._rule_set)
+                for ce in incident.events:
+                    incident.state.add_event(ce)
+                for anomaly in incident.loose_anomalies:
+                    incident.state.add_anomaly(anomaly)
             
-            # Collect evidence
-            evidence = self._collect_evidence(all_anomalies)
+            match_start = time.perf_counter()
+            affected = set()
+            for ce in correlated_events:
+                affected |= incident.state.add_event(ce)
+                incident.events.append(ce)
             
-            # Get affected components
-            affected_components = list(set([
-                ce.affected_components for ce in correlated_events
-            ]))
-            affected_components = [item for sublist in affected_components for item in sublist]
+            for anomaly in anomalies or []:
+                affected |= incident.state.add_anomaly(anomaly)
+                incident.loose_anomalies.append(anomaly)
+            match_seconds = time.perf_counter() - match_start
             
-            # Generate recommendations
-            recommendations = self._generate_recommendations(best_cause['cause'])
+            new_anomalies = [a for ce in correlated_events for a in ce.anomalies] + list(anomalies or [])
+            for anomaly in new_anomalies:
+                incident.window_start, incident.window_end = self._extend_window(
+                    incident.window_start, incident.window_end, anomaly
+                )
+            if incident.ordering is not None:
+                self._observe_onsets(incident.ordering, new_anomalies)
+            incident.updated_at = datetime.now()
             
-            result = RCAResult(
-                root_cause=best_cause['cause'],
-                confidence=best_cause['confidence'],
-                affected_components=affected_components,
-                causal_chain=causal_chain,
-                evidence=evidence,
-                recommendations=recommendations,
-                timestamp=datetime.now()
+            state = incident.state
+            if not state.anomalies:
+                return RCAResult(
+                    root_cause="UNKNOWN",
+                    confidence=0.0,
+                    affected_components=[],
+                    causal_chain=[],
+                    evidence=LazyEvidence([]),
+                    recommendations=["No events to analyze"],
+                    timestamp=datetime.now()
+                )
+            
+            # Score only the currently matched rules; their number does not
+            # grow with the incident
+            avg_correlation = state.average_correlation()
+            possible_causes = [
+                {
+                    'cause': rule.root_cause,
+                    'confidence': self._adjust_confidence(rule.confidence, avg_correlation),
+                    'rule_id': rule.rule_id,
+                    'description': rule.description
+                }
+                for rule in state.matched_rules()
+            ]
+            related_changes = self._attribute_changes(
+                possible_causes, list(state.components), incident.window_start, incident.window_end
             )
-        else:
-            # No matching rule found
-            result = RCAResult(
-                root_cause="UNKNOWN",
-                confidence=0.5,
-                affected_components=[],
-                causal_chain=["Multiple anomalies detected", "No specific pattern matched"],
-                evidence=self._collect_evidence(all_anomalies),
-                recommendations=["Review system logs", "Check system metrics", "Investigate recent changes"],
-                timestamp=datetime.now()
+            
+            best_cause = None
+            if possible_causes:
+                best_cause = sorted(possible_causes, key=lambda x: x['confidence'], reverse=True)[0]
+            
+            if self.profiler.enabled:
+                rules = state.rule_set.rules
+                self.profiler.record_analysis(
+                    [(rules[p].rule_id, state.is_matched(p)) for p in affected],
+                    [(cause['rule_id'], cause['confidence']) for cause in possible_causes],
+                    top_rule_id=best_cause['rule_id'] if best_cause else None,
+                    match_seconds=match_seconds,
+                    incident_key=incident_id
+                )
+            
+            # The anomaly list is append-only, so a fixed-length view is a stable snapshot
+            result = self._build_result(
+                best_cause, state.anomalies, list(state.components),
+                LazyEvidence(state.anomalies, len(state.anomalies)), lead_lag,
+                incident.ordering.to_dict() if incident.ordering is not None else None
             )
+            result.related_changes = related_changes
         
-        # Store in history
-        self.analysis_history.append(result)
-        
+        # Intermediate snapshots of a growing incident are not kept in the history
         return result
     
+    def close_incident(self, incident_id: str) -> bool:
+        """
+        Drop the state of an incrementally analyzed incident
+        
+        Args:
+            incident_id: Incident ID
+        
+        Returns:
+            True if the incident was open, False otherwise
+        """
+        with self._incidents_lock:
+            return self._open_incidents.pop(incident_id, None) is not None
+    
+    def get_incident_state(self, incident_id: str) -> Optional[Dict]:
+        """
+        Get a summary of an open incident's feature state
+        
+        Args:
+            incident_id: Incident ID
+        
+        Returns:
+            Dictionary with counts and matched rules, or None if unknown
+        """
+        with self._incidents_lock:
+            incident = self._open_incidents.get(incident_id)
+            if incident is None:
+                return None
+            
+            state = incident.state
+            return {
+                'incident_id': incident_id,
+                'anomaly_count': len(state),
+                'event_count': state.event_count,
+                'type_counts': dict(state.type_counts),
+                'metric_counts': dict(state.metric_counts),
+                'keyword_hits': dict(state.keyword_counts),
+                'matched_rules': [rule.rule_id for rule in state.matched_rules()],
+                'rules_version': state.rule_set.version,
+                'updated_at': incident.updated_at.isoformat()
+            }
+    
+    def get_rule_statistics(self) -> Dict:
+        """
+        Get per-rule evaluation telemetry
+        
+        Returns:
+            Dictionary with profiler counters and the active rule-set version
+        """
+        return {
+            **self.profiler.get_statistics(),
+            'rules_version': self.rules_version
+        }
+    
+    def get_cache_statistics(self) -> Dict:
+        """
+        Get RCA result cache statistics
+        
+        Returns:
+            Dictionary with cache size, hit/miss counters and rule-set version
+        """
+        return {
+            **self.result_cache.get_statistics(),
+            'rules_version': self.rules_version
+        }
+    
+    def localize_root_cause(self, component_scores: Dict[str, float],
+                            dependency_graph: Dict[str, List[str]],
+                            limit: int = 10) -> List[Dict]:
+        """
+        Rank candidate root-cause components with personalized PageRank
+        
+        Args:
+            component_scores: Anomaly score per component
+            dependency_graph: Dictionary mapping component to its dependencies
+            limit: Maximum number of candidates to return
+        
+        Returns:
+            List of candidate dictionaries with component and score, best first
+        """
+        ranking = self.localizer.rank(dependency_graph, component_scores)
+        if not ranking:
+            return []
+        
+        # Keep anomalous components and healthy ones that rank above uniform
+        uniform = 1.0 / len(ranking)
+        candidates = [
+            {'component': component, 'score': round(score, 6)}
+            for component, score in ranking
+            if component_scores.get(component, 0) > 0 or score > uniform
+        ]
+        
+        return candidates[:limit]
+    
     def apply_rule(self, rule: Rule, correlated_events: List[CorrelatedEvent]) -> bool:
         """
         Check if a rule applies to the correlated events
@@ -159,65 +590,28 @@ class RCAEngine:
         Returns:
             True if rule matches, False otherwise
         """
-        pattern = rule.pattern
-        
         # Extract all anomalies
         all_anomalies = []
         for ce in correlated_events:
             all_anomalies.extend(ce.anomalies)
         
-        # Check pattern requirements
-        required_types = pattern.get('anomaly_types', [])
-        required_metrics = pattern.get('metrics', [])
-        required_keywords = pattern.get('keywords', [])
-        
-        # Check if required anomaly types are present
-        if required_types:
-            present_types = set()
-            for anomaly in all_anomalies:
-                if isinstance(anomaly, dict):
-                    present_types.add(anomaly.get('type', ''))
-                else:
-                    present_types.add(getattr(anomaly, 'anomaly_type', ''))
-            
-            if not all(rt in present_types for rt in required_types):
-                return False
-        
-        # Check if required metrics are present
-        if required_metrics:
-            present_metrics = set()
-            for anomaly in all_anomalies:
-                if isinstance(anomaly, dict):
-                    present_metrics.add(anomaly.get('metric', ''))
-                else:
-                    present_metrics.add(getattr(anomaly, 'metric_name', ''))
-            
-            if not all(rm in present_metrics for rm in required_metrics):
-                return False
-        
-        # Check for required keywords in descriptions
-        if required_keywords:
-            all_descriptions = []
-            for anomaly in all_anomalies:
-                if isinstance(anomaly, dict):
-                    all_descriptions.append(anomaly.get('description', '').lower())
-                else:
-                    all_descriptions.append(getattr(anomaly, 'description', '').lower())
-            
-            combined_text = ' '.join(all_descriptions)
-            
-            if not any(keyword.lower() in combined_text for keyword in required_keywords):
-                return False
-        
-        return True
+        return self._rule_set.index.rule_matches(rule, extract_features(all_anomalies))
     
-    def generate_causal_chain(self, root_cause: str, anomalies: List) -> List[str]:
+    def generate_causal_chain(self, root_cause: str, anomalies: List,
+                              lead_lag: Optional[List[Dict]] = None,
+                              causal_order: Optional[Dict] = None) -> List[str]:
         """
         Generate causal chain explaining how root cause led to anomalies
         
         Args:
             root_cause: Identified root cause
             anomalies: List of Anomaly objects
+            lead_lag: Optional lead/lag relationships between metric series;
+                when given, the observed propagation order is added to the chain
+            causal_order: Optional CausalOrdering snapshot; when dependency
+                edges show how the incident propagated, they replace the
+                generic story after its opening step, otherwise the observed
+                first onset is appended
         
         Returns:
             List of causal steps
@@ -255,11 +649,191 @@ class RCAEngine:
             ]
         }
         
-        return chains.get(root_cause, [
+        chain = chains.get(root_cause, [
             f"Root cause: {root_cause}",
             "Multiple anomalies detected",
             "System instability"
         ])
+        
+        causal_order = causal_order or {}
+        resolution = self.onset_resolution_seconds
+        observed = describe_causal_order(causal_order, resolution_seconds=resolution)
+        if any(edge['lag_seconds'] >= resolution for edge in causal_order.get('edges', [])):
+            chain = chain[:1] + observed
+        else:
+            chain = chain + observed
+        
+        if lead_lag:
+            chain = chain + self._describe_lead_lag(lead_lag)
+        
+        return chain
+    
+    def _attribute_changes(self, possible_causes: List[Dict], components: List[str],
+                           window_start: Optional[datetime],
+                           window_end: Optional[datetime]) -> List[Dict]:
+        """
+        Boost deployment causes when a change overlapped or preceded the incident
+        
+        A change overlapping the incident window counts fully; one that ended
+        earlier counts less the longer ago it ended, down to nothing after the
+        lookback. If no deployment rule matched, a change-attribution cause
+        is added instead. possible_causes is updated in place.
+        
+        Args:
+            possible_causes: Cause dictionaries of the matched rules
+            components: Affected components (matched against change services)
+            window_start: First anomaly time of the incident
+            window_end: Last anomaly time of the incident
+        
+        Returns:
+            List of related change dictionaries with their proximity, nearest first
+        """
+        if self.change_index is None or window_start is None:
+            return []
+        
+        changes = self.change_index.query(
+            components or None, window_start, window_end, self.change_lookback
+        )
+        if not changes:
+            return []
+        
+        lookback_seconds = self.change_lookback.total_seconds() or 1.0
+        related = []
+        for change in changes:
+            if change.end is None or change.end >= window_start:
+                proximity = 1.0
+            else:
+                gap = (window_start - change.end).total_seconds()
+                proximity = max(0.0, 1.0 - gap / lookback_seconds)
+            related.append({**change.to_dict(), 'proximity': round(proximity, 3)})
+        related.sort(key=lambda c: c['proximity'], reverse=True)
+        
+        boost = CHANGE_CONFIDENCE_BOOST * related[0]['proximity']
+        deployment_causes = [c for c in possible_causes if c['cause'] == CHANGE_ROOT_CAUSE]
+        
+        for cause in deployment_causes:
+            cause['confidence'] = min(cause['confidence'] + boost, 1.0)
+        
+        if not deployment_causes:
+            nearest = related[0]
+            possible_causes.append({
+                'cause': CHANGE_ROOT_CAUSE,
+                'confidence': CHANGE_BASE_CONFIDENCE + boost,
+                'rule_id': 'CHANGE_ATTRIBUTION',
+                'description': f"{nearest['change_type']} of {nearest['service']} "
+                               f"at {nearest['start']} near the incident"
+            })
+        
+        return related
+    
+    def _extend_window(self, window_start: Optional[datetime], window_end: Optional[datetime],
+                       anomaly) -> tuple:
+        """Widen an incident time window to include an anomaly's timestamp"""
+        timestamp = self._anomaly_time(anomaly)
+        if timestamp is None:
+            return window_start, window_end
+        if window_start is None or timestamp < window_start:
+            window_start = timestamp
+        if window_end is None or timestamp > window_end:
+            window_end = timestamp
+        return window_start, window_end
+    
+    def _anomaly_time(self, anomaly) -> Optional[datetime]:
+        """Timestamp of an anomaly object or dictionary"""
+        if isinstance(anomaly, dict):
+            return to_datetime(anomaly.get('timestamp'))
+        return to_datetime(getattr(anomaly, 'timestamp', None))
+    
+    def _observe_onsets(self, ordering: CausalOrdering, anomalies: List):
+        """
+        Feed anomaly onset times into a causal ordering
+        
+        Args:
+            ordering: CausalOrdering to update
+            anomalies: Anomaly objects or dictionaries
+        """
+        for anomaly in anomalies:
+            component = self.component_resolver(anomaly)
+            timestamp = self._anomaly_time(anomaly)
+            if component and timestamp is not None:
+                ordering.observe(component, timestamp)
+    
+    def _describe_lead_lag(self, lead_lag: List[Dict]) -> List[str]:
+        """
+        Describe observed metric lead/lag relationships as causal steps
+        
+        Args:
+            lead_lag: Lead/lag dictionaries with leader, follower,
+                lag_seconds and correlation
+        
+        Returns:
+            List of causal steps, earliest leader first
+        """
+        order = LagAnalyzer.lead_lag_order(lead_lag)
+        if not order:
+            return []
+        
+        steps = [f"Observed propagation order: {' -> '.join(order)}"]
+        
+        rank = {name: i for i, name in enumerate(order)}
+        edges = sorted(
+            (item for item in lead_lag if item.get('lag_seconds', 0) > 0),
+            key=lambda item: (rank[item['leader']], rank[item['follower']])
+        )
+        for item in edges:
+            steps.append(
+                f"{item['leader']} changed {item['lag_seconds']:.0f}s before "
+                f"{item['follower']} (r={item.get('correlation', 0.0):.2f})"
+            )
+        
+        return steps
+    
+    def _build_result(self, best_cause: Optional[Dict], anomalies: List,
+                      affected_components: List[str], evidence: Sequence[Dict],
+                      lead_lag: Optional[List[Dict]],
+                      causal_order: Optional[Dict] = None) -> RCAResult:
+        """
+        Assemble an RCAResult from the best matching cause
+        
+        The causal chain is built on first access.
+        
+        Args:
+            best_cause: Best cause dictionary, or None if no rule matched
+            anomalies: All anomalies of the incident
+            affected_components: Affected components in first-seen order
+            evidence: Evidence sequence (usually LazyEvidence)
+            lead_lag: Optional lead/lag relationships
+            causal_order: Optional CausalOrdering snapshot (to_dict())
+        
+        Returns:
+            RCAResult object
+        """
+        if best_cause is None:
+            # No matching rule found
+            return RCAResult(
+                root_cause="UNKNOWN",
+                confidence=0.5,
+                affected_components=[],
+                causal_chain=LazyList(lambda: ["Multiple anomalies detected", "No specific pattern matched"]
+                                      + self._describe_lead_lag(lead_lag or [])),
+                evidence=evidence,
+                recommendations=["Review system logs", "Check system metrics", "Investigate recent changes"],
+                timestamp=datetime.now(),
+                causal_order=causal_order or {}
+            )
+        
+        return RCAResult(
+            root_cause=best_cause['cause'],
+            confidence=best_cause['confidence'],
+            affected_components=affected_components,
+            causal_chain=LazyList(
+                lambda: self.generate_causal_chain(best_cause['cause'], anomalies, lead_lag, causal_order)
+            ),
+            evidence=evidence,
+            recommendations=self._generate_recommendations(best_cause['cause']),
+            timestamp=datetime.now(),
+            causal_order=causal_order or {}
+        )
     
     def _calculate_confidence(self, rule: Rule, correlated_events: List[CorrelatedEvent]) -> float:
         """
@@ -272,45 +846,26 @@ class RCAEngine:
         Returns:
             Confidence score between 0 and 1
         """
-        base_confidence = rule.confidence
-        
         # Adjust confidence based on correlation scores
         avg_correlation = sum(ce.correlation_score for ce in correlated_events) / len(correlated_events)
         
-        # Higher correlation increases confidence
-        adjusted_confidence = (base_confidence + avg_correlation) / 2
-        
-        return min(adjusted_confidence, 1.0)
+        return self._adjust_confidence(rule.confidence, avg_correlation)
     
-    def _collect_evidence(self, anomalies: List) -> List[Dict]:
+    def _adjust_confidence(self, base_confidence: float, avg_correlation: float) -> float:
         """
-        Collect evidence from anomalies
+        Blend a rule's base confidence with the incident's average correlation
         
         Args:
-            anomalies: List of anomaly objects
+            base_confidence: Confidence of the matched rule
+            avg_correlation: Mean correlation score of the correlated events
         
         Returns:
-            List of evidence dictionaries
+            Confidence score between 0 and 1
         """
-        evidence = []
-        
-        for anomaly in anomalies:
-            if isinstance(anomaly, dict):
-                evidence.append({
-                    'type': anomaly.get('type', 'UNKNOWN'),
-                    'severity': anomaly.get('severity', 'UNKNOWN'),
-                    'description': anomaly.get('description', ''),
-                    'timestamp': anomaly.get('timestamp', '')
-                })
-            else:
-                evidence.append({
-                    'type': getattr(anomaly, 'anomaly_type', 'UNKNOWN'),
-                    'severity': getattr(anomaly, 'severity', 'UNKNOWN'),
-                    'description': getattr(anomaly, 'description', ''),
-                    'timestamp': getattr(anomaly, 'timestamp', datetime.now()).isoformat()
-                })
+        # Higher correlation increases confidence
+        adjusted_confidence = (base_confidence + avg_correlation) / 2
         
-        return evidence
+        return min(adjusted_confidence, 1.0)
     
     def _generate_recommendations(self, root_cause: str) -> List[str]:
         """
@@ -463,4 +1018,22 @@ if __name__ == "__main__":
     print(f"✅ Root Cause: {result.root_cause}")
     print(f"✅ Confidence: {result.confidence}")
     print(f"✅ Recommendations: {len(result.recommendations)}")
+    
+    # A cache hit must not share mutable fields with earlier results
+    result.recommendations.append("modified by caller")
+    repeat = engine.analyze_root_cause([correlated_event])
+    print(f"✅ Cached result unaffected by caller changes: {'modified by caller' not in repeat.recommendations}")
+    
+    # Incremental analysis of a growing incident
+    incident_id = engine.open_incident()
+    engine.update_incident(incident_id, [CorrelatedEvent(
+        anomalies=test_anomalies[:1], correlation_score=0.9,
+        time_window="5_minutes", affected_components=["app-server"]
+    )])
+    result = engine.update_incident(incident_id, [CorrelatedEvent(
+        anomalies=test_anomalies[1:], correlation_score=0.9,
+        time_window="5_minutes", affected_components=["config-service"]
+    )])
+    print(f"✅ Incremental Root Cause: {result.root_cause} ({result.confidence})")
+    print(f"✅ Top evidence: {[e['severity'] for e in result.evidence.top(1)]} of {len(result.evidence)}")
     print("✅ RCAEngine tests passed!")
@@ -6,6 +6,13 @@ Generates actionable fix recommendations based on root cause analysis
 from typing import List, Dict, Optional
 from datetime import datetime
 
+try:
+    from .fix_store import Fix, FixStore
+    from .action_ranker import ActionRanker
+except ImportError:
+    from fix_store import Fix, FixStore
+    from action_ranker import ActionRanker
+
 
 class Recommendation:
     """Represents a recommendation"""
@@ -26,31 +33,33 @@ class Recommendation:
         }
 
 
-class Fix:
-    """Historical fix record"""
-    def __init__(self, root_cause: str, action_taken: str, 
-                 success: bool, timestamp: datetime):
-        self.root_cause = root_cause
-        self.action_taken = action_taken
-        self.success = success
-        self.timestamp = timestamp
-
-
 class RecommendationEngine:
     """
     RecommendationEngine Class
     Generates actionable recommendations based on root cause analysis
     """
     
-    def __init__(self, recommendation_rules: Dict[str, List[Dict]]):
+    def __init__(self, recommendation_rules: Dict[str, List[Dict]],
+                 fix_store: Optional[FixStore] = None,
+                 ranker: Optional[ActionRanker] = None):
         """
         Initialize RecommendationEngine
         
         Args:
             recommendation_rules: Dictionary mapping root causes to recommendations
+            fix_store: Store of historical fixes (default: in memory only)
+            ranker: Success-rate ranker fed by the fix store (default: Beta
+                posterior mean without exploration)
         """
         self.recommendation_rules = recommendation_rules if recommendation_rules else self._get_default_rules()
-        self.historical_fixes: List[Fix] = []
+        self.fix_store = fix_store if fix_store is not None else FixStore()
+        self.ranker = ranker if ranker is not None else ActionRanker()
+        
+        # Every recorded or loaded fix updates the success statistics once
+        self.fix_store.subscribe(
+            lambda fix: self.ranker.record(fix.root_cause, fix.action_taken,
+                                           fix.success, fix.resolve_seconds)
+        )
     
     def generate_recommendations(self, rca_result) -> List[Dict]:
         """
@@ -78,10 +87,12 @@ class RecommendationEngine:
                     rec['priority'] = 'MEDIUM'
         
         # Add historical fixes
-        historical = self.get_historical_fixes(root_cause)
+        historical = self.get_historical_fixes(root_cause, limit=3)
         if historical:
-            for fix in historical[:3]:  # Top 3 historical fixes
-                if fix.success:
+            known_actions = {rec['action'] for rec in recommendations}
+            for fix in historical:  # Top 3 historical fixes
+                if fix.success and fix.action_taken not in known_actions:
+                    known_actions.add(fix.action_taken)
                     recommendations.append({
                         'action': fix.action_taken,
                         'priority': 'MEDIUM',
@@ -90,18 +101,26 @@ class RecommendationEngine:
                     })
         
         # Prioritize recommendations
-        return self.prioritize_recommendations(recommendations)
+        return self.prioritize_recommendations(recommendations, root_cause)
     
-    def prioritize_recommendations(self, recommendations: List[Dict]) -> List[Dict]:
+    def prioritize_recommendations(self, recommendations: List[Dict],
+                                   root_cause: Optional[str] = None) -> List[Dict]:
         """
         Prioritize recommendations by impact and effort
         
+        With a root cause, recommendations are ranked by the smoothed
+        success rate of their action for that cause (priority breaks ties).
+        
         Args:
             recommendations: List of recommendation dictionaries
+            root_cause: Root cause the recommendations address
         
         Returns:
             Sorted list of recommendations
         """
+        if root_cause is not None:
+            return self.ranker.rank(root_cause, recommendations)
+        
         priority_order = {'HIGH': 0, 'MEDIUM': 1, 'LOW': 2}
         
         sorted_recs = sorted(
@@ -111,25 +130,23 @@ class RecommendationEngine:
         
         return sorted_recs
     
-    def get_historical_fixes(self, root_cause: str) -> List[Fix]:
+    @property
+    def historical_fixes(self) -> List[Fix]:
+        """All historical fixes kept in memory"""
+        return list(self.fix_store)
+    
+    def get_historical_fixes(self, root_cause: str, limit: Optional[int] = None) -> List[Fix]:
         """
         Get historical fixes for a root cause
         
         Args:
             root_cause: Root cause identifier
+            limit: Maximum number of fixes (default: all kept in memory)
         
         Returns:
-            List of Fix objects
+            List of Fix objects (most recent first)
         """
-        matching_fixes = [
-            fix for fix in self.historical_fixes
-            if fix.root_cause == root_cause
-        ]
-        
-        # Sort by timestamp (most recent first)
-        matching_fixes.sort(key=lambda x: x.timestamp, reverse=True)
-        
-        return matching_fixes
+        return self.fix_store.recent(root_cause, limit)
     
     def add_new_rule(self, root_cause: str, recommendation: Dict):
         """
@@ -144,7 +161,9 @@ class RecommendationEngine:
         
         self.recommendation_rules[root_cause].append(recommendation)
     
-    def record_fix(self, root_cause: str, action_taken: str, success: bool):
+    def record_fix(self, root_cause: str, action_taken: str, success: bool,
+                   resolve_seconds: Optional[float] = None,
+                   report_id: Optional[str] = None) -> Fix:
         """
         Record a fix attempt
         
@@ -152,15 +171,22 @@ class RecommendationEngine:
             root_cause: Root cause that was addressed
             action_taken: Action that was taken
             success: Whether the fix was successful
+            resolve_seconds: Time it took to resolve the issue, if known
+            report_id: RCA report of the incident that was fixed, if known
+        
+        Returns:
+            The recorded Fix
         """
         fix = Fix(
             root_cause=root_cause,
             action_taken=action_taken,
             success=success,
-            timestamp=datetime.now()
+            timestamp=datetime.now(),
+            resolve_seconds=resolve_seconds,
+            report_id=report_id
         )
         
-        self.historical_fixes.append(fix)
+        return self.fix_store.record(fix)
     
     def _match_cause_to_action(self, root_cause: str) -> List[Dict]:
         """
@@ -367,4 +393,11 @@ if __name__ == "__main__":
     historical = engine.get_historical_fixes("DEPLOYMENT_CONFIGURATION_ERROR")
     print(f"✅ Historical fixes: {len(historical)}")
     
+    # Failed attempts push an action down the ranking
+    for _ in range(3):
+        engine.record_fix("DEPLOYMENT_CONFIGURATION_ERROR", "Review deployment configuration files", False)
+    recommendations = engine.generate_recommendations(rca_result)
+    print(f"✅ Top recommendation after failures: {recommendations[0]['action']} "
+          f"({recommendations[0]['success_rate']:.2f})")
+    
     print("✅ RecommendationEngine tests passed!")
@@ -0,0 +1,189 @@
+"""
+Root Cause Localizer Module
+Ranks candidate root-cause components with a personalized PageRank random
+walk over the anomaly propagation graph
+"""
+
+from typing import List, Dict, Tuple
+import numpy as np
+
+
+class RootCauseLocalizer:
+    """
+    RootCauseLocalizer Class
+    Builds a weighted propagation graph from the service dependency graph and
+    per-component anomaly scores, then runs personalized PageRank with sparse
+    power iteration. Faults propagate from a dependency to its dependents, so
+    the walker moves the opposite way, from symptoms towards their causes, and
+    prefers strongly anomalous targets.
+    """
+
+    def __init__(self, damping: float = 0.85, backward_weight: float = 0.2,
+                 baseline_weight: float = 0.01, tolerance: float = 1e-6,
+                 max_iterations: int = 100):
+        """
+        Initialize RootCauseLocalizer
+
+        Args:
+            damping: Probability of following an edge instead of restarting
+            backward_weight: Relative weight of edges from a dependency back to
+                its dependents, which lets the walker leave healthy dead ends
+            baseline_weight: Edge weight floor so healthy nodes stay reachable
+            tolerance: L1 convergence threshold of the power iteration
+            max_iterations: Maximum number of power iterations
+        """
+        if not 0 < damping < 1:
+            raise ValueError("damping must be between 0 and 1")
+
+        self.damping = damping
+        self.backward_weight = backward_weight
+        self.baseline_weight = baseline_weight
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.last_iterations = 0
+
+    def rank(self, dependency_graph: Dict[str, List[str]],
+             anomaly_scores: Dict[str, float]) -> List[Tuple[str, float]]:
+        """
+        Rank components by their likelihood of being the root cause
+
+        Args:
+            dependency_graph: Dictionary mapping component to its dependencies
+            anomaly_scores: Dictionary mapping component to anomaly score
+
+        Returns:
+            List of (component, score) tuples, most likely root cause first
+        """
+        nodes = set(dependency_graph) | set(anomaly_scores)
+        for dependencies in dependency_graph.values():
+            nodes.update(dependencies)
+        if not nodes:
+            return []
+
+        names = sorted(nodes)
+        index = {name: i for i, name in enumerate(names)}
+        n = len(names)
+
+        anomaly = np.zeros(n)
+        for name, score in anomaly_scores.items():
+            anomaly[index[name]] = max(score, 0.0)
+
+        src, dst, weights = self._build_edges(dependency_graph, index, anomaly)
+        scores = self._personalized_pagerank(n, src, dst, weights, anomaly)
+
+        order = np.argsort(-scores, kind='stable')
+        return [(names[i], float(scores[i])) for i in order]
+
+    def _build_edges(self, dependency_graph: Dict[str, List[str]],
+                     index: Dict[str, int], anomaly: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build the weighted propagation edges in coordinate form
+
+        Args:
+            dependency_graph: Dictionary mapping component to its dependencies
+            index: Component name to node index
+            anomaly: Anomaly score per node
+
+        Returns:
+            Tuple of (source indices, target indices, edge weights)
+        """
+        src, dst = [], []
+        for component, dependencies in dependency_graph.items():
+            for dependency in dependencies:
+                if dependency != component:
+                    src.append(index[component])
+                    dst.append(index[dependency])
+
+        if not src:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0)
+
+        forward_src = np.array(src, dtype=np.int64)
+        forward_dst = np.array(dst, dtype=np.int64)
+
+        # Dependent -> dependency, weighted by how anomalous the dependency is
+        forward_weight = anomaly[forward_dst] + self.baseline_weight
+        # Dependency -> dependent, damped so the walk favors causes
+        backward_weight = self.backward_weight * (anomaly[forward_src] + self.baseline_weight)
+
+        return (
+            np.concatenate([forward_src, forward_dst]),
+            np.concatenate([forward_dst, forward_src]),
+            np.concatenate([forward_weight, backward_weight])
+        )
+
+    def _personalized_pagerank(self, n: int, src: np.ndarray, dst: np.ndarray,
+                               weights: np.ndarray, anomaly: np.ndarray) -> np.ndarray:
+        """
+        Personalized PageRank via sparse power iteration
+
+        Args:
+            n: Number of nodes
+            src: Edge source indices
+            dst: Edge target indices
+            weights: Edge weights
+            anomaly: Anomaly score per node, used as restart distribution
+
+        Returns:
+            Stationary probability per node
+        """
+        personalization = anomaly.copy() if anomaly.sum() > 0 else np.ones(n)
+        personalization /= personalization.sum()
+
+        # Row-normalize edge weights into transition probabilities
+        out_weight = np.bincount(src, weights=weights, minlength=n)
+        transition = weights / out_weight[src] if len(weights) else weights
+        dangling = out_weight == 0
+
+        scores = personalization.copy()
+        self.last_iterations = 0
+
+        for iteration in range(1, self.max_iterations + 1):
+            # Sparse matrix-vector product in O(edges)
+            propagated = np.bincount(dst, weights=transition * scores[src], minlength=n)
+            # Mass stuck on dangling nodes restarts like a teleport
+            restart = (1 - self.damping) + self.damping * scores[dangling].sum()
+            updated = self.damping * propagated + restart * personalization
+
+            delta = np.abs(updated - scores).sum()
+            scores = updated
+            self.last_iterations = iteration
+            if delta < self.tolerance:
+                break
+
+        return scores
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing RootCauseLocalizer...")
+
+    import time
+
+    graph = {
+        'api-gateway': ['app-server'],
+        'app-server': ['database', 'cache'],
+        'worker': ['database'],
+        'database': [],
+        'cache': []
+    }
+    # The database is failing; its dependents show symptoms
+    scores = {'database': 1.0, 'app-server': 0.7, 'api-gateway': 0.4, 'worker': 0.4}
+
+    localizer = RootCauseLocalizer()
+    ranking = localizer.rank(graph, scores)
+    print(f"✅ Ranking: {[(c, round(s, 3)) for c, s in ranking]}")
+
+    rng = np.random.default_rng(7)
+    large_graph = {
+        f"svc-{i}": [f"svc-{j}" for j in rng.choice(5000, size=3, replace=False) if j != i]
+        for i in range(5000)
+    }
+    large_scores = {f"svc-{i}": 1.0 for i in rng.choice(5000, size=50, replace=False)}
+
+    start = time.perf_counter()
+    localizer.rank(large_graph, large_scores)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"✅ Ranked 5000 nodes in {elapsed:.1f} ms ({localizer.last_iterations} iterations)")
+
+    print("✅ RootCauseLocalizer tests passed!")
@@ -0,0 +1,493 @@
+"""
+Rule Index Module
+Compiles RCA rules into an inverted index so that every matching rule for an
+incident is found in a single pass over its anomalies
+"""
+
+from typing import List, Dict, Set, Iterable, Optional, Tuple
+from dataclasses import dataclass, field
+from collections import deque
+
+
+# Descriptions are joined with a line break, which keywords never contain,
+# so a keyword only matches within a single description
+DESCRIPTION_SEPARATOR = '\n'
+
+
+@dataclass
+class IncidentFeatures:
+    """Features of an incident that rule patterns are matched against"""
+    anomaly_types: Set[str] = field(default_factory=set)
+    metrics: Set[str] = field(default_factory=set)
+    text: str = ""
+
+
+def extract_features(anomalies: Iterable) -> IncidentFeatures:
+    """
+    Build the feature set of an incident in one pass over its anomalies
+
+    Args:
+        anomalies: Anomaly objects or dictionaries
+
+    Returns:
+        IncidentFeatures object
+    """
+    features = IncidentFeatures()
+    descriptions = []
+
+    for anomaly in anomalies:
+        anomaly_type, metric, description = _anomaly_fields(anomaly)
+        features.anomaly_types.add(anomaly_type)
+        features.metrics.add(metric)
+        descriptions.append(description)
+
+    features.text = DESCRIPTION_SEPARATOR.join(descriptions)
+    return features
+
+
+def _anomaly_fields(anomaly) -> Tuple[str, str, str]:
+    """Anomaly type, metric and lowercased description of an anomaly object or dictionary"""
+    if isinstance(anomaly, dict):
+        return (anomaly.get('type', ''), anomaly.get('metric', ''),
+                anomaly.get('description', '').lower())
+    return (getattr(anomaly, 'anomaly_type', ''), getattr(anomaly, 'metric_name', ''),
+            getattr(anomaly, 'description', '').lower())
+
+
+class KeywordMatcher:
+    """
+    KeywordMatcher Class
+    Aho-Corasick automaton that finds every keyword occurring in a text in
+    time linear in the text length, independent of the number of keywords
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Initialize KeywordMatcher
+
+        Args:
+            keywords: Keywords to search for (matched case-sensitively;
+                callers lowercase both sides)
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+
+        for keyword in set(keywords):
+            if keyword:
+                self._add(keyword)
+        self._build_failure_links()
+
+    def find_all(self, text: str) -> Set[str]:
+        """
+        Find all keywords that occur in a text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of keywords found
+        """
+        found = set()
+        state = 0
+
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state]:
+                found.update(self._output[state])
+
+        return found
+
+    def _add(self, keyword: str):
+        """Insert a keyword into the trie"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(keyword)
+
+    def _build_failure_links(self):
+        """Compute failure links breadth-first and merge outputs"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+
+                self._output[next_state] = (
+                    self._output[next_state] + self._output[self._fail[next_state]]
+                )
+
+
+class RuleIndex:
+    """
+    RuleIndex Class
+    Inverted index from anomaly type, metric and keyword to the rules that
+    require them. A rule matches when all its anomaly types and metrics are
+    present and, if it lists keywords, at least one keyword occurs in the
+    incident's descriptions.
+    """
+
+    def __init__(self, rules: List):
+        """
+        Compile rules into the index
+
+        Args:
+            rules: List of Rule objects
+        """
+        self.rules = list(rules)
+        self._required_types: List[int] = []
+        self._required_metrics: List[int] = []
+        self._has_keywords: List[bool] = []
+        self._unconditional: List[int] = []
+
+        self._by_type: Dict[str, List[int]] = {}
+        self._by_metric: Dict[str, List[int]] = {}
+        self._by_keyword: Dict[str, List[int]] = {}
+
+        for position, rule in enumerate(self.rules):
+            pattern = rule.pattern
+            types = set(pattern.get('anomaly_types', []))
+            metrics = set(pattern.get('metrics', []))
+            keywords = {k.lower() for k in pattern.get('keywords', [])}
+
+            self._required_types.append(len(types))
+            self._required_metrics.append(len(metrics))
+            self._has_keywords.append(bool(keywords))
+
+            if not types and not metrics and not keywords:
+                self._unconditional.append(position)
+
+            for anomaly_type in types:
+                self._by_type.setdefault(anomaly_type, []).append(position)
+            for metric in metrics:
+                self._by_metric.setdefault(metric, []).append(position)
+            for keyword in keywords:
+                self._by_keyword.setdefault(keyword, []).append(position)
+
+        self._keyword_matcher = KeywordMatcher(self._by_keyword.keys())
+
+    def match(self, features: IncidentFeatures, evaluated: Optional[List] = None) -> List:
+        """
+        Find every rule matching an incident
+
+        Args:
+            features: IncidentFeatures of the incident
+            evaluated: Optional list that receives every candidate rule the
+                index had to check (for profiling)
+
+        Returns:
+            List of matching Rule objects, in rule order
+        """
+        type_hits: Dict[int, int] = {}
+        metric_hits: Dict[int, int] = {}
+        keyword_hits: Set[int] = set()
+
+        for anomaly_type in features.anomaly_types:
+            for position in self._by_type.get(anomaly_type, ()):
+                type_hits[position] = type_hits.get(position, 0) + 1
+
+        for metric in features.metrics:
+            for position in self._by_metric.get(metric, ()):
+                metric_hits[position] = metric_hits.get(position, 0) + 1
+
+        if self._by_keyword and features.text:
+            for keyword in self._keyword_matcher.find_all(features.text):
+                keyword_hits.update(self._by_keyword[keyword])
+
+        candidates = set(type_hits) | set(metric_hits) | keyword_hits
+        candidates.update(self._unconditional)
+
+        matched = [
+            position for position in candidates
+            if self.satisfied(position, type_hits, metric_hits, keyword_hits)
+        ]
+        matched.sort()
+
+        if evaluated is not None:
+            evaluated.extend(self.rules[position] for position in candidates)
+
+        return [self.rules[position] for position in matched]
+
+    def rule_matches(self, rule, features: IncidentFeatures) -> bool:
+        """
+        Check a single rule against an incident without using the index
+
+        Args:
+            rule: Rule object
+            features: IncidentFeatures of the incident
+
+        Returns:
+            True if rule matches, False otherwise
+        """
+        pattern = rule.pattern
+
+        if not all(t in features.anomaly_types for t in pattern.get('anomaly_types', [])):
+            return False
+
+        if not all(m in features.metrics for m in pattern.get('metrics', [])):
+            return False
+
+        keywords = pattern.get('keywords', [])
+        if keywords and not any(k.lower() in features.text for k in keywords):
+            return False
+
+        return True
+
+    @property
+    def unconditional(self) -> List[int]:
+        """Positions of the rules without conditions, which always match"""
+        return list(self._unconditional)
+
+    def lookup(self, anomaly_type: str, metric: str,
+               description: str) -> Tuple[List[int], List[int], Dict[str, List[int]]]:
+        """
+        Find the rules indexed under one anomaly's features
+
+        Args:
+            anomaly_type: Anomaly type
+            metric: Metric name
+            description: Lowercased description
+
+        Returns:
+            Positions of the rules requiring the type, those requiring the
+            metric, and keyword -> positions for every keyword occurring in
+            the description
+        """
+        keywords = {}
+        if self._by_keyword and description:
+            keywords = {keyword: self._by_keyword[keyword]
+                        for keyword in self._keyword_matcher.find_all(description)}
+        return self._by_type.get(anomaly_type, []), self._by_metric.get(metric, []), keywords
+
+    def satisfied(self, position: int, type_hits: Dict[int, int],
+                  metric_hits: Dict[int, int], keyword_hits: Set[int]) -> bool:
+        """Check whether the hit counts of a rule meet its pattern"""
+        return (
+            type_hits.get(position, 0) == self._required_types[position]
+            and metric_hits.get(position, 0) == self._required_metrics[position]
+            and (not self._has_keywords[position] or position in keyword_hits)
+        )
+
+    def __len__(self) -> int:
+        """Return the number of compiled rules"""
+        return len(self.rules)
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """Immutable, compiled and versioned set of RCA rules"""
+    version: int
+    rules: Tuple
+    index: RuleIndex
+    source: str = 'default'
+
+    @classmethod
+    def compile(cls, rules: Iterable, version: int, source: str = 'default') -> 'RuleSet':
+        """
+        Compile rules into a RuleSet
+
+        Args:
+            rules: Rule objects
+            version: Rule-set version
+            source: Description of where the rules came from
+
+        Returns:
+            RuleSet object
+        """
+        rules = tuple(rules)
+        return cls(version=version, rules=rules, index=RuleIndex(list(rules)), source=source)
+
+
+class IncidentState:
+    """
+    IncidentState Class
+    Running feature state of one growing incident: anomaly type and metric
+    counts, keyword hits and per-rule partial matches against a pinned
+    RuleSet. Adding an anomaly touches only the rules indexed under its
+    type, metric and keywords, so each update costs the same no matter how
+    many anomalies the incident already holds.
+    """
+
+    def __init__(self, rule_set: RuleSet):
+        """
+        Initialize IncidentState
+
+        Args:
+            rule_set: Compiled RuleSet the incident is matched against
+        """
+        self.rule_set = rule_set
+        self.anomalies: List = []
+        self.components: Dict[str, None] = {}
+        self.type_counts: Dict[str, int] = {}
+        self.metric_counts: Dict[str, int] = {}
+        self.keyword_counts: Dict[str, int] = {}
+        self.correlation_total = 0.0
+        self.event_count = 0
+
+        self._anomaly_ids: Set[str] = set()
+        self._type_hits: Dict[int, int] = {}
+        self._metric_hits: Dict[int, int] = {}
+        self._keyword_hits: Set[int] = set()
+        self._matched: Set[int] = set(rule_set.index.unconditional)
+
+    def add_event(self, correlated_event) -> Set[int]:
+        """
+        Add a correlated event (its anomalies, score and components)
+
+        Args:
+            correlated_event: CorrelatedEvent object
+
+        Returns:
+            Positions of the rules whose match state was re-evaluated
+        """
+        self.correlation_total += correlated_event.correlation_score
+        self.event_count += 1
+
+        for component in correlated_event.affected_components:
+            self.components[component] = None
+
+        affected: Set[int] = set()
+        for anomaly in correlated_event.anomalies:
+            affected |= self.add_anomaly(anomaly)
+        return affected
+
+    def add_anomaly(self, anomaly) -> Set[int]:
+        """
+        Add one anomaly and rescore the rules it can affect
+
+        An anomaly whose ID was already added (e.g. sent again in a later
+        update) is ignored, so it does not inflate the counts.
+
+        Args:
+            anomaly: Anomaly object or dictionary
+
+        Returns:
+            Positions of the rules whose match state was re-evaluated
+        """
+        index = self.rule_set.index
+        anomaly_id = anomaly.get('id') if isinstance(anomaly, dict) else getattr(anomaly, 'id', None)
+
+        if anomaly_id is not None:
+            if anomaly_id in self._anomaly_ids:
+                return set()
+            self._anomaly_ids.add(anomaly_id)
+
+        # Same fields and keyword search as the batch match over extract_features()
+        anomaly_type, metric, description = _anomaly_fields(anomaly)
+        type_rules, metric_rules, keyword_rules = index.lookup(anomaly_type, metric, description)
+
+        self.anomalies.append(anomaly)
+        affected: Set[int] = set()
+
+        # Rules only change when a type, metric or keyword is seen for the first time
+        if self.type_counts.get(anomaly_type, 0) == 0:
+            for position in type_rules:
+                self._type_hits[position] = self._type_hits.get(position, 0) + 1
+                affected.add(position)
+        self.type_counts[anomaly_type] = self.type_counts.get(anomaly_type, 0) + 1
+
+        if self.metric_counts.get(metric, 0) == 0:
+            for position in metric_rules:
+                self._metric_hits[position] = self._metric_hits.get(position, 0) + 1
+                affected.add(position)
+        self.metric_counts[metric] = self.metric_counts.get(metric, 0) + 1
+
+        for keyword, positions in keyword_rules.items():
+            if self.keyword_counts.get(keyword, 0) == 0:
+                for position in positions:
+                    self._keyword_hits.add(position)
+                    affected.add(position)
+            self.keyword_counts[keyword] = self.keyword_counts.get(keyword, 0) + 1
+
+        for position in affected:
+            if index.satisfied(position, self._type_hits, self._metric_hits, self._keyword_hits):
+                self._matched.add(position)
+            else:
+                self._matched.discard(position)
+
+        return affected
+
+    def matched_rules(self) -> List:
+        """
+        Get the rules the incident currently matches
+
+        Returns:
+            List of matching Rule objects, in rule order
+        """
+        return [self.rule_set.rules[position] for position in sorted(self._matched)]
+
+    def is_matched(self, position: int) -> bool:
+        """Check whether the rule at a position currently matches"""
+        return position in self._matched
+
+    def average_correlation(self) -> float:
+        """Mean correlation score of the events added so far"""
+        return self.correlation_total / self.event_count if self.event_count else 0.0
+
+    def __len__(self) -> int:
+        """Return the number of anomalies in the incident"""
+        return len(self.anomalies)
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing RuleIndex...")
+
+    import time
+    from types import SimpleNamespace
+
+    rules = [
+        SimpleNamespace(rule_id=f"U{i:04d}", pattern={'keywords': [f"signature-{i}"]})
+        for i in range(5000)
+    ]
+    rules.append(SimpleNamespace(rule_id="R005", pattern={
+        'metrics': ['memory_usage'], 'keywords': ['out of memory', 'heap', 'gc']
+    }))
+
+    start = time.perf_counter()
+    index = RuleIndex(rules)
+    print(f"✅ Compiled {len(index)} rules in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    features = extract_features([
+        {'type': 'METRIC_ANOMALY', 'metric': 'memory_usage', 'description': 'Heap exhausted'},
+        {'type': 'LOG_ERROR', 'metric': 'error_logs', 'description': 'signature-42 observed'}
+    ])
+
+    start = time.perf_counter()
+    matched = index.match(features)
+    print(f"✅ Matched {[r.rule_id for r in matched]} in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    state = IncidentState(RuleSet.compile(rules, version=1))
+    state.add_anomaly({'type': 'METRIC_ANOMALY', 'metric': 'memory_usage', 'description': 'usage high'})
+    state.add_anomaly({'type': 'LOG_ERROR', 'metric': 'error_logs', 'description': 'GC pause'})
+    print(f"✅ Incremental match: {[r.rule_id for r in state.matched_rules()]}")
+
+    repeated = IncidentState(RuleSet.compile(rules, version=1))
+    for _ in range(3):
+        repeated.add_anomaly({'id': 'A1', 'type': 'LOG_ERROR', 'metric': 'error_logs', 'description': 'GC pause'})
+    # A keyword split across two descriptions matches neither way
+    split = [{'type': 'METRIC_ANOMALY', 'metric': 'memory_usage', 'description': 'worker ran out of'},
+             {'type': 'LOG_ERROR', 'metric': 'error_logs', 'description': 'memory pressure'}]
+    incremental = IncidentState(RuleSet.compile(rules, version=1))
+    for anomaly in split:
+        incremental.add_anomaly(anomaly)
+    print(f"✅ Split keyword: batch {[r.rule_id for r in index.match(extract_features(split))]}, "
+          f"incremental {[r.rule_id for r in incremental.matched_rules()]}")
+    print(f"✅ Re-sent anomaly counted once: {len(repeated)} anomaly, types {repeated.type_counts}")
+
+    print("✅ RuleIndex tests passed!")
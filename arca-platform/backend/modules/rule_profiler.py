@@ -0,0 +1,205 @@
+"""
+Rule Profiler Module
+Per-rule evaluation counters and confidence distribution, plus rule-matching
+timing, for the RCA engine
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime
+import threading
+
+
+# Confidence histogram buckets: [0.0, 0.1), [0.1, 0.2), ..., [0.9, 1.0]
+CONFIDENCE_BUCKETS = 10
+
+# Incidents whose last top cause is remembered for top_cause_changes
+TRACKED_INCIDENTS = 1000
+
+
+class RuleProfiler:
+    """
+    RuleProfiler Class
+    Accumulates per-rule telemetry: how often each rule is evaluated (checked
+    as a candidate by the rule index) and matches, how its confidence scores
+    are distributed and how often it ranks first. Rules are matched in one
+    shared index pass whose cost cannot be split per rule, so time is only
+    recorded per stage: the index pass and confidence scoring. The number
+    of evaluations is the per-rule cost measure. Counters are updated once
+    per analysis under a single lock, so profiling can stay enabled in
+    production.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Initialize RuleProfiler
+
+        Args:
+            enabled: Whether analyses are recorded
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def record_analysis(self, evaluations: Iterable[Tuple[str, bool]],
+                        confidences: Iterable[Tuple[str, float]] = (),
+                        top_rule_id: Optional[str] = None,
+                        match_seconds: float = 0.0, scoring_seconds: float = 0.0,
+                        incident_key: Optional[str] = None):
+        """
+        Record the rule evaluations of one analysis
+
+        Args:
+            evaluations: (rule_id, matched) for every evaluated rule
+            confidences: (rule_id, confidence) for every scored rule;
+                causes that are not rules (never evaluated) are ignored
+            top_rule_id: Cause ranked first, or None if nothing matched
+            match_seconds: Wall time of the rule index pass
+            scoring_seconds: Wall time of confidence scoring
+            incident_key: Identifies the incident analyzed; a top cause
+                differing from the previous analysis of the same incident
+                counts as a top cause change
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._analyses += 1
+            self._match_seconds += match_seconds
+            self._scoring_seconds += scoring_seconds
+
+            for rule_id, matched in evaluations:
+                stats = self._rule_stats(rule_id)
+                stats['evaluations'] += 1
+                if matched:
+                    stats['matches'] += 1
+
+            for rule_id, confidence in confidences:
+                stats = self._rules.get(rule_id)
+                if stats is None:
+                    continue
+                bucket = min(max(int(confidence * CONFIDENCE_BUCKETS), 0), CONFIDENCE_BUCKETS - 1)
+                stats['confidence_histogram'][bucket] += 1
+                stats['confidence_sum'] += confidence
+                stats['confidence_count'] += 1
+                stats['confidence_min'] = min(stats['confidence_min'], confidence)
+                stats['confidence_max'] = max(stats['confidence_max'], confidence)
+
+            if top_rule_id in self._rules:
+                self._rules[top_rule_id]['top_ranked'] += 1
+            if incident_key is not None:
+                if incident_key in self._last_top and self._last_top[incident_key] != top_rule_id:
+                    self._top_changes += 1
+                self._last_top[incident_key] = top_rule_id
+                self._last_top.move_to_end(incident_key)
+                if len(self._last_top) > TRACKED_INCIDENTS:
+                    self._last_top.popitem(last=False)
+
+    def get_statistics(self) -> Dict:
+        """
+        Get profiler statistics
+
+        Returns:
+            Dictionary with global counters and per-rule statistics, most
+            evaluated rules first
+        """
+        with self._lock:
+            rules = []
+            for rule_id, stats in self._rules.items():
+                evaluations = stats['evaluations']
+                count = stats['confidence_count']
+                rules.append({
+                    'rule_id': rule_id,
+                    'evaluations': evaluations,
+                    'matches': stats['matches'],
+                    'hit_rate': stats['matches'] / evaluations if evaluations else 0.0,
+                    'top_ranked': stats['top_ranked'],
+                    'confidence': {
+                        'count': count,
+                        'mean': stats['confidence_sum'] / count if count else None,
+                        'min': stats['confidence_min'] if count else None,
+                        'max': stats['confidence_max'] if count else None,
+                        'histogram': list(stats['confidence_histogram'])
+                    }
+                })
+
+            rules.sort(key=lambda r: r['evaluations'], reverse=True)
+
+            return {
+                'enabled': self.enabled,
+                'since': self._since.isoformat(),
+                'analyses': self._analyses,
+                'match_ms': self._match_seconds * 1000,
+                'scoring_ms': self._scoring_seconds * 1000,
+                'top_cause_changes': self._top_changes,
+                'rules': rules
+            }
+
+    def reset(self):
+        """Clear all counters"""
+        with self._lock:
+            self._reset_counters()
+
+    def _rule_stats(self, rule_id: str) -> Dict:
+        """Get (or create) the counters of a rule; caller holds the lock"""
+        stats = self._rules.get(rule_id)
+        if stats is None:
+            stats = {
+                'evaluations': 0,
+                'matches': 0,
+                'top_ranked': 0,
+                'confidence_histogram': [0] * CONFIDENCE_BUCKETS,
+                'confidence_sum': 0.0,
+                'confidence_count': 0,
+                'confidence_min': 1.0,
+                'confidence_max': 0.0
+            }
+            self._rules[rule_id] = stats
+        return stats
+
+    def _reset_counters(self):
+        """Initialize counters; caller holds the lock (or is the constructor)"""
+        self._rules: Dict[str, Dict] = {}
+        self._analyses = 0
+        self._match_seconds = 0.0
+        self._scoring_seconds = 0.0
+        self._top_changes = 0
+        self._last_top: 'OrderedDict[str, Optional[str]]' = OrderedDict()
+        self._since = datetime.now()
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing RuleProfiler...")
+
+    import time
+
+    profiler = RuleProfiler()
+    profiler.record_analysis(
+        [('R001', True), ('R003', False)],
+        [('R001', 0.875), ('CHANGE_ATTRIBUTION', 0.4)], top_rule_id='R001',
+        match_seconds=0.00005, incident_key='incident-1'
+    )
+    profiler.record_analysis(
+        [('R003', True)], [('R003', 0.62)], top_rule_id='R003', incident_key='incident-2'
+    )
+    profiler.record_analysis(
+        [('R003', True)], [('R003', 0.62)], top_rule_id='R003', incident_key='incident-1'
+    )
+
+    stats = profiler.get_statistics()
+    print(f"✅ Analyses: {stats['analyses']}, top cause changes: {stats['top_cause_changes']}")
+    print(f"✅ Rules tracked: {[rule['rule_id'] for rule in stats['rules']]}")
+    for rule in stats['rules']:
+        print(f"✅ {rule['rule_id']}: {rule['matches']}/{rule['evaluations']} matched, "
+              f"mean confidence {rule['confidence']['mean']}")
+
+    start = time.perf_counter()
+    for _ in range(100000):
+        profiler.record_analysis([('R001', True)], [('R001', 0.8)], top_rule_id='R001')
+    print(f"✅ Overhead: {(time.perf_counter() - start) * 10:.2f} us per analysis")
+
+    profiler.reset()
+    print(f"✅ After reset: {profiler.get_statistics()['analyses']} analyses")
+
+    print("✅ RuleProfiler tests passed!")
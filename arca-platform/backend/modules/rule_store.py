@@ -0,0 +1,439 @@
+"""
+Rule Store Module
+Loads RCA rules from a YAML file or a MongoDB collection, validates and
+compiles them, and hot-swaps the active rule set when a new version appears
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+import os
+import threading
+
+from pymongo.errors import DuplicateKeyError
+
+try:
+    from .rca_engine import Rule
+    from .rule_index import RuleSet
+except ImportError:
+    from rca_engine import Rule
+    from rule_index import RuleSet
+
+
+PATTERN_KEYS = ('anomaly_types', 'metrics', 'keywords')
+
+# Version numbers tried by a publish that keeps racing other publishers
+PUBLISH_ATTEMPTS = 5
+
+
+class RuleVersionConflictError(Exception):
+    """Raised when another publisher got the rule-set version first"""
+
+
+def validate_rule(data: Dict) -> Rule:
+    """
+    Validate a rule definition and build a Rule from it
+
+    Args:
+        data: Rule dictionary with rule_id, pattern, root_cause, confidence
+            and optional description
+
+    Returns:
+        Rule object
+
+    Raises:
+        ValueError: If the definition is invalid
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Rule must be a mapping")
+
+    rule_id = data.get('rule_id')
+    if not isinstance(rule_id, str) or not rule_id:
+        raise ValueError("Rule is missing a rule_id")
+
+    root_cause = data.get('root_cause')
+    if not isinstance(root_cause, str) or not root_cause:
+        raise ValueError(f"Rule {rule_id}: root_cause must be a non-empty string")
+
+    confidence = data.get('confidence')
+    if isinstance(confidence, bool) or not isinstance(confidence, (int, float)) \
+            or not 0 <= confidence <= 1:
+        raise ValueError(f"Rule {rule_id}: confidence must be a number between 0 and 1")
+
+    pattern = data.get('pattern')
+    if not isinstance(pattern, dict):
+        raise ValueError(f"Rule {rule_id}: pattern must be a mapping")
+
+    unknown = set(pattern) - set(PATTERN_KEYS)
+    if unknown:
+        raise ValueError(f"Rule {rule_id}: unknown pattern keys {sorted(unknown)}")
+
+    for key in PATTERN_KEYS:
+        values = pattern.get(key, [])
+        if not isinstance(values, list) or not all(isinstance(v, str) and v for v in values):
+            raise ValueError(f"Rule {rule_id}: pattern.{key} must be a list of strings")
+
+    if not any(pattern.get(key) for key in PATTERN_KEYS):
+        # An empty pattern would match every incident
+        raise ValueError(f"Rule {rule_id}: pattern must not be empty")
+
+    return Rule(
+        rule_id=rule_id,
+        pattern={key: list(pattern[key]) for key in PATTERN_KEYS if pattern.get(key)},
+        root_cause=root_cause,
+        confidence=float(confidence),
+        description=data.get('description', '')
+    )
+
+
+def compile_rule_set(rule_dicts: List[Dict], version: int, source: str) -> RuleSet:
+    """
+    Validate rule definitions and compile them into a RuleSet
+
+    Args:
+        rule_dicts: Rule dictionaries
+        version: Rule-set version
+        source: Description of where the rules came from
+
+    Returns:
+        RuleSet object
+
+    Raises:
+        ValueError: If any rule is invalid or rule IDs are duplicated
+    """
+    if not isinstance(rule_dicts, list) or not rule_dicts:
+        raise ValueError("Rule set must contain at least one rule")
+
+    rules = [validate_rule(data) for data in rule_dicts]
+
+    seen = set()
+    for rule in rules:
+        if rule.rule_id in seen:
+            raise ValueError(f"Duplicate rule_id: {rule.rule_id}")
+        seen.add(rule.rule_id)
+
+    return RuleSet.compile(rules, version=version, source=source)
+
+
+class YamlRuleSource:
+    """
+    YamlRuleSource Class
+    Reads a YAML file of the form {version: int, rules: [...]}. The file's
+    modification time is checked first, so polling does not re-parse it.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize YamlRuleSource
+
+        Args:
+            path: Path to the YAML rules file
+        """
+        self.path = path
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._version: Optional[int] = None
+
+    def get_version(self) -> Optional[int]:
+        """
+        Get the version of the rules file
+
+        Returns:
+            Version number, or None if the file does not exist
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp:
+            version, _ = self.load()
+            self._stamp = stamp
+            self._version = version
+
+        return self._version
+
+    def load(self) -> Tuple[int, List[Dict]]:
+        """
+        Load the rules file
+
+        Returns:
+            Tuple of (version, rule dictionaries)
+        """
+        # Optional dependency, only needed when rules come from YAML
+        import yaml
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            document = yaml.safe_load(f) or {}
+
+        if not isinstance(document, dict):
+            raise ValueError(f"{self.path}: expected a mapping with version and rules")
+
+        version = document.get('version')
+        if isinstance(version, bool) or not isinstance(version, int):
+            raise ValueError(f"{self.path}: version must be an integer")
+
+        return version, document.get('rules', [])
+
+    def describe(self) -> str:
+        """Human-readable source description"""
+        return f"yaml:{self.path}"
+
+
+class MongoRuleSource:
+    """
+    MongoRuleSource Class
+    Reads rule sets from a MongoDB collection holding one document per
+    version ({version: int, rules: [...]}). Publishing a rule set is a single
+    insert, so readers never see a half-written version; the unique index
+    on version makes concurrent publishers take turns.
+    """
+
+    def __init__(self, collection):
+        """
+        Initialize MongoRuleSource
+
+        Args:
+            collection: PyMongo collection holding rule-set documents
+        """
+        self.collection = collection
+
+    def get_version(self) -> Optional[int]:
+        """
+        Get the latest published version
+
+        Returns:
+            Version number, or None if nothing has been published
+        """
+        latest = self.collection.find_one({}, {'version': 1}, sort=[('version', -1)])
+        return latest['version'] if latest else None
+
+    def load(self) -> Tuple[int, List[Dict]]:
+        """
+        Load the latest published rule set
+
+        Returns:
+            Tuple of (version, rule dictionaries)
+        """
+        latest = self.collection.find_one({}, {'_id': 0}, sort=[('version', -1)])
+        if not latest:
+            raise ValueError("No rule set has been published")
+
+        return latest['version'], latest.get('rules', [])
+
+    def publish(self, rule_dicts: List[Dict], expected_version: Optional[int] = None) -> int:
+        """
+        Validate and publish a new rule-set version
+
+        A version taken by a concurrent publisher is retried with the next
+        one, unless the caller based its rules on expected_version.
+
+        Args:
+            rule_dicts: Rule dictionaries
+            expected_version: Latest version the rules were based on (None
+                publishes on top of whatever is latest)
+
+        Returns:
+            Published version number
+
+        Raises:
+            RuleVersionConflictError: If expected_version is no longer the
+                latest, or every attempt lost the race
+        """
+        current = self.get_version() or 0
+        compile_rule_set(rule_dicts, current + 1, self.describe())
+
+        for _ in range(PUBLISH_ATTEMPTS):
+            if expected_version is not None and current != expected_version:
+                raise RuleVersionConflictError(
+                    f"Rule set version {current} was published after version {expected_version}"
+                )
+            try:
+                self.collection.insert_one({
+                    'version': current + 1,
+                    'rules': rule_dicts,
+                    'published_at': datetime.now().isoformat()
+                })
+                return current + 1
+            except DuplicateKeyError:
+                current = self.get_version() or 0
+
+        raise RuleVersionConflictError(
+            f"Rule set version kept changing, gave up after {PUBLISH_ATTEMPTS} attempts"
+        )
+
+    def describe(self) -> str:
+        """Human-readable source description"""
+        return f"mongo:{self.collection.name}"
+
+
+class RuleStore:
+    """
+    RuleStore Class
+    Keeps the active compiled RuleSet and replaces it atomically when the
+    source reports a new version. Polling runs on a background thread, so the
+    request path only ever reads a reference.
+    """
+
+    def __init__(self, source, poll_interval_seconds: float = 30):
+        """
+        Initialize RuleStore
+
+        Args:
+            source: YamlRuleSource or MongoRuleSource
+            poll_interval_seconds: Seconds between version checks
+        """
+        self.source = source
+        self.poll_interval_seconds = poll_interval_seconds
+        self.current: Optional[RuleSet] = None
+        self.last_error: Optional[str] = None
+        self.last_checked: Optional[datetime] = None
+        self._listeners: List[Callable[[RuleSet], Any]] = []
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, listener: Callable[[RuleSet], Any]):
+        """
+        Register a callback invoked with every newly activated RuleSet
+
+        Args:
+            listener: Callable taking a RuleSet (e.g. RCAEngine.set_rule_set)
+        """
+        self._listeners.append(listener)
+        if self.current is not None:
+            listener(self.current)
+
+    def refresh(self) -> bool:
+        """
+        Check the source and swap in a new rule set if its version changed
+
+        Invalid rule sets are rejected and the active one is kept.
+
+        Returns:
+            True if a new rule set was activated, False otherwise
+        """
+        with self._refresh_lock:
+            self.last_checked = datetime.now()
+            try:
+                version = self.source.get_version()
+                if version is None or (self.current and version == self.current.version):
+                    return False
+
+                loaded_version, rule_dicts = self.source.load()
+                rule_set = compile_rule_set(rule_dicts, loaded_version, self.source.describe())
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"❌ Error loading RCA rules from {self.source.describe()}: {e}")
+                return False
+
+            self.current = rule_set
+            self.last_error = None
+
+            for listener in self._listeners:
+                listener(rule_set)
+
+        print(f"📜 RCA rules v{rule_set.version} activated ({len(rule_set.rules)} rules)")
+        return True
+
+    def start(self):
+        """Load the current rules and start background polling"""
+        self.refresh()
+
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._poll, name='rule-store-poller', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop background polling"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval_seconds)
+            self._thread = None
+
+    def get_status(self) -> Dict:
+        """
+        Get store status
+
+        Returns:
+            Dictionary with source, active version and last error
+        """
+        return {
+            'source': self.source.describe(),
+            'version': self.current.version if self.current else None,
+            'rule_count': len(self.current.rules) if self.current else 0,
+            'last_checked': self.last_checked.isoformat() if self.last_checked else None,
+            'last_error': self.last_error
+        }
+
+    def _poll(self):
+        """Background polling loop"""
+        while not self._stop_event.wait(self.poll_interval_seconds):
+            self.refresh()
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing RuleStore...")
+
+    import tempfile
+    from rca_engine import RCAEngine
+
+    rules_yaml = """
+version: 1
+rules:
+  - rule_id: C001
+    pattern:
+      keywords: [certificate, tls]
+    root_cause: CERTIFICATE_EXPIRED
+    confidence: 0.9
+    description: TLS certificate problem detected
+"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'rules.yaml')
+        with open(path, 'w') as f:
+            f.write(rules_yaml)
+
+        engine = RCAEngine([])
+        store = RuleStore(YamlRuleSource(path), poll_interval_seconds=60)
+        store.subscribe(engine.set_rule_set)
+        store.refresh()
+        print(f"✅ Active version: {engine.rules_version} ({[r.rule_id for r in engine.root_cause_rules]})")
+
+        with open(path, 'w') as f:
+            f.write(rules_yaml.replace('version: 1', 'version: 2').replace('0.9', '1.5'))
+        store.refresh()
+        print(f"✅ Invalid update rejected, still v{engine.rules_version}: {store.last_error}")
+
+    class RacyCollection:
+        """Stand-in collection with a unique version, where another publisher wins the first insert"""
+        name = 'rca_rule_sets'
+
+        def __init__(self):
+            self.docs = []
+            self.races = 1
+
+        def find_one(self, query, projection=None, sort=None):
+            return max(self.docs, key=lambda d: d['version'], default=None)
+
+        def insert_one(self, doc):
+            if self.races:
+                self.races -= 1
+                self.docs.append(dict(doc, rules=[]))
+            if any(d['version'] == doc['version'] for d in self.docs):
+                raise DuplicateKeyError("E11000 duplicate key error")
+            self.docs.append(doc)
+
+    rules = [{'rule_id': 'C001', 'pattern': {'keywords': ['tls']},
+              'root_cause': 'CERTIFICATE_EXPIRED', 'confidence': 0.9}]
+    source = MongoRuleSource(RacyCollection())
+    print(f"✅ Lost race retried: published v{source.publish(rules)}")
+    try:
+        source.publish(rules, expected_version=1)
+    except RuleVersionConflictError as e:
+        print(f"✅ Stale publish rejected: {e}")
+
+    print("✅ RuleStore tests passed!")
@@ -0,0 +1,339 @@
+"""
+Statistics Counters Module
+Platform statistics kept in one counters document: incremented as
+documents are inserted and periodically reconciled against the collections
+"""
+
+from typing import Dict, List, Optional, Sequence
+from datetime import datetime, timedelta
+import threading
+import uuid
+
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+
+# Severities counted per collection; documents with others only count in the total
+SEVERITIES = ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
+
+
+class StatisticsCounters:
+    """
+    StatisticsCounters Class
+    Keeps document counts per collection and severity in a single counters
+    document, so reading the statistics is one find_one by _id instead of a
+    count_documents scan per figure. Inserts add to the counts with one
+    atomic $inc; a background thread periodically recounts everything with
+    one $facet aggregation and overwrites the document, which corrects any
+    drift (failed increments, deletions, inserts racing a reconciliation).
+
+    Every worker runs the thread, but only the holder of a lease document
+    in the counters collection reconciles; the lease expires after two
+    intervals, so another worker takes over when the holder stops. MongoDB
+    versions without $unionWith (before 4.4) are recounted with
+    count_documents instead.
+    """
+
+    def __init__(self, counters, source_db, collections: Sequence[str] = ('anomalies', 'rca_results', 'alerts'),
+                 document_id: str = 'statistics', reconcile_interval_seconds: float = 300,
+                 start_thread: bool = True):
+        """
+        Initialize StatisticsCounters
+
+        Args:
+            counters: PyMongo collection holding the counters document
+            source_db: PyMongo database of the counted collections
+            collections: Names of the counted collections
+            document_id: _id of the counters document
+            reconcile_interval_seconds: Time between reconciliations
+            start_thread: Reconcile from a background thread (False leaves it
+                to reconcile())
+        """
+        self.counters = counters
+        self.source_db = source_db
+        self.collections = list(collections)
+        self.document_id = document_id
+        self.reconcile_interval_seconds = reconcile_interval_seconds
+        self._stopped = threading.Event()
+        self._lease_id = f"{document_id}_lease"
+        self._holder = uuid.uuid4().hex
+        self._union_supported = True
+        self.leader = False
+        self.reconciliations = 0
+        self.last_error: Optional[str] = None
+
+        if start_thread:
+            self._thread = threading.Thread(target=self._run, name='statistics-reconcile', daemon=True)
+            self._thread.start()
+
+    def record(self, collection: str, documents: List[Dict]):
+        """
+        Count newly inserted documents
+
+        Errors are printed rather than raised: the insert itself succeeded
+        and the next reconciliation restores the count.
+
+        Args:
+            collection: Name of the collection they were inserted into
+            documents: Inserted documents
+        """
+        if not documents:
+            return
+        increments = {f"{collection}.total": len(documents)}
+        for document in documents:
+            severity = document.get('severity')
+            if severity in SEVERITIES:
+                key = f"{collection}.by_severity.{severity}"
+                increments[key] = increments.get(key, 0) + 1
+        try:
+            self.counters.update_one({'_id': self.document_id}, {'$inc': increments}, upsert=True)
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"❌ Error updating {collection} statistics: {e}")
+
+    def read(self) -> Dict[str, Dict]:
+        """
+        Read the current counts, reconciling first if there are none yet
+
+        Returns:
+            Collection -> {'total': n, 'by_severity': {severity: n}}
+        """
+        document = self.counters.find_one({'_id': self.document_id})
+        if document is None:
+            document = self.reconcile()
+        return {
+            name: {
+                'total': document.get(name, {}).get('total', 0),
+                'by_severity': {
+                    severity: document.get(name, {}).get('by_severity', {}).get(severity, 0)
+                    for severity in SEVERITIES
+                }
+            }
+            for name in self.collections
+        }
+
+    def reconcile(self) -> Dict:
+        """
+        Recount every collection and overwrite the counters document
+
+        Returns:
+            The new counters document
+        """
+        document: Dict = {'_id': self.document_id, 'reconciled_at': datetime.now()}
+        document.update(self._aggregate_counts() if self._union_supported else self._count_each())
+        self.counters.replace_one({'_id': self.document_id}, document, upsert=True)
+        self.reconciliations += 1
+        return document
+
+    def stop(self):
+        """Stop the background thread"""
+        self._stopped.set()
+
+    def get_statistics(self) -> Dict:
+        """Get reconciliation counters"""
+        return {
+            'reconcile_interval_seconds': self.reconcile_interval_seconds,
+            'leader': self.leader,
+            'reconciliations': self.reconciliations,
+            'last_error': self.last_error
+        }
+
+    def _pipeline(self) -> List[Dict]:
+        """One aggregation over all collections: union them, then count each per severity"""
+        def tagged(name: str) -> List[Dict]:
+            return [{'$project': {'_id': 0, 'collection': {'$literal': name}, 'severity': 1}}]
+
+        pipeline = tagged(self.collections[0])
+        for name in self.collections[1:]:
+            pipeline.append({'$unionWith': {'coll': name, 'pipeline': tagged(name)}})
+        pipeline.append({'$facet': {
+            name: [
+                {'$match': {'collection': name}},
+                {'$group': {'_id': '$severity', 'count': {'$sum': 1}}}
+            ]
+            for name in self.collections
+        }})
+        return pipeline
+
+    def _aggregate_counts(self) -> Dict[str, Dict]:
+        """Count every collection with one aggregation, or with count_documents if $unionWith is unsupported"""
+        try:
+            facets = self.source_db[self.collections[0]].aggregate(self._pipeline()).next()
+        except OperationFailure as e:
+            print(f"❌ Error aggregating statistics, counting per collection instead: {e}")
+            self._union_supported = False
+            return self._count_each()
+
+        counts = {}
+        for name in self.collections:
+            groups = facets.get(name, [])
+            counts[name] = {
+                'total': sum(group['count'] for group in groups),
+                'by_severity': {
+                    group['_id']: group['count'] for group in groups if group['_id'] in SEVERITIES
+                }
+            }
+        return counts
+
+    def _count_each(self) -> Dict[str, Dict]:
+        """Count every collection and severity with count_documents (any MongoDB version)"""
+        counts = {}
+        for name in self.collections:
+            collection = self.source_db[name]
+            counts[name] = {
+                'total': collection.count_documents({}),
+                'by_severity': {
+                    severity: collection.count_documents({'severity': severity}) for severity in SEVERITIES
+                }
+            }
+        return counts
+
+    def _acquire_lease(self) -> bool:
+        """Take or renew the reconciliation lease; True if this worker holds it"""
+        now = datetime.now()
+        try:
+            self.counters.find_one_and_update(
+                {'_id': self._lease_id, '$or': [{'holder': self._holder}, {'expires_at': {'$lt': now}}]},
+                {'$set': {'holder': self._holder,
+                          'expires_at': now + timedelta(seconds=2 * self.reconcile_interval_seconds)}},
+                upsert=True
+            )
+            self.leader = True
+        except DuplicateKeyError:
+            # Another worker holds an unexpired lease
+            self.leader = False
+        return self.leader
+
+    def _run(self):
+        """Reconcile periodically while holding the lease"""
+        while not self._stopped.wait(self.reconcile_interval_seconds):
+            try:
+                if not self._acquire_lease():
+                    continue
+                self.reconcile()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"❌ Error reconciling statistics: {e}")
+
+
+# Test code
+if __name__ == "__main__":
+    print("Testing StatisticsCounters...")
+
+    class FakeCursor:
+        def __init__(self, docs):
+            self.docs = docs
+
+        def next(self):
+            return self.docs[0]
+
+    class FakeCollection:
+        """Stand-in collection supporting what the counters use"""
+        def __init__(self, db=None, docs=None, union_supported=True):
+            self.db = db
+            self.docs = docs if docs is not None else []
+            self.union_supported = union_supported
+            self.reads = 0
+            self.counts = 0
+
+        def find_one(self, query):
+            self.reads += 1
+            return next((d for d in self.docs if d['_id'] == query['_id']), None)
+
+        def count_documents(self, query):
+            self.counts += 1
+            return sum(all(d.get(k) == v for k, v in query.items()) for d in self.docs)
+
+        def update_one(self, query, update, upsert=False):
+            doc = next((d for d in self.docs if d['_id'] == query['_id']), None)
+            if doc is None:
+                doc = {'_id': query['_id']}
+                self.docs.append(doc)
+            for path, amount in update['$inc'].items():
+                target = doc
+                *parents, leaf = path.split('.')
+                for part in parents:
+                    target = target.setdefault(part, {})
+                target[leaf] = target.get(leaf, 0) + amount
+
+        def find_one_and_update(self, query, update, upsert=False):
+            # Lease query: _id and ($or of holder equality / expires_at $lt)
+            doc = next((d for d in self.docs if d['_id'] == query['_id']), None)
+            if doc is not None and not any(
+                doc.get(k) == v if not isinstance(v, dict) else doc.get(k) < v['$lt']
+                for condition in query['$or'] for k, v in condition.items()
+            ):
+                raise DuplicateKeyError("E11000 duplicate key error")
+            if doc is None:
+                doc = {'_id': query['_id']}
+                self.docs.append(doc)
+            doc.update(update['$set'])
+            return doc
+
+        def replace_one(self, query, document, upsert=False):
+            self.docs = [d for d in self.docs if d['_id'] != query['_id']] + [document]
+
+        def aggregate(self, pipeline):
+            return FakeCursor(self._evaluate(pipeline, [dict(d) for d in self.docs]))
+
+        def _evaluate(self, pipeline, docs):
+            """Run the stages the counters use: $project, $unionWith, $facet, $match, $group"""
+            for stage in pipeline:
+                (operator, spec), = stage.items()
+                if operator == '$project':
+                    docs = [{field: value['$literal'] if isinstance(value, dict) else d.get(field)
+                             for field, value in spec.items() if value != 0} for d in docs]
+                elif operator == '$unionWith':
+                    if not self.union_supported:
+                        raise OperationFailure("Unrecognized pipeline stage name: '$unionWith'")
+                    other = self.db[spec['coll']]
+                    docs = docs + other._evaluate(spec['pipeline'], [dict(d) for d in other.docs])
+                elif operator == '$facet':
+                    docs = [{name: self._evaluate(sub, docs) for name, sub in spec.items()}]
+                elif operator == '$match':
+                    docs = [d for d in docs if all(d.get(k) == v for k, v in spec.items())]
+                elif operator == '$group':
+                    groups: Dict = {}
+                    for d in docs:
+                        key = d.get(spec['_id'].lstrip('$'))
+                        groups[key] = groups.get(key, 0) + 1
+                    docs = [{'_id': key, 'count': n} for key, n in groups.items()]
+                else:
+                    raise OperationFailure(f"Unsupported stage {operator}")
+            return docs
+
+    db: Dict[str, FakeCollection] = {}
+    db['anomalies'] = FakeCollection(db, [{'_id': i, 'severity': SEVERITIES[i % 4]} for i in range(1000)])
+    db['rca_results'] = FakeCollection(db, [{'_id': i} for i in range(40)])
+    db['alerts'] = FakeCollection(db, [{'_id': i, 'severity': 'CRITICAL'} for i in range(25)])
+    counters = FakeCollection()
+
+    statistics = StatisticsCounters(counters, db, start_thread=False)
+    print(f"✅ First read reconciles: {statistics.read()['anomalies']}")
+
+    new = [{'_id': 1000 + i, 'severity': 'CRITICAL'} for i in range(5)]
+    db['anomalies'].docs.extend(new)
+    statistics.record('anomalies', new)
+    statistics.record('rca_results', [{'_id': 40}])
+    db['rca_results'].docs.append({'_id': 40})
+    after_inserts = statistics.read()
+    statistics.reconcile()
+    print(f"✅ After inserts: {after_inserts['anomalies']['total']} anomalies, "
+          f"{after_inserts['rca_results']['total']} RCA reports, "
+          f"matches reconciliation: {after_inserts == statistics.read()}")
+    print(f"✅ Reads: {counters.reads} point reads, {statistics.reconciliations} aggregations")
+
+    db['anomalies'].union_supported = False
+    aggregated = statistics.read()
+    statistics.reconcile()
+    print(f"✅ Without $unionWith: {db['anomalies'].counts} count_documents, "
+          f"same counts: {aggregated == statistics.read()}")
+
+    other_worker = StatisticsCounters(counters, db, start_thread=False)
+    print(f"✅ Lease: first worker {statistics._acquire_lease()}, second worker "
+          f"{other_worker._acquire_lease()}, first renews {statistics._acquire_lease()}")
+    next(d for d in counters.docs if d['_id'] == 'statistics_lease')['expires_at'] = datetime.now()
+    print(f"✅ Expired lease taken over: {other_worker._acquire_lease()}, "
+          f"first worker now {statistics._acquire_lease()}")
+
+    print("✅ StatisticsCounters tests passed!")
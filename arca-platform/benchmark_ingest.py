@@ -0,0 +1,141 @@
+"""
+Anomaly Ingest Benchmark for ARCA Platform
+Measures anomaly insert throughput against a local MongoDB: one insert_one
+per anomaly (the old /api/detect path), one unordered insert_many per
+request, and the process-wide write-behind buffer, for several write concerns
+
+Usage: python benchmark_ingest.py [--requests 500] [--request-size 20] [--clients 8]
+"""
+
+from pymongo import MongoClient
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import argparse
+import os
+import random
+import sys
+import time
+from dotenv import load_dotenv
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend', 'modules'))
+
+from bulk_writer import WriteBehindBuffer, insert_unordered, write_concern_from_settings
+
+# Load environment variables
+load_dotenv()
+
+MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
+MONGODB_DB_NAME = os.getenv('MONGODB_DB_NAME', 'arca_db')
+
+# Scratch collection, dropped before and after every run
+BENCHMARK_COLLECTION = 'benchmark_anomalies'
+
+# (label, w, journal)
+WRITE_CONCERNS = [
+    ('w=1', '1', None),
+    ('w=1, j=true', '1', 'true'),
+    ('w=majority', 'majority', None),
+]
+
+
+def make_requests(requests, request_size):
+    """Anomaly documents shaped like Anomaly.to_dict(), grouped per /api/detect request"""
+    batches = []
+    for r in range(requests):
+        batches.append([
+            {
+                'id': f"BENCH_{r}_{i}_{random.randrange(10**9)}",
+                'type': random.choice(['LOG_ERROR', 'METRIC_SPIKE', 'LOG_PATTERN']),
+                'severity': random.choice(['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']),
+                'value': random.uniform(0, 100),
+                'metric': random.choice(['cpu_usage', 'memory_usage', 'response_time']),
+                'timestamp': datetime.now().isoformat(),
+                'description': 'Benchmark anomaly'
+            }
+            for i in range(request_size)
+        ])
+    return batches
+
+
+def run_clients(clients, batches, handle):
+    """Send every request from a pool of concurrent clients; returns seconds taken"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(handle, batches))
+    return time.perf_counter() - start
+
+
+def benchmark(collection, batches, clients):
+    """Throughput of each ingest path, in documents per second"""
+    documents = sum(len(batch) for batch in batches)
+    results = {}
+
+    collection.drop()
+    seconds = run_clients(clients, batches, lambda batch: [collection.insert_one(dict(d)) for d in batch])
+    results['insert_one per anomaly'] = documents / seconds
+
+    collection.drop()
+    seconds = run_clients(clients, batches, lambda batch: insert_unordered(collection, [dict(d) for d in batch]))
+    results['insert_many per request'] = documents / seconds
+
+    collection.drop()
+    buffer = WriteBehindBuffer(collection)
+    start = time.perf_counter()
+    seconds = run_clients(clients, batches, lambda batch: buffer.add_many([dict(d) for d in batch]))
+    buffer.flush()
+    seconds_until_stored = time.perf_counter() - start
+    buffer.stop()
+    results['write-behind (request time)'] = documents / seconds
+    results['write-behind (until stored)'] = documents / seconds_until_stored
+    results['write-behind batch size'] = buffer.get_statistics()['avg_batch_size']
+
+    collection.drop()
+    return results
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Benchmark anomaly ingest against MongoDB')
+    parser.add_argument('--requests', type=int, default=500, help='Simulated /api/detect requests')
+    parser.add_argument('--request-size', type=int, default=20, help='Anomalies per request')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent clients')
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("⏱️  ARCA Platform - Anomaly Ingest Benchmark")
+    print("="*60)
+
+    try:
+        client = MongoClient(MONGODB_URI, serverSelectionTimeoutMS=5000, connectTimeoutMS=5000)
+        client.admin.command('ping')
+        print(f"✅ Connected to MongoDB: {MONGODB_DB_NAME}")
+    except Exception as e:
+        print(f"❌ Failed to connect to MongoDB: {e}")
+        print("\n💡 Start a local mongod first, e.g.: docker run -d -p 27017:27017 mongo:latest")
+        sys.exit(1)
+
+    db = client[MONGODB_DB_NAME]
+    batches = make_requests(args.requests, args.request_size)
+    print(f"📦 {args.requests} requests x {args.request_size} anomalies, {args.clients} clients")
+
+    for label, w, journal in WRITE_CONCERNS:
+        collection = db.get_collection(BENCHMARK_COLLECTION,
+                                       write_concern=write_concern_from_settings(w, journal))
+        try:
+            results = benchmark(collection, batches, args.clients)
+        except Exception as e:
+            print(f"\n❌ {label}: {e}")
+            continue
+
+        print(f"\n✍️  Write concern {label}")
+        for name, value in results.items():
+            unit = 'docs' if 'batch size' in name else 'docs/s'
+            print(f"   {name:<30} {value:>12,.0f} {unit}")
+
+    db.drop_collection(BENCHMARK_COLLECTION)
+    client.close()
+    print("\n" + "="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { getAlerts, acknowledgeAlert } from '../services/api';
+import { getAlerts, acknowledgeAlert, subscribeToStream } from '../services/api';
 import './Alerts.css';
 
 function Alerts() {
@@ -12,9 +12,19 @@ function Alerts() {
   const [processingAlertId, setProcessingAlertId] = useState(null);
 
   useEffect(() => {
+    // Subscribe before loading so no alert created in between is missed
+    // Repeats and acknowledgements update an alert in place
+    const unsubscribe = subscribeToStream({
+      alert: (alert) => setAlerts((prev) => {
+        const isSame = (existing) => (existing.id || existing._id) === alert.id;
+        return prev.some(isSame)
+          ? prev.map((existing) => (isSame(existing) ? alert : existing))
+          : [alert, ...prev].slice(0, 50);
+      }),
+      reset: () => loadAlerts(),
+    });
     loadAlerts();
-    const interval = setInterval(loadAlerts, 15000);
-    return () => clearInterval(interval);
+    return unsubscribe;
   }, []);
 
   const loadAlerts = async () => {
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { getAnomalies } from '../services/api';
+import { getAnomalies, subscribeToStream } from '../services/api';
 import './Anomalies.css';
 
 function Anomalies() {
@@ -11,9 +11,18 @@ function Anomalies() {
   const [selectedAnomaly, setSelectedAnomaly] = useState(null);
 
   useEffect(() => {
+    const unsubscribe = subscribeToStream({
+      anomaly: (anomaly) => {
+        if (filter !== 'ALL' && anomaly.severity !== filter) return;
+        setAnomalies((prev) => [
+          anomaly,
+          ...prev.filter((existing) => existing.id !== anomaly.id),
+        ].slice(0, 50));
+      },
+      reset: () => loadAnomalies(),
+    });
     loadAnomalies();
-    const interval = setInterval(loadAnomalies, 30000);
-    return () => clearInterval(interval);
+    return unsubscribe;
   }, [filter]);
 
   const loadAnomalies = async () => {
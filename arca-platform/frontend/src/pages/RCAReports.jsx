@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { getRCAReports } from '../services/api';
+import { getRCAReports, subscribeToStream } from '../services/api';
 import './RCAReports.css';
 
 function RCAReports() {
@@ -11,9 +11,15 @@ function RCAReports() {
   const [confidenceFilter, setConfidenceFilter] = useState('ALL');
 
   useEffect(() => {
+    const unsubscribe = subscribeToStream({
+      rca_result: (report) => setReports((prev) => [
+        report,
+        ...prev.filter((existing) => existing._id !== report._id),
+      ].slice(0, 50)),
+      reset: () => loadReports(),
+    });
     loadReports();
-    const interval = setInterval(loadReports, 30000);
-    return () => clearInterval(interval);
+    return unsubscribe;
   }, []);
 
   const loadReports = async () => {
@@ -40,6 +40,58 @@ export const getRCAReportDetail = (reportId) => api.get(`/rca-reports/${reportId
 export const getAlerts = () => api.get('/alerts');
 export const acknowledgeAlert = (alertId) => api.post('/alerts/acknowledge', { alert_id: alertId });
 
+// Live updates: handlers maps event types ('alert', 'anomaly', 'rca_result',
+// 'reset') to callbacks. EventSource reconnects by itself and resumes from the
+// last event ID; on 'reset' the events missed cannot be replayed, so refetch.
+// Every open stream holds a server thread, so all pages share one EventSource.
+// A stream only carries events published by the backend worker serving it, so
+// subscribers also get a 'reset' every STREAM_REFRESH_MS to pick up what the
+// other workers published. If the server refuses the stream, the 'reset' comes
+// every STREAM_FALLBACK_POLL_MS instead, i.e. they poll.
+const STREAM_EVENTS = ['alert', 'anomaly', 'rca_result', 'reset'];
+const STREAM_REFRESH_MS = 30000;
+const STREAM_FALLBACK_POLL_MS = 15000;
+const streamSubscribers = new Set();
+let streamSource = null;
+let streamPoll = null;
+
+const dispatchStreamEvent = (event, data) => {
+  streamSubscribers.forEach((handlers) => handlers[event] && handlers[event](data));
+};
+
+const openStream = () => {
+  const source = new EventSource(`${API_BASE_URL}/stream`);
+  STREAM_EVENTS.forEach((event) => {
+    source.addEventListener(event, (e) => dispatchStreamEvent(event, JSON.parse(e.data)));
+  });
+  source.onerror = () => {
+    // CLOSED means the server refused the stream (e.g. 503); it is not retried
+    if (source.readyState === EventSource.CLOSED && streamSource === source) {
+      streamSource = null;
+      clearInterval(streamPoll);
+      streamPoll = setInterval(() => dispatchStreamEvent('reset', {}), STREAM_FALLBACK_POLL_MS);
+    }
+  };
+  return source;
+};
+
+export const subscribeToStream = (handlers) => {
+  streamSubscribers.add(handlers);
+  if (!streamSource && !streamPoll) {
+    streamSource = openStream();
+    streamPoll = setInterval(() => dispatchStreamEvent('reset', {}), STREAM_REFRESH_MS);
+  }
+  return () => {
+    streamSubscribers.delete(handlers);
+    if (streamSubscribers.size === 0) {
+      if (streamSource) streamSource.close();
+      clearInterval(streamPoll);
+      streamSource = null;
+      streamPoll = null;
+    }
+  };
+};
+
 // Metrics
 export const getCurrentMetrics = () => api.get('/metrics/current');
 export const getMetricsHistory = (params) => api.get('/metrics/history', { params });
@@ -44,6 +44,8 @@ def clear_collections():
         for collection in collections:
             result = db[collection].delete_many({})
             print(f"🧹 Cleared collection: {collection} ({result.deleted_count} documents)")
+        # Stale statistics counters; the backend recounts on its next read
+        db.counters.delete_one({'_id': 'statistics'})
     except Exception as e:
         print(f"❌ Error clearing collections: {e}")
         print("   MongoDB connection may have been lost.")
@@ -511,7 +513,8 @@ def create_indexes():
     """Create indexes for better query performance"""
     print("\n🔧 Creating indexes...")
     
-    # Anomalies indexes
+    # Anomalies indexes (RCA fetches anomalies by ID in batches)
+    db.anomalies.create_index([('id', 1)], unique=True)
     db.anomalies.create_index([('timestamp', -1)])
     db.anomalies.create_index([('severity', 1)])
     db.anomalies.create_index([('metric', 1)])
@@ -534,6 +537,24 @@ def create_indexes():
     db.alerts.create_index([('status', 1)])
     db.alerts.create_index([('severity', 1)])
     
+    # RCA rule sets (one document per published version)
+    db.rca_rule_sets.create_index([('version', -1)], unique=True)
+    
+    # Change events (deploys, config pushes, feature flags)
+    db.change_events.create_index([('change_id', 1)], unique=True)
+    db.change_events.create_index([('start', -1)])
+    
+    # Historical fixes (workers load new ones by sequence number; similar
+    # incidents look up the fixes of their reports)
+    db.historical_fixes.create_index([('seq', 1)], unique=True)
+    db.historical_fixes.create_index([('report_id', 1)], sparse=True)
+    
+    # Asynchronous RCA jobs (one active job per anomaly set across workers;
+    # finished jobs expire)
+    db.rca_jobs.create_index([('active_key', 1)], unique=True,
+                             partialFilterExpression={'active_key': {'$exists': True}})
+    db.rca_jobs.create_index([('expires_at', 1)], expireAfterSeconds=0)
+    
     print("✅ Indexes created successfully")
 
 